@@ -0,0 +1,81 @@
+"""
+Functionality for caching data in memory
+- get
+- set
+- delete
+- clear
+- get_stats
+"""
+import threading
+import time
+from collections import OrderedDict
+
+
+class TTLCache:
+    """
+    maxsize -> maximum number of entries kept, least recently used will be evicted
+    ttl -> default number of seconds an entry stays valid
+    """
+
+    def __init__(self, maxsize, ttl):
+        self.__maxsize = maxsize
+        self.__ttl = ttl
+        self.__data = OrderedDict()
+        self.__lock = threading.Lock()
+        self.__hits = 0
+        self.__misses = 0
+
+    def __len__(self):
+        return len(self.__data)
+
+    def get(self, key, default=None):
+        """
+        Handler for getting a valid entry and marking it as recently used
+        """
+        with self.__lock:
+            if key in self.__data:
+                value, expire_time = self.__data[key]
+                if time.monotonic() < expire_time:
+                    self.__data.move_to_end(key)
+                    self.__hits += 1
+                    return value
+                del self.__data[key]
+            self.__misses += 1
+            return default
+
+    def set(self, key, value, ttl=None):
+        """
+        Handler for adding an entry, ttl will override the default ttl
+        """
+        if ttl is None:
+            ttl = self.__ttl
+        with self.__lock:
+            self.__data[key] = (value, time.monotonic() + ttl)
+            self.__data.move_to_end(key)
+            while len(self.__data) > self.__maxsize:
+                self.__data.popitem(last=False)
+
+    def delete(self, key):
+        """
+        Handler for removing an entry if exist
+        """
+        with self.__lock:
+            self.__data.pop(key, None)
+
+    def clear(self):
+        """
+        Handler for removing all entries, counters will be kept
+        """
+        with self.__lock:
+            self.__data.clear()
+
+    def get_stats(self):
+        """
+        Handler for getting the cache hit/miss counters
+        """
+        with self.__lock:
+            return {
+                "hits": self.__hits,
+                "misses": self.__misses,
+                "size": len(self.__data),
+            }
@@ -20,6 +20,9 @@ class Config:
 
     QUERY_SECURE_KEY = os.environ.get("QUERY_SECURE_KEY")
     QUERY_ACCESS_TOKEN = os.environ.get("QUERY_ACCESS_TOKEN")
+    SESSION_STORE_URL = os.environ.get("SESSION_STORE_URL")
+    QUERY_STATELESS_AUTH = os.environ.get("QUERY_STATELESS_AUTH", "").lower() == "true"
+    SERVICE_CHECK_INTERVAL = int(os.environ.get("SERVICE_CHECK_INTERVAL") or 30)
 
 
 class Gen3Config:
@@ -31,6 +34,8 @@ class Gen3Config:
     GEN3_API_KEY = os.environ.get("GEN3_API_KEY")
     GEN3_KEY_ID = os.environ.get("GEN3_KEY_ID")
     GEN3_PUBLIC_ACCESS = os.environ.get("GEN3_PUBLIC_ACCESS")
+    GEN3_MAX_CONNECTIONS = int(os.environ.get("GEN3_MAX_CONNECTIONS") or 20)
+    GEN3_MAX_CONCURRENCY = int(os.environ.get("GEN3_MAX_CONCURRENCY") or 10)
 
 
 class iRODSConfig:
@@ -44,6 +49,24 @@ class iRODSConfig:
     IRODS_PASSWORD = os.environ.get("IRODS_PASSWORD")
     IRODS_ZONE = os.environ.get("IRODS_ZONE")
     IRODS_ROOT_PATH = os.environ.get("IRODS_ROOT_PATH")
+    IRODS_CONNECTION_TIMEOUT = int(os.environ.get("IRODS_CONNECTION_TIMEOUT") or 30)
+    IRODS_POOL_MIN_SIZE = int(os.environ.get("IRODS_POOL_MIN_SIZE") or 1)
+    IRODS_POOL_MAX_SIZE = int(os.environ.get("IRODS_POOL_MAX_SIZE") or 16)
+    IRODS_POOL_IDLE_TIMEOUT = int(os.environ.get("IRODS_POOL_IDLE_TIMEOUT") or 300)
+    IRODS_POOL_CHECKOUT_TIMEOUT = int(
+        os.environ.get("IRODS_POOL_CHECKOUT_TIMEOUT") or 10
+    )
+    IRODS_MIN_CHUNK_SIZE = int(os.environ.get("IRODS_MIN_CHUNK_SIZE") or 256 * 1024)
+    IRODS_MAX_CHUNK_SIZE = int(
+        os.environ.get("IRODS_MAX_CHUNK_SIZE") or 8 * 1024 * 1024
+    )
+    IRODS_MAX_INFLIGHT_BYTES = int(
+        os.environ.get("IRODS_MAX_INFLIGHT_BYTES") or 64 * 1024 * 1024
+    )
+    IRODS_PARALLEL_STREAMS = int(os.environ.get("IRODS_PARALLEL_STREAMS") or 4)
+    IRODS_PARALLEL_SIZE = int(
+        os.environ.get("IRODS_PARALLEL_SIZE") or 256 * 1024 * 1024
+    )
 
 
 class OrthancConfig:
@@ -0,0 +1,28 @@
+"""
+Functionality for carrying request state through formatter and logic objects
+- get_private_filter
+- get_query_mode
+"""
+
+
+class RequestContext:
+    """
+    private_filter -> user private filter is required
+    query_mode -> query mode, only required by query formatter
+    """
+
+    def __init__(self, private_filter, query_mode=None):
+        self.__private_filter = private_filter
+        self.__query_mode = query_mode
+
+    def get_private_filter(self):
+        """
+        Handler for returning user private filter
+        """
+        return self.__private_filter
+
+    def get_query_mode(self):
+        """
+        Handler for returning query mode
+        """
+        return self.__query_mode
@@ -354,6 +354,35 @@ filter_responses = {
 }
 
 
+suggestion_responses = {
+    200: {
+        "description": "Successfully return a list of suggested datasets",
+        "content": {
+            "application/json": {
+                "example": {
+                    "suggestions": [
+                        {
+                            "datasetId": "",
+                            "field": "",
+                            "text": "",
+                            "highlight": [0, 0],
+                            "distance": 0,
+                        }
+                    ]
+                }
+            }
+        },
+    },
+    503: {
+        "content": {
+            "application/json": {
+                "example": {"detail": "Search suggestion is not ready"}
+            }
+        }
+    },
+}
+
+
 collection_responses = {
     200: {
         "description": "Successfully return all folders/files name and path under selected folder",
@@ -374,6 +403,26 @@ collection_responses = {
 }
 
 
+data_responses = {
+    206: {"description": "Successfully return the requested range(s) of the file"},
+    304: {"description": "File has not been modified since the cached version"},
+    404: {
+        "content": {
+            "application/json": {
+                "example": {"detail": "Data not found in the provided path"}
+            }
+        }
+    },
+    416: {
+        "content": {
+            "application/json": {
+                "example": {"detail": "Requested range is not satisfiable"}
+            }
+        }
+    },
+}
+
+
 instance_responses = {
     200: {
         "description": "Successfully return all folders/files name and path under selected folder",
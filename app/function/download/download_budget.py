@@ -0,0 +1,74 @@
+"""
+Functionality for limiting bytes held in memory by all downloads
+- acquire
+- release
+- available
+- capacity
+"""
+import asyncio
+from collections import deque
+
+
+class DownloadBudget:
+    """
+    capacity -> maximum in-flight bytes shared by all downloads is required
+    """
+
+    def __init__(self, capacity):
+        self.__capacity = capacity
+        self.__available = capacity
+        self.__waiters = deque()
+
+    def _handle_waiter(self):
+        """
+        Handler for granting released bytes to waiting downloads in arrival order
+        """
+        while self.__waiters and self.__available >= self.__waiters[0][0]:
+            size, future = self.__waiters.popleft()
+            if future.done():
+                continue
+            self.__available -= size
+            future.set_result(None)
+
+    async def acquire(self, size):
+        """
+        Handler for waiting until size bytes can be read into memory
+        Request larger than capacity is reduced to capacity, actual size is returned
+        """
+        size = min(size, self.__capacity)
+        if not self.__waiters and self.__available >= size:
+            self.__available -= size
+            return size
+        future = asyncio.get_running_loop().create_future()
+        waiter = (size, future)
+        self.__waiters.append(waiter)
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # Bytes were granted before the download was cancelled
+                self.release(size)
+            else:
+                self.__waiters.remove(waiter)
+                self._handle_waiter()
+            raise
+        return size
+
+    def release(self, size):
+        """
+        Handler for returning bytes once they have been sent
+        """
+        self.__available += size
+        self._handle_waiter()
+
+    def available(self):
+        """
+        Handler for getting bytes which can still be read into memory
+        """
+        return self.__available
+
+    def capacity(self):
+        """
+        Handler for getting maximum in-flight bytes
+        """
+        return self.__capacity
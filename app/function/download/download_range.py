@@ -0,0 +1,177 @@
+"""
+Functionality for supporting partial and conditional file download
+- generate_file_header
+- is_not_modified
+- generate_range
+- generate_range_header
+"""
+import secrets
+from datetime import timezone
+from email.utils import format_datetime, parsedate_to_datetime
+
+from fastapi import HTTPException, status
+
+# Request with more ranges is normally a scan, the whole file will be returned instead
+MAX_RANGES = 16
+DEFAULT_MEDIA_TYPE = "application/octet-stream"
+
+
+class DownloadRange:
+    """
+    Download range functionality
+    """
+
+    def _handle_modify_time(self, file):
+        """
+        Handler for getting irods modify time, irods stores utc time without timezone
+        """
+        modify_time = file.modify_time
+        if modify_time.tzinfo is None:
+            modify_time = modify_time.replace(tzinfo=timezone.utc)
+        return modify_time.replace(microsecond=0)
+
+    def _handle_date(self, date):
+        """
+        Handler for parsing http date, invalid date will be ignored
+        """
+        try:
+            date = parsedate_to_datetime(date)
+        except (TypeError, ValueError):
+            return None
+        if date.tzinfo is None:
+            date = date.replace(tzinfo=timezone.utc)
+        return date
+
+    def generate_file_header(self, file):
+        """
+        Handler for generating validator headers of irods data object
+        """
+        modify_time = self._handle_modify_time(file)
+        if file.checksum:
+            etag = f'"{file.checksum}"'
+        else:
+            # Without checksum, file can only be weakly compared by size and time
+            etag = f'W/"{file.size:x}-{int(modify_time.timestamp()):x}"'
+        return {
+            "Accept-Ranges": "bytes",
+            "ETag": etag,
+            "Last-Modified": format_datetime(modify_time, usegmt=True),
+        }
+
+    def is_not_modified(self, headers, file_header):
+        """
+        Handler for checking whether browser cached file is still valid
+        """
+        if_none_match = headers.get("if-none-match")
+        if if_none_match is not None:
+            # If-None-Match uses weak comparison and takes precedence over date
+            if if_none_match.strip() == "*":
+                return True
+            etag = file_header["ETag"].removeprefix("W/")
+            return any(
+                _.strip().removeprefix("W/") == etag for _ in if_none_match.split(",")
+            )
+        if_modified_since = self._handle_date(headers.get("if-modified-since"))
+        if if_modified_since is None:
+            return False
+        return self._handle_date(file_header["Last-Modified"]) <= if_modified_since
+
+    def _handle_if_range(self, if_range, file_header):
+        """
+        Handler for checking whether range can be applied to current file
+        """
+        if if_range is None:
+            return True
+        if_range = if_range.strip()
+        if if_range.startswith('"'):
+            # If-Range uses strong comparison, weak etag never matches
+            return if_range == file_header["ETag"]
+        date = self._handle_date(if_range)
+        return date is not None and date == self._handle_date(
+            file_header["Last-Modified"]
+        )
+
+    def _handle_range_spec(self, spec, size):
+        """
+        Handler for converting byte range spec to inclusive positions
+        Unsatisfiable spec returns None, invalid spec raises ValueError
+        """
+        start, end = spec.strip().split("-")
+        if start == "":
+            # Suffix range, last n bytes of file
+            length = int(end)
+            if length == 0 or size == 0:
+                return None
+            return max(size - length, 0), size - 1
+        start = int(start)
+        end = size - 1 if end == "" else int(end)
+        if start > end:
+            raise ValueError("Invalid byte range")
+        if start >= size:
+            return None
+        return start, min(end, size - 1)
+
+    def generate_range(self, range_, if_range, size, file_header):
+        """
+        Handler for generating sorted and merged byte ranges of request
+        None means the whole file should be returned
+        """
+        if range_ is None or not self._handle_if_range(if_range, file_header):
+            return None
+        unit, _, range_set = range_.partition("=")
+        if unit.strip().lower() != "bytes":
+            return None
+        try:
+            specs = [self._handle_range_spec(_, size) for _ in range_set.split(",")]
+        except ValueError:
+            # Invalid range header is ignored as if it was not sent
+            return None
+        specs = sorted(_ for _ in specs if _ is not None)
+        if specs == []:
+            raise HTTPException(
+                status_code=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE,
+                detail="Requested range is not satisfiable",
+                headers={"Content-Range": f"bytes */{size}"},
+            )
+        ranges = [specs[0]]
+        for start, end in specs[1:]:
+            # Overlapping or adjacent ranges are sent only once
+            if start <= ranges[-1][1] + 1:
+                ranges[-1] = (ranges[-1][0], max(ranges[-1][1], end))
+            else:
+                ranges.append((start, end))
+        if len(ranges) > MAX_RANGES:
+            return None
+        return ranges
+
+    def generate_range_header(self, ranges, size, media_type):
+        """
+        Handler for generating partial content headers and multipart separators
+        Separators are None when only one range is requested
+        """
+        if len(ranges) == 1:
+            start, end = ranges[0]
+            header = {
+                "Content-Range": f"bytes {start}-{end}/{size}",
+                "Content-Length": str(end - start + 1),
+            }
+            return header, media_type, None
+        boundary = secrets.token_hex(16)
+        separators = []
+        for index, (start, end) in enumerate(ranges):
+            # Every part after the first one starts with the end of previous part
+            separator = b"" if index == 0 else b"\r\n"
+            separators.append(
+                separator
+                + (
+                    f"--{boundary}\r\n"
+                    f"Content-Type: {media_type or DEFAULT_MEDIA_TYPE}\r\n"
+                    f"Content-Range: bytes {start}-{end}/{size}\r\n\r\n"
+                ).encode()
+            )
+        separators.append(f"\r\n--{boundary}--\r\n".encode())
+        content_length = sum(len(_) for _ in separators) + sum(
+            end - start + 1 for start, end in ranges
+        )
+        header = {"Content-Length": str(content_length)}
+        return header, f"multipart/byteranges; boundary={boundary}", separators
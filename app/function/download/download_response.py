@@ -0,0 +1,47 @@
+"""
+Functionality for sending irods file stream with its pooled session
+- __call__
+"""
+from fastapi.responses import StreamingResponse
+from irods.exception import NetworkException
+
+
+class DownloadResponse(StreamingResponse):
+    """
+    content -> file content stream is required
+    pool -> irods session pool object is required
+    session -> irods session used by the content is required
+    """
+
+    def __init__(self, content, pool, session, **kwargs):
+        super().__init__(self._handle_content(content), **kwargs)
+        self.__content = content
+        self.__pool = pool
+        self.__session = session
+        self.__discard = False
+
+    async def _handle_content(self, content):
+        """
+        Generator for file content, broken session is marked to be discarded
+        """
+        try:
+            async for chunk in content:
+                yield chunk
+        except (NetworkException, OSError):
+            self.__discard = True
+            raise
+
+    async def __call__(self, scope, receive, send):
+        """
+        Handler for sending the response
+        Session is returned on every exit path, background task is skipped on error
+        """
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            try:
+                # Interrupted stream is closed before its session is reused
+                await self.body_iterator.aclose()
+                await self.__content.aclose()
+            finally:
+                self.__pool.release(self.__session, self.__discard)
@@ -0,0 +1,241 @@
+"""
+Functionality for streaming irods file with bounded memory
+- generate_chunk_size
+- generate_stream
+"""
+import asyncio
+import time
+
+from app.config import iRODSConfig
+
+# Chunk size is adjusted to let every chunk be sent to client in about this time
+TARGET_CHUNK_SECONDS = 0.5
+# Initial chunk size splits the requested bytes into this many chunks
+INITIAL_CHUNK_COUNT = 64
+# Parallel blocks read but not yet sent, per stream
+REORDER_WINDOW = 2
+# One parallel download holds at most 1/DOWNLOAD_SHARE of the shared budget,
+# a stalled client must not block every other download
+DOWNLOAD_SHARE = 4
+
+
+class DownloadStream:
+    """
+    budget -> download budget object is required
+    """
+
+    def __init__(self, budget):
+        self.__budget = budget
+        self.__min_chunk_size = iRODSConfig.IRODS_MIN_CHUNK_SIZE
+        self.__max_chunk_size = iRODSConfig.IRODS_MAX_CHUNK_SIZE
+        self.__parallel_streams = iRODSConfig.IRODS_PARALLEL_STREAMS
+        self.__parallel_size = iRODSConfig.IRODS_PARALLEL_SIZE
+
+    def _handle_chunk_limit(self, chunk_size):
+        """
+        Handler for keeping chunk size between configured limits
+        """
+        return max(self.__min_chunk_size, min(int(chunk_size), self.__max_chunk_size))
+
+    def generate_chunk_size(self, chunk_size, sent_size, seconds):
+        """
+        Handler for adjusting chunk size to client throughput
+        Chunk size changes at most twice or half each time to avoid bouncing
+        """
+        if seconds <= 0:
+            target_size = chunk_size * 2
+        else:
+            target_size = sent_size / seconds * TARGET_CHUNK_SECONDS
+        target_size = max(chunk_size / 2, min(target_size, chunk_size * 2))
+        return self._handle_chunk_limit(target_size)
+
+    def _handle_opened(self, opening):
+        """
+        Handler for closing irods file which is opened after download is cancelled
+        """
+        if not opening.cancelled() and opening.exception() is None:
+            opening.result().close()
+
+    async def _handle_open(self, file):
+        """
+        Handler for opening irods file, each opened file uses its own connection
+        """
+        opening = asyncio.get_running_loop().run_in_executor(None, file.open, "r")
+        try:
+            # Opening continues in thread even if download is cancelled
+            return await asyncio.shield(opening)
+        except asyncio.CancelledError:
+            opening.add_done_callback(self._handle_opened)
+            raise
+
+    def _handle_close(self, file_like, reading):
+        """
+        Handler for closing irods file once the running read has finished
+        Awaiting is not possible once the download has been cancelled
+        """
+        if reading is None or reading.done():
+            file_like.close()
+        else:
+            reading.add_done_callback(lambda _: file_like.close())
+
+    def _handle_read(self, file_like, start, size):
+        """
+        Handler for reading bytes of file from start position
+        """
+        if start is not None:
+            file_like.seek(start)
+        return file_like.read(size)
+
+    def _handle_reading(self, file_like, start, size):
+        """
+        Handler for reading file in thread, the read is not interrupted by cancel
+        """
+        return asyncio.get_running_loop().run_in_executor(
+            None, self._handle_read, file_like, start, size
+        )
+
+    def _handle_block(self, ranges, block_size):
+        """
+        Handler for splitting ranges into blocks for parallel reading
+        Block stores range index, start position and size
+        """
+        blocks = []
+        for index, (start, end) in enumerate(ranges):
+            for block_start in range(start, end + 1, block_size):
+                blocks.append(
+                    (index, block_start, min(block_size, end + 1 - block_start))
+                )
+        return blocks
+
+    async def _handle_worker(self, file, blocks, results, state):
+        """
+        Handler for reading blocks with one irods connection
+        Blocks are taken in order, so the next block to send always has a slot
+        """
+        file_like = None
+        reading = None
+        try:
+            file_like = await self._handle_open(file)
+            while True:
+                await state["window"].acquire()
+                index = state["block"]
+                if index == len(blocks):
+                    state["window"].release()
+                    return
+                state["block"] += 1
+                _, start, size = blocks[index]
+                await self.__budget.acquire(size)
+                try:
+                    reading = self._handle_reading(file_like, start, size)
+                    chunk = await asyncio.shield(reading)
+                except BaseException:
+                    self.__budget.release(size)
+                    raise
+                if results[index].done():
+                    # Download has failed in another worker
+                    self.__budget.release(size)
+                else:
+                    results[index].set_result(chunk)
+        except Exception as error:
+            for result in results:
+                if not result.done():
+                    result.set_exception(error)
+        finally:
+            if file_like is not None:
+                self._handle_close(file_like, reading)
+
+    async def _handle_parallel_stream(self, file, ranges, separators):
+        """
+        Generator for file content read by multiple irods connections
+        Blocks are reassembled in order through a bounded reorder window
+        """
+        share = self.__budget.capacity() // (
+            self.__parallel_streams * REORDER_WINDOW * DOWNLOAD_SHARE
+        )
+        block_size = max(1, min(self.__max_chunk_size, share))
+        blocks = self._handle_block(ranges, block_size)
+        streams = min(self.__parallel_streams, len(blocks))
+        loop = asyncio.get_running_loop()
+        results = [loop.create_future() for _ in blocks]
+        state = {
+            "block": 0,
+            "window": asyncio.Semaphore(streams * REORDER_WINDOW),
+        }
+        workers = [
+            asyncio.ensure_future(self._handle_worker(file, blocks, results, state))
+            for _ in range(streams)
+        ]
+        sent = 0
+        try:
+            for index, (range_index, start, size) in enumerate(blocks):
+                if separators is not None and start == ranges[range_index][0]:
+                    yield separators[range_index]
+                chunk = await results[index]
+                try:
+                    yield chunk
+                finally:
+                    sent += 1
+                    self.__budget.release(size)
+                    state["window"].release()
+            if separators is not None:
+                yield separators[-1]
+        finally:
+            for worker in workers:
+                worker.cancel()
+            # Blocks read but never sent return their bytes
+            for index in range(sent, len(blocks)):
+                result = results[index]
+                if (
+                    result.done()
+                    and not result.cancelled()
+                    and result.exception() is None
+                ):
+                    self.__budget.release(blocks[index][2])
+                else:
+                    result.cancel()
+
+    async def _handle_single_stream(self, file, ranges, separators):
+        """
+        Generator for file content read by one irods connection
+        Next chunk is read after the previous one has been sent to the client
+        """
+        total_size = sum(end - start + 1 for start, end in ranges)
+        chunk_size = self._handle_chunk_limit(total_size / INITIAL_CHUNK_COUNT)
+        file_like = await self._handle_open(file)
+        reading = None
+        try:
+            for index, (start, end) in enumerate(ranges):
+                if separators is not None:
+                    yield separators[index]
+                position = start
+                remaining = end - start + 1
+                while remaining > 0:
+                    size = await self.__budget.acquire(min(chunk_size, remaining))
+                    try:
+                        reading = self._handle_reading(file_like, position, size)
+                        chunk = await asyncio.shield(reading)
+                        if not chunk:
+                            return
+                        position = None
+                        remaining -= len(chunk)
+                        sent_time = time.monotonic()
+                        yield chunk
+                        chunk_size = self.generate_chunk_size(
+                            chunk_size, len(chunk), time.monotonic() - sent_time
+                        )
+                    finally:
+                        self.__budget.release(size)
+            if separators is not None:
+                yield separators[-1]
+        finally:
+            self._handle_close(file_like, reading)
+
+    def generate_stream(self, file, ranges, separators=None):
+        """
+        Handler for generating file content stream of ranges
+        Only requested bytes are read, large content uses multiple irods connections
+        """
+        total_size = sum(end - start + 1 for start, end in ranges)
+        if self.__parallel_streams > 1 and total_size >= self.__parallel_size:
+            return self._handle_parallel_stream(file, ranges, separators)
+        return self._handle_single_stream(file, ranges, separators)
@@ -0,0 +1,85 @@
+"""
+Functionality for evaluating dataset set algebra with bitmaps
+- generate_bitmap
+- generate_dataset
+- implement_relation
+"""
+import threading
+
+# Bit offsets of every byte value, used to decode a bitmap one byte at a time
+BYTE_OFFSETS = [
+    [offset for offset in range(8) if value & (1 << offset)] for value in range(256)
+]
+
+
+class FilterBitmap:
+    """
+    Dataset submitter_id is interned to a dense integer position
+    A set of datasets is represented by a python int bitmap
+    """
+
+    def __init__(self):
+        self.__datasets = []
+        self.__positions = {}
+        self.__lock = threading.Lock()
+
+    def _handle_position(self, dataset_id):
+        """
+        Handler for getting dataset position, new dataset will be appended
+        """
+        position = self.__positions.get(dataset_id)
+        if position is None:
+            with self.__lock:
+                position = self.__positions.get(dataset_id)
+                if position is None:
+                    position = len(self.__datasets)
+                    self.__datasets.append(dataset_id)
+                    self.__positions[dataset_id] = position
+        return position
+
+    def generate_bitmap(self, datasets):
+        """
+        Handler for converting dataset submitter_id list to bitmap
+        """
+        positions = [self._handle_position(dataset_id) for dataset_id in datasets]
+        if not positions:
+            return 0
+        # Set bits in a byte array, shifting a big int per dataset is quadratic
+        data = bytearray(max(positions) // 8 + 1)
+        for position in positions:
+            data[position >> 3] |= 1 << (position & 7)
+        return int.from_bytes(data, "little")
+
+    def generate_dataset(self, bitmap):
+        """
+        Handler for converting bitmap to sorted dataset submitter_id list
+        """
+        datasets = []
+        data = bitmap.to_bytes((bitmap.bit_length() + 7) // 8, "little")
+        for index, value in enumerate(data):
+            if value:
+                for offset in BYTE_OFFSETS[value]:
+                    datasets.append(self.__datasets[(index << 3) + offset])
+        return sorted(datasets)
+
+    def implement_relation(self, relation, groups):
+        """
+        Handler for combining bitmaps with "and"/"or" relation
+        groups -> list of bitmap or nested {"relation": ..., "groups": [...]}
+        """
+        bitmaps = []
+        for group in groups:
+            if isinstance(group, dict):
+                group = self.implement_relation(group["relation"], group["groups"])
+            bitmaps.append(group)
+        if not bitmaps:
+            return 0
+        result = bitmaps[0]
+        for bitmap in bitmaps[1:]:
+            if relation == "and":
+                result &= bitmap
+            elif relation == "or":
+                result |= bitmap
+            else:
+                raise ValueError(f"{relation} relation not provided")
+        return result
@@ -2,10 +2,14 @@
 Functionality for editing the filer_template.json
 - update_filter_cache
 - cache_loader
+- version_loader
+- index_loader
 """
 import json
 import os
 
+from app.function.filter.filter_index import FilterIndex
+
 
 class FilterEditor:
     """
@@ -17,6 +21,8 @@ class FilterEditor:
             os.path.dirname(__file__), "./filter_template.json"
         )
         self.__filter_cache = self._template_loader()
+        self.__filter_version = 0
+        self.__filter_index = FilterIndex()
 
     def update_filter_cache(self, mapped_filters):
         """
@@ -25,6 +31,7 @@ class FilterEditor:
         # with open(self.__file_path, "w", encoding="utf-8") as json_file:
         #     json.dump(mapped_filters, json_file, indent=4, sort_keys=True)
         self.__filter_cache = mapped_filters
+        self.__filter_version += 1
 
     def cache_loader(self):
         """
@@ -32,6 +39,18 @@ class FilterEditor:
         """
         return self.__filter_cache
 
+    def version_loader(self):
+        """
+        Handler for loading filter cache version, increased on every update
+        """
+        return self.__filter_version
+
+    def index_loader(self):
+        """
+        Handler for loading public dataset filter index
+        """
+        return self.__filter_index
+
     def _template_loader(self):
         """
         Handler for loading filter template
@@ -12,29 +12,24 @@ class FilterFormatter:
 
     def __init__(self, fe):
         self.__filter_cache = fe.cache_loader()
-        self.__private_filter = None
 
-    def set_private_filter(self, filter_):
-        """
-        Handler for setting private_filter
-        """
-        self.__private_filter = filter_
-
-    def _handle_element_content(self, mapped_element):
+    def _handle_element_content(self, mapped_element, context):
         """
         Handler for switching element content between public and private
         """
-        if mapped_element in self.__private_filter:
-            return self.__private_filter[mapped_element]
+        private_filter = context.get_private_filter()
+        if mapped_element in private_filter:
+            return private_filter[mapped_element]
         return self.__filter_cache[mapped_element]
 
-    def generate_sidebar_filter_format(self):
+    def generate_sidebar_filter_format(self, context):
         """
         Format for portal map integrated viewer sidebar
+        context -> request context object is required
         """
         sidebar_format = []
         for mapped_element in self.__filter_cache:
-            content = self._handle_element_content(mapped_element)
+            content = self._handle_element_content(mapped_element, context)
             parent_format = {
                 "key": "",
                 "label": "",
@@ -53,9 +48,10 @@ class FilterFormatter:
             sidebar_format.append(parent_format)
         return sidebar_format
 
-    def generate_filter_format(self):
+    def generate_filter_format(self, context):
         """
         Format for portal data browser
+        context -> request context object is required
         """
         format_ = {
             "size": len(self.__filter_cache),
@@ -64,7 +60,7 @@ class FilterFormatter:
             "elements": [],
         }
         for mapped_element in self.__filter_cache:
-            content = self._handle_element_content(mapped_element)
+            content = self._handle_element_content(mapped_element, context)
             format_["titles"].append(content["title"].capitalize())
             format_["nodes>fields"].append(f"{content['node']}>{content['field']}")
             format_["elements"].append(list(content["facets"].keys()))
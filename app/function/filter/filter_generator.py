@@ -2,10 +2,8 @@
 Functionality for generating the filter based on database files
 - generate_private_filter
 - generate_public_filter
+- update_filter_index
 """
-import queue
-import threading
-
 from app.config import Gen3Config
 from app.data_schema import GraphQLQueryItem
 
@@ -65,8 +63,15 @@ class FilterGenerator:
 
     def _handle_filter_query_item(self, private_access=None):
         items = []
-        for mapped_element in self.__dynamic:
-            node = self.__filter_cache[mapped_element]["node"]
+        nodes = []
+        for mapped_element, element_content in self.__filter_cache.items():
+            node = element_content["node"]
+            # Public data of every filter node is also used to build the filter index
+            if node in nodes or (
+                mapped_element not in self.__dynamic and private_access is not None
+            ):
+                continue
+            nodes.append(node)
             query_item = GraphQLQueryItem(
                 node=node,
                 access=self.__public_access,
@@ -76,32 +81,27 @@ class FilterGenerator:
             items.append((query_item, node))
         return items
 
-    def _handle_cache(self, private_access=None):
+    async def _handle_cache(self, private_access=None):
         """
-        Handler for using thread to update data cache
+        Handler for fetching data concurrently to update data cache
         """
         items = self._handle_filter_query_item(private_access)
-        queue_ = queue.Queue()
-        threads_pool = []
-        for args in items:
-            thread = threading.Thread(
-                target=self.__es.get("gen3").process_graphql_query, args=(*args, queue_)
-            )
-            threads_pool.append(thread)
-            thread.start()
-        for thread in threads_pool:
-            thread.join()
-        cache = {}
-        while not queue_.empty():
-            cache.update(queue_.get())
-        return cache
+        return await self.__es.get("gen3").process_graphql_queries(items)
+
+    def _handle_filter_index(self):
+        """
+        Handler for rebuilding the public filter index from data cache
+        """
+        filter_index = self.__fe.index_loader()
+        for node, data in self.__cache.items():
+            filter_index.update_filter_index(node, data)
 
-    def generate_private_filter(self, private_access):
+    async def generate_private_filter(self, private_access):
         """
         Generator for private dataset filter
         """
         private_filter = {}
-        self.__cache = self._handle_cache(private_access)
+        self.__cache = await self._handle_cache(private_access)
         for mapped_element, element_content in self.__filter_cache.items():
             if mapped_element in self.__dynamic:
                 private_facets = self._handle_facet(element_content, private_access)
@@ -116,11 +116,12 @@ class FilterGenerator:
         self._reset_cache()
         return private_filter
 
-    def generate_public_filter(self):
+    async def generate_public_filter(self):
         """
         Generator for public dataset filter
         """
-        self.__cache = self._handle_cache()
+        self.__cache = await self._handle_cache()
+        self._handle_filter_index()
         for mapped_element, element_content in self.__filter_cache.items():
             if mapped_element in self.__dynamic:
                 public_facets = self._handle_facet(element_content)
@@ -130,3 +131,11 @@ class FilterGenerator:
         self._reset_cache()
         self.__fe.update_filter_cache(self.__filter_cache)
         return True
+
+    async def update_filter_index(self):
+        """
+        Handler for refreshing the public filter index, filter facets are unchanged
+        """
+        self.__cache = await self._handle_cache()
+        self._handle_filter_index()
+        self._reset_cache()
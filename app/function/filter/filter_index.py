@@ -0,0 +1,92 @@
+"""
+Functionality for indexing public datasets by filter facet value
+- update_filter_index
+- has_filter_index
+- search_filtered_bitmap
+- search_filtered_dataset
+- implement_filter_relation
+"""
+from app.function.filter.filter_bitmap import FilterBitmap
+
+
+class FilterIndex:
+    """
+    Inverted index from (node, field, facet value) to dataset bitmap
+    Bitmaps are built once per filter update and reused by every request
+    """
+
+    def __init__(self):
+        self.__bitmap = FilterBitmap()
+        self.__index = {}
+
+    def _handle_dataset_id(self, data):
+        """
+        Handler for getting dataset submitter_id from filter node data
+        """
+        if "experiments" in data:
+            if not data["experiments"]:
+                return None
+            return data["experiments"][0]["submitter_id"]
+        # Data in experiment node
+        return data["submitter_id"]
+
+    def update_filter_index(self, node, data):
+        """
+        Handler for rebuilding the index of one filter node
+        """
+        node_datasets = {}
+        dataset_ids = set()
+        for _ in data:
+            dataset_id = self._handle_dataset_id(_)
+            if dataset_id is None:
+                continue
+            dataset_ids.add(dataset_id)
+            for field, field_value in _.items():
+                if field in ("id", "experiments"):
+                    continue
+                if not isinstance(field_value, list):
+                    field_value = [field_value]
+                field_datasets = node_datasets.setdefault(field, {})
+                for value in field_value:
+                    field_datasets.setdefault(value, []).append(dataset_id)
+        # Datasets are interned in sorted order, decoded bitmaps are nearly sorted
+        self.__bitmap.generate_bitmap(sorted(dataset_ids))
+        node_index = {}
+        for field, field_datasets in node_datasets.items():
+            node_index[field] = {
+                value: self.__bitmap.generate_bitmap(datasets)
+                for value, datasets in field_datasets.items()
+            }
+        # Replace the whole node at once, other nodes are not affected
+        self.__index[node] = node_index
+
+    def has_filter_index(self, node):
+        """
+        Handler for checking whether node has been indexed
+        """
+        return node in self.__index
+
+    def search_filtered_bitmap(self, node, field, values):
+        """
+        Handler for getting bitmap of datasets matching any of the facet values
+        """
+        field_index = self.__index[node].get(field, {})
+        return self.__bitmap.implement_relation(
+            "or", [field_index.get(value, 0) for value in values]
+        )
+
+    def search_filtered_dataset(self, node, field, values):
+        """
+        Handler for getting datasets matching any of the facet values
+        """
+        return self.__bitmap.generate_dataset(
+            self.search_filtered_bitmap(node, field, values)
+        )
+
+    def implement_filter_relation(self, relation, bitmaps):
+        """
+        Handler for combining searched bitmaps with "and"/"or" relation
+        """
+        return self.__bitmap.generate_dataset(
+            self.__bitmap.implement_relation(relation, bitmaps)
+        )
@@ -23,12 +23,8 @@ class FilterLogic:
         """
         field = list(filter_.keys())[0]
         if field in self.__field:
-            matched_data = []
-            for _ in data:
-                for value in filter_[field]:
-                    if value in _[field]:
-                        matched_data.append(_)
-            data = matched_data
+            values = set(filter_[field])
+            data = [_ for _ in data if not values.isdisjoint(_[field])]
         return data
 
     def generate_filtered_dataset(self, fetch_result):
@@ -50,17 +46,34 @@ class FilterLogic:
             dataset_dict["submitter_id"].append(datasets)
         return dataset_dict
 
+    def _handle_relation_group(self, relation, groups):
+        """
+        Handler for combining submitter_id lists or nested relation groups
+        nested relation group -> {"relation": "and"/"or", "submitter_id": [...]}
+        """
+        datasets = []
+        for group in groups:
+            if isinstance(group, dict):
+                group = self._handle_relation_group(
+                    group["relation"], group["submitter_id"]
+                )
+            datasets.append(group)
+        if not datasets:
+            return set()
+        if relation == "and":  # AND relationship
+            return set(datasets[0]).intersection(*datasets[1:])
+        if relation == "or":  # OR relationship
+            return set().union(*datasets)
+        raise ValueError(f"{relation} relation not provided")
+
     def implement_filter_relation(self, item):
         """
         Handler for processing different filter relation types
+        Lists fetched per request are combined with sets, indexed facets are
+        combined by the filter index before they are added to the groups
         """
-        nested_list = item.filter["submitter_id"]
-        if item.relation == "and":  # AND relationship
-            datasets = set(nested_list[0]).intersection(*nested_list)
-        elif item.relation == "or":  # OR relationship
-            datasets = set()
-            for ids_list in nested_list:
-                for dataset_id in ids_list:
-                    datasets.add(dataset_id)
-        item.filter["submitter_id"] = list(sorted(datasets))
-        return list(sorted(datasets))
+        datasets = sorted(
+            self._handle_relation_group(item.relation, item.filter["submitter_id"])
+        )
+        item.filter["submitter_id"] = datasets
+        return list(datasets)
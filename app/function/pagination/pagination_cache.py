@@ -0,0 +1,71 @@
+"""
+Functionality for caching pagination response content
+- generate_cache_key
+- get_pagination_cache
+- set_pagination_cache
+- clear_pagination_cache
+- get_cache_stats
+"""
+import json
+import re
+
+from app.cache import TTLCache
+
+# Public first page is the most requested content, keep it for a short period
+CACHE_SIZE = 256
+CACHE_TTL = 60 * 5
+
+
+class PaginationCache:
+    """
+    Pagination cache functionality
+    """
+
+    def __init__(self):
+        self.__cache = TTLCache(CACHE_SIZE, CACHE_TTL)
+
+    def _handle_filter(self, filter_):
+        """
+        Handler for generating a canonical filter, facet order does not affect the result
+        """
+        return {field: sorted(set(facets)) for field, facets in filter_.items()}
+
+    def generate_cache_key(self, item, input_, access_scope):
+        """
+        Handler for generating cache key based on pagination item and access scope
+        """
+        canonical = {
+            "filter": self._handle_filter(item.filter),
+            # Same tokenizer as search logic
+            "search": re.findall("[a-zA-Z0-9]+", input_.lower()),
+            "order": item.order.lower(),
+            "page": item.page,
+            "limit": item.limit,
+            "relation": item.relation,
+            "access": sorted(access_scope),
+        }
+        return json.dumps(canonical, sort_keys=True)
+
+    def get_pagination_cache(self, key):
+        """
+        Handler for getting cached pagination content
+        """
+        return self.__cache.get(key)
+
+    def set_pagination_cache(self, key, content):
+        """
+        Handler for caching pagination content
+        """
+        self.__cache.set(key, content)
+
+    def clear_pagination_cache(self):
+        """
+        Handler for invalidating all cached pagination content
+        """
+        self.__cache.clear()
+
+    def get_cache_stats(self):
+        """
+        Handler for getting pagination cache hit/miss counters
+        """
+        return self.__cache.get_stats()
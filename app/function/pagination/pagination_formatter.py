@@ -1,9 +1,32 @@
 """
 Functionality for reconstructing data structure
+- generate_data_structure
 - reconstruct_data_structure
 """
+import functools
 import json
-import re
+
+# Manifest categories in response order, and whether the preview image url is provided
+MANIFEST_CATEGORIES = {
+    "plots": False,
+    "scaffoldViews": True,
+    "scaffolds": False,
+    "thumbnails": True,
+    "mris": False,
+    "dicomImages": False,
+}
+
+
+@functools.lru_cache(maxsize=4096)
+def _parse_cite_name(cite):
+    """
+    Handler for getting file names of cite, same cite list is only parsed once
+    """
+    if cite == "":
+        return None
+    if "," in cite:
+        return tuple(_.split("/")[-1] for _ in json.loads(cite.replace("'", '"')))
+    return (cite.split("/")[-1],)
 
 
 class PaginationFormatter:
@@ -12,7 +35,30 @@ class PaginationFormatter:
     """
 
     def __init__(self, fe):
-        self.__filter_cache = fe.cache_loader()
+        self.__fe = fe
+        self.__filter_version = None
+        self.__filter_name = {}
+
+    def _handle_filter_name(self):
+        """
+        Handler for getting facet value to facet name map of every mapped filter
+        Maps are only rebuilt when the filter cache has been updated
+        """
+        version = self.__fe.version_loader()
+        if version != self.__filter_version:
+            filter_name = {}
+            for mapped_element, content in self.__fe.cache_loader().items():
+                facet_name = {}
+                for name, value in content["facets"].items():
+                    if not isinstance(value, list):
+                        value = [value]
+                    for _ in value:
+                        # Same as list.index, the first facet name is used
+                        facet_name.setdefault(_, name)
+                filter_name[mapped_element] = facet_name
+            self.__filter_name = filter_name
+            self.__filter_version = version
+        return self.__filter_name
 
     def _handle_thumbnail(self, data):
         """
@@ -26,39 +72,18 @@ class PaginationFormatter:
                 result.append(_)
         return result
 
-    def _handle_multiple_cite_path(self, filename, cite):
-        """
-        Handler for updating multiple cite path
-        """
-        full_path = ""
-        result = {"path": [], "relative": {"path": []}}
-        data = json.loads(re.sub("'", '"', cite))
-        for _ in data:
-            full_path_list = filename.split("/")
-            full_path_list[-1] = _.split("/")[-1]
-            full_path = "/".join(full_path_list)
-            result["path"].append(full_path)
-            result["relative"]["path"].append(_.split("/")[-1])
-        return result
-
-    # filename: (contains full file path), cite: isDerivedFrom/isDescribedBy/isSourceOf
-    def _handle_cite_path(self, filename, cite):
+    # directory: manifest file folder, cite: isDerivedFrom/isDescribedBy/isSourceOf
+    def _handle_cite_path(self, directory, cite):
         """
         Handler for updating cite path
         """
-        cite_path = self._handle_empty(cite)
-        full_path = ""
-        result = {"path": [], "relative": {"path": []}}
-        if cite_path != "":
-            if len(cite_path.split(",")) > 1:
-                result = self._handle_multiple_cite_path(filename, cite_path)
-                return result
-            full_path_list = filename.split("/")
-            full_path_list[-1] = cite_path.split("/")[-1]
-            full_path = "/".join(full_path_list)
-        result["path"].append(full_path)
-        result["relative"]["path"].append(cite_path.split("/")[-1])
-        return result
+        cite_name = _parse_cite_name(self._handle_empty(cite))
+        if cite_name is None:
+            return {"path": [""], "relative": {"path": [""]}}
+        return {
+            "path": [directory + name for name in cite_name],
+            "relative": {"path": list(cite_name)},
+        }
 
     def _handle_empty(self, data):
         """
@@ -68,23 +93,6 @@ class PaginationFormatter:
             return ""
         return data
 
-    def _handle_image_link(self, preview_link, filename, is_source_of, has_image):
-        """
-        Handler for updating the image url
-        """
-        result = preview_link
-        if has_image:
-            if is_source_of != "":
-                path_list = filename.split("/")
-                path_list[-1] = is_source_of.split("/")[-1]
-                filepath = "/".join(path_list)
-                result += filepath
-            else:
-                result += filename
-        else:
-            return ""
-        return result
-
     def _handle_manifest(self, uuid, preview_link, data, has_image=False):
         """
         Handler for updating the data format which be queried based on manifest structure
@@ -92,24 +100,28 @@ class PaginationFormatter:
         result = []
         for _ in data:
             filename = _["filename"]
+            # Folder is shared by the file and all its cite paths
+            directory = filename[: filename.rfind("/") + 1]
+            image_url = ""
+            if has_image:
+                is_source_of = self._handle_empty(_["is_source_of"])
+                if is_source_of != "":
+                    image_url = preview_link + directory + is_source_of.split("/")[-1]
+                else:
+                    image_url = preview_link + filename
             item = {
-                "image_url": self._handle_image_link(
-                    preview_link,
-                    filename,
-                    self._handle_empty(_["is_source_of"]),
-                    has_image,
-                ),
+                "image_url": image_url,
                 "additional_mimetype": {
                     "name": self._handle_empty(_["additional_types"])
                 },
                 "datacite": {
                     "isDerivedFrom": self._handle_cite_path(
-                        filename, _["is_derived_from"]
+                        directory, _["is_derived_from"]
                     ),
                     "isDescribedBy": self._handle_cite_path(
-                        filename, _["is_described_by"]
+                        directory, _["is_described_by"]
                     ),
-                    "isSourceOf": self._handle_cite_path(filename, _["is_source_of"]),
+                    "isSourceOf": self._handle_cite_path(directory, _["is_source_of"]),
                     "supplemental_json_metadata": {
                         "description": self._handle_empty(
                             _["supplemental_json_metadata"]
@@ -124,11 +136,25 @@ class PaginationFormatter:
                     "name": self._handle_empty(_["file_type"]),
                 },
                 "identifier": _["id"],
-                "name": filename.split("/")[-1],
+                "name": filename[len(directory) :],
             }
             result.append(item)
         return result
 
+    def _handle_manifests(self, uuid, preview_link, data):
+        """
+        Handler for updating all manifest categories of a dataset in one pass
+        """
+        result = {}
+        for category, has_image in MANIFEST_CATEGORIES.items():
+            manifest = data[category]
+            if category == "thumbnails":
+                manifest = self._handle_thumbnail(manifest)
+            result[category] = self._handle_manifest(
+                uuid, preview_link, manifest, has_image
+            )
+        return result
+
     def _handle_species(self, data):
         """
         Handler for updating the species format
@@ -136,16 +162,13 @@ class PaginationFormatter:
         result = []
         if data == []:
             return result
+        species_name = self._handle_filter_name()["MAPPED_SPECIES"]
+        exist_species = set()
         for _ in data:
             if _["species"] != "NA":
-                species_filter = self.__filter_cache["MAPPED_SPECIES"]["facets"]
-                facets = species_filter.values()
-                if _["species"] in facets:
-                    index = list(facets).index(_["species"])
-                    species = list(species_filter.keys())[index]
-                else:
-                    species = _["species"]
-                if species not in result:
+                species = species_name.get(_["species"], _["species"])
+                if species not in exist_species:
+                    exist_species.add(species)
                     result.append(species)
         return result
 
@@ -161,45 +184,43 @@ class PaginationFormatter:
             result.append(contributor)
         return result
 
+    def _handle_data_structure(self, data):
+        """
+        Handler for reconstructing the structure of one dataset
+        """
+        dataset_description = data["dataset_descriptions"][0]
+        submitter_id = data["submitter_id"]
+        uuid = data["id"]
+        preview_link = f"/data/preview/{submitter_id}/"
+        dataset_format = {
+            "data_url_suffix": f"/data/browser/dataset/{submitter_id}?datasetTab=abstract",
+            "source_url_middle": f"/data/download/{submitter_id}/",
+            "contributors": self._handle_contributor(
+                dataset_description["contributor_name"]
+            ),
+            "keywords": dataset_description["keywords"],
+            "numberSamples": int(dataset_description["number_of_samples"][0]),
+            "numberSubjects": int(dataset_description["number_of_subjects"][0]),
+            "name": dataset_description["title"][0],
+            "datasetId": submitter_id,
+            "organs": dataset_description["study_organ_system"],
+            "species": self._handle_species(data["cases"]),
+        }
+        dataset_format.update(self._handle_manifests(uuid, preview_link, data))
+        dataset_format["detailsReady"] = True
+        return dataset_format
+
+    def generate_data_structure(self, data):
+        """
+        Generator for reconstructed datasets, one dataset at a time
+        Raw dataset is released from data once it has been reconstructed
+        """
+        data.reverse()
+        while data:
+            yield self._handle_data_structure(data.pop())
+
     def reconstruct_data_structure(self, data):
         """
         Reconstructing the structure to support portal services
         """
-        result = []
-        for _ in data:
-            dataset_description = _["dataset_descriptions"][0]
-            submitter_id = _["submitter_id"]
-            uuid = _["id"]
-            preview_link = f"/data/preview/{submitter_id}/"
-            dataset_format = {
-                "data_url_suffix": f"/data/browser/dataset/{submitter_id}?datasetTab=abstract",
-                "source_url_middle": f"/data/download/{submitter_id}/",
-                "contributors": self._handle_contributor(
-                    dataset_description["contributor_name"]
-                ),
-                "keywords": dataset_description["keywords"],
-                "numberSamples": int(dataset_description["number_of_samples"][0]),
-                "numberSubjects": int(dataset_description["number_of_subjects"][0]),
-                "name": dataset_description["title"][0],
-                "datasetId": submitter_id,
-                "organs": dataset_description["study_organ_system"],
-                "species": self._handle_species(_["cases"]),
-                "plots": self._handle_manifest(uuid, preview_link, _["plots"]),
-                "scaffoldViews": self._handle_manifest(
-                    uuid, preview_link, _["scaffoldViews"], True
-                ),
-                "scaffolds": self._handle_manifest(uuid, preview_link, _["scaffolds"]),
-                "thumbnails": self._handle_manifest(
-                    uuid,
-                    preview_link,
-                    self._handle_thumbnail(_["thumbnails"]),
-                    True,
-                ),
-                "mris": self._handle_manifest(uuid, preview_link, _["mris"]),
-                "dicomImages": self._handle_manifest(
-                    uuid, preview_link, _["dicomImages"]
-                ),
-                "detailsReady": True,
-            }
-            result.append(dataset_format)
-        return result
+        return [self._handle_data_structure(_) for _ in data]
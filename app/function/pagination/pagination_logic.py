@@ -2,18 +2,22 @@
 Functionality for processing pagination related logic
 - get_pagination_data
 - get_pagination_count
+- clear_pagination_universe
 - process_pagination_item
 """
-import copy
+import asyncio
 import json
-import queue
-import threading
 
 from fastapi import HTTPException, status
 
+from app.cache import TTLCache
 from app.config import Gen3Config
 from app.data_schema import GraphQLPaginationItem, GraphQLQueryItem
 
+# Every dataset submitter_id visible to an access scope, shared by all page turns
+UNIVERSE_SIZE = 128
+UNIVERSE_TTL = 60 * 5
+
 
 class PaginationLogic:
     """
@@ -25,17 +29,12 @@ class PaginationLogic:
 
     def __init__(self, fe, fl, sl, es):
         self.__filter_cache = fe.cache_loader()
+        self.__filter_index = fe.index_loader()
         self.__fl = fl
         self.__sl = sl
         self.__es = es
         self.__public_access = [Gen3Config.GEN3_PUBLIC_ACCESS]
-        self.__private_filter = None
-
-    def set_private_filter(self, filter_):
-        """
-        Handler for setting private_filter
-        """
-        self.__private_filter = filter_
+        self.__universe = TTLCache(UNIVERSE_SIZE, UNIVERSE_TTL)
 
     def _handle_dataset(self, data):
         """
@@ -48,26 +47,6 @@ class PaginationLogic:
                 dataset_dict[dataset_id] = ele
         return dataset_dict
 
-    def _handle_thread_fetch(self, items):
-        """
-        Handler for using thread to fetch data
-        """
-        queue_ = queue.Queue()
-        threads_pool = []
-        for args in items:
-            thread = threading.Thread(
-                target=self.__es.get("gen3").process_graphql_query, args=(*args, queue_)
-            )
-            threads_pool.append(thread)
-            thread.start()
-        for thread in threads_pool:
-            thread.join()
-        result = {}
-        while not queue_.empty():
-            data = queue_.get()
-            result.update(data)
-        return result
-
     def _handle_order_by_dataset_description(self, filter_):
         """
         Handler for updating submitter_id for order by dataset description
@@ -79,7 +58,7 @@ class PaginationLogic:
                 result["submitter_id"].append(f"{dataset}-dataset_description")
         return result
 
-    def _handle_pagination_order(self, item):
+    async def _handle_pagination_order(self, item):
         """
         Handler for updating pagination data order
         """
@@ -98,22 +77,43 @@ class PaginationLogic:
             query_item.desc = "title"
         # Include both public and private if have the access
         ordered_datasets = []
-        query_result = self.__es.get("gen3").process_graphql_query(query_item)
+        query_result = await self.__es.get("gen3").process_graphql_query(query_item)
         for _ in query_result:
             dataset_id = _["experiments"][0]["submitter_id"]
             if dataset_id not in ordered_datasets:
                 ordered_datasets.append(dataset_id)
         return ordered_datasets
 
-    def get_pagination_data(self, item, match_pair, is_public_access_filtered):
+    async def _handle_pagination_rank(self, item):
+        """
+        Handler for slicing ranked datasets of the requested page
+        """
+        universe = await self._handle_pagination_universe(item.access)
+        # Only count datasets which can be displayed, same as pagination count
+        ranked_dataset = [
+            dataset_id
+            for dataset_id in item.filter["submitter_id"]
+            if dataset_id in universe["public_access"]
+            or dataset_id in universe["private_access"]
+        ]
+        start = (item.page - 1) * item.limit
+        item.filter["submitter_id"] = ranked_dataset[start : start + item.limit]
+        item.page = 1
+
+    async def get_pagination_data(self, item, match_pair, is_public_access_filtered):
         """
         Handler for fetching data based on pagination item
         """
         if "title" in item.order.lower():
             # Get an ordered filter
-            order_result = self._handle_pagination_order(item)
+            order_result = await self._handle_pagination_order(item)
             item.filter["submitter_id"] = order_result
             item.page = 1
+        elif item.asc is None and item.desc is None:
+            # Search result has been ranked, only the requested page will be fetched
+            await self._handle_pagination_rank(item)
+        if "submitter_id" in item.filter and item.filter["submitter_id"] == []:
+            return []
         query_item = GraphQLPaginationItem(
             limit=item.limit,
             page=item.page,
@@ -123,62 +123,82 @@ class PaginationLogic:
             asc=item.asc,
             desc=item.desc,
         )
-        query_result = self.__es.get("gen3").process_graphql_query(query_item)
+        query_result = await self.__es.get("gen3").process_graphql_query(query_item)
         displayed_dataset = self._handle_dataset(query_result)
-        item.access.remove(self.__public_access[0])
-        items = []
-        # Query displayed datasets which have private version
-        if match_pair != []:
-            for dataset in match_pair:
-                if dataset in displayed_dataset:
-                    query_item = GraphQLQueryItem(
-                        node="experiment_query",
-                        filter={"submitter_id": [dataset]},
-                        access=item.access,
-                    )
-                    items.append((query_item, dataset))
-        if not is_public_access_filtered:
-            fetch_result = self._handle_thread_fetch(items)
+        item.access = [_ for _ in item.access if _ != self.__public_access[0]]
+        # Query displayed datasets which have private version in one batch
+        private_dataset = [
+            dataset for dataset in match_pair if dataset in displayed_dataset
+        ]
+        if private_dataset and not is_public_access_filtered:
+            query_item = GraphQLQueryItem(
+                node="experiment_query",
+                filter={"submitter_id": private_dataset},
+                access=item.access,
+            )
+            query_result = await self.__es.get("gen3").process_graphql_query(
+                query_item
+            )
             # Replace the dataset if it has a private version
-            for dataset, data in fetch_result.items():
-                displayed_dataset[dataset] = data[0]
+            for dataset, data in self._handle_dataset(query_result).items():
+                displayed_dataset[dataset] = data
+        if item.asc is None and item.desc is None:
+            # Datasets ordered by self-written order function
+            rank = {
+                dataset_id: index
+                for index, dataset_id in enumerate(item.filter["submitter_id"])
+            }
+            return sorted(
+                displayed_dataset.values(), key=lambda _: rank[_["submitter_id"]]
+            )
         return list(displayed_dataset.values())
 
-    def get_pagination_count(self, item):
+    async def _handle_pagination_universe(self, access):
         """
-        Handler for processing the number of data based on pagination item
+        Handler for getting public and private dataset submitter_id of an access scope
         """
-        private_access = copy.deepcopy(item.access)
-        private_access.remove(self.__public_access[0])
-        user_access = {
-            "public_access": self.__public_access,
-            "private_access": private_access,
-        }
-        # Used to get the total count for either public or private datasets
-        # Public or private datasets will be processed separately
-        items = []
-        for key, value in user_access.items():
-            pagination_count_item = GraphQLPaginationItem(
-                node="experiment_pagination_count", filter=item.filter, access=value
+        key = tuple(sorted(access))
+        universe = self.__universe.get(key)
+        if universe is None:
+            # One combined query, each dataset is tagged with its project_id
+            query_item = GraphQLPaginationItem(
+                node="experiment_pagination_count", access=access
             )
-            items.append((pagination_count_item, key))
-        fetch_result = self._handle_thread_fetch(items)
-        public_result = self._handle_dataset(fetch_result["public_access"])
-        private_result = self._handle_dataset(fetch_result["private_access"])
-        # Default datasets exist in public repository only,
-        # Will contain all available datasets after updating
-        displayed_dataset = list(public_result.keys())
+            query_result = await self.__es.get("gen3").process_graphql_query(
+                query_item
+            )
+            universe = {"public_access": set(), "private_access": set()}
+            for _ in query_result:
+                if _["project_id"] == self.__public_access[0]:
+                    universe["public_access"].add(_["submitter_id"])
+                else:
+                    universe["private_access"].add(_["submitter_id"])
+            self.__universe.set(key, universe)
+        return universe
+
+    def clear_pagination_universe(self):
+        """
+        Handler for invalidating all cached dataset submitter_id
+        """
+        self.__universe.clear()
+
+    async def get_pagination_count(self, item):
+        """
+        Handler for processing the number of data based on pagination item
+        """
+        universe = await self._handle_pagination_universe(item.access)
+        public_result = universe["public_access"]
+        private_result = universe["private_access"]
+        if "submitter_id" in item.filter:
+            filtered_dataset = set(item.filter["submitter_id"])
+            public_result = public_result & filtered_dataset
+            private_result = private_result & filtered_dataset
         # Datasets which exist in both public and private repository will be added to match_pair
         # It will be used to help achieve priority presentation of private datasets
-        match_pair = []
-        for dataset_id in private_result:
-            if dataset_id not in public_result:
-                displayed_dataset.append(dataset_id)
-            else:
-                match_pair.append(dataset_id)
-        return len(displayed_dataset), match_pair
+        match_pair = sorted(public_result & private_result)
+        return len(public_result | private_result), match_pair
 
-    def _handle_pagination_item_filter(self, filter_field, facets):
+    def _handle_pagination_item_filter(self, filter_field, facets, private_filter):
         """
         Handler for updating filter in pagination item
         """
@@ -188,8 +208,8 @@ class PaginationLogic:
             # Avoid mis-match
             facet_name = facet.capitalize()
             for mapped_element in self.__filter_cache:
-                if mapped_element in self.__private_filter:
-                    content = self.__private_filter[mapped_element]
+                if mapped_element in private_filter:
+                    content = private_filter[mapped_element]
                 else:
                     content = self.__filter_cache[mapped_element]
                 # Check if title can match with a exist filter object
@@ -208,9 +228,10 @@ class PaginationLogic:
                         value_list.append(facet_value)
         return {filter_field: value_list}
 
-    def process_pagination_item(self, item, input_):
+    async def process_pagination_item(self, item, input_, context):
         """
         Handler for process pagination item to fit the query code generator format
+        context -> request context object is required
         """
         is_public_access_filtered = False
         has_search_result = False
@@ -218,11 +239,14 @@ class PaginationLogic:
         # FILTER
         if item.filter != {}:
             items = []
+            indexed_result = []
             for node_filed, facets in item.filter.items():
                 filter_node = node_filed.split(">")[0]
                 filter_field = node_filed.split(">")[1]
                 # Update filter based on authority
-                valid_filter = self._handle_pagination_item_filter(filter_field, facets)
+                valid_filter = self._handle_pagination_item_filter(
+                    filter_field, facets, context.get_private_filter()
+                )
                 query_item = GraphQLQueryItem(
                     node=filter_node, filter=valid_filter, access=self.__public_access
                 )
@@ -232,15 +256,40 @@ class PaginationLogic:
                         is_public_access_filtered = True
                 else:
                     query_item.access = item.access
-                items.append((query_item, json.dumps(valid_filter)))
-            fetch_result = self._handle_thread_fetch(items)
+                # Public only access can be answered by the public filter index
+                if (
+                    item.access == self.__public_access
+                    and self.__filter_index.has_filter_index(filter_node)
+                ):
+                    indexed_result.append(
+                        self.__filter_index.search_filtered_bitmap(
+                            filter_node, filter_field, valid_filter[filter_field]
+                        )
+                    )
+                else:
+                    items.append((query_item, json.dumps(valid_filter)))
+            fetch_result = {}
+            if items:
+                fetch_result = await self.__es.get("gen3").process_graphql_queries(
+                    items
+                )
             item.filter = self.__fl.generate_filtered_dataset(fetch_result)
+            if indexed_result:
+                # Indexed bitmaps are combined first, only the result is decoded
+                item.filter["submitter_id"].append(
+                    self.__filter_index.implement_filter_relation(
+                        item.relation, indexed_result
+                    )
+                )
             self.__fl.implement_filter_relation(item)
 
         # SEARCH
         if input_ != "":
             # If input does not match any content in the database, item.search will be empty
-            item.search = self.__sl.generate_searched_dataset(input_)
+            # Live lookup fans out blocking irods queries, keep the event loop free
+            item.search = await asyncio.to_thread(
+                self.__sl.generate_searched_dataset, input_
+            )
             if item.search["submitter_id"] != [] and (
                 "submitter_id" not in item.filter or item.filter["submitter_id"] != []
             ):
@@ -1,6 +1,5 @@
 """
 Functionality for processing query data output
-- set_query_mode
 - process_data_output
 """
 import re
@@ -13,20 +12,6 @@ class QueryFormatter:
 
     def __init__(self, fe):
         self.__filter_cache = fe.cache_loader()
-        self.__query_mode = None
-        self.__private_filter = None
-
-    def set_query_mode(self, mode):
-        """
-        Handler for setting query_mode
-        """
-        self.__query_mode = mode
-
-    def set_private_filter(self, filter_):
-        """
-        Handler for setting private_filter
-        """
-        self.__private_filter = filter_
 
     def _handle_mri_path(self, data):
         """
@@ -85,21 +70,22 @@ class QueryFormatter:
             return True
         return False
 
-    def _update_related_facet(self, related_facets, field, data):
+    def _update_related_facet(self, related_facets, field, data, context):
         """
         Handler for updating related facet
         """
         mapped_element = f"MAPPED_{field.upper()}"
         content = self.__filter_cache[mapped_element]
-        if mapped_element in self.__private_filter:
-            content = self.__private_filter[mapped_element]
+        private_filter = context.get_private_filter()
+        if mapped_element in private_filter:
+            content = private_filter[mapped_element]
         for facet_name, facet_value in content["facets"].items():
             for _ in data:
                 field_value = _[field]
                 if self._handle_facet_check(facet_value, field_value):
-                    if self.__query_mode == "detail":
+                    if context.get_query_mode() == "detail":
                         self._update_detail_mode(related_facets, facet_name, content)
-                    elif self.__query_mode == "facet":
+                    elif context.get_query_mode() == "facet":
                         self._update_facet_mode(related_facets, facet_name, content)
 
     def _handle_facet_source(self):
@@ -120,7 +106,7 @@ class QueryFormatter:
                 sources.append(f"{node}>{field}")
         return sources
 
-    def _handle_related_facet(self, data):
+    def _handle_related_facet(self, data, context):
         """
         Handler for generating related facets for corresponding dataset
         """
@@ -129,8 +115,8 @@ class QueryFormatter:
             key = _.split(">")[0]
             field = _.split(">")[1]
             if key in data and data[key] != []:
-                self._update_related_facet(related_facets, field, data[key])
-        if self.__query_mode == "detail":
+                self._update_related_facet(related_facets, field, data[key], context)
+        if context.get_query_mode() == "detail":
             return related_facets
         return list(related_facets.values())
 
@@ -173,21 +159,23 @@ class QueryFormatter:
             data["mris"] = self._handle_mri(data["mris"])
         return data
 
-    def process_data_output(self, data):
+    def process_data_output(self, data, context):
         """
         Handler for processing data output to support portal services
+        context -> request context object is required
         """
         result = {}
-        if self.__query_mode == "data":
+        query_mode = context.get_query_mode()
+        if query_mode == "data":
             result["data"] = data
-        elif self.__query_mode == "detail":
+        elif query_mode == "detail":
             result["detail"] = self._handle_detail_content(data)
             # Filter format facet
-            result["facet"] = self._handle_related_facet(data)
-        elif self.__query_mode == "facet":
+            result["facet"] = self._handle_related_facet(data, context)
+        elif query_mode == "facet":
             # Sidebar format facet
-            result["facet"] = self._handle_related_facet(data)
-        elif self.__query_mode == "mri":
+            result["facet"] = self._handle_related_facet(data, context)
+        elif query_mode == "mri":
             # Combine 5 sub-file paths based on filename
             result["mri"] = self._handle_mri_path(data["mris"])
         return result
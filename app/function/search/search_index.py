@@ -0,0 +1,108 @@
+"""
+Functionality for indexing dataset metadata tokens
+- update_search_index
+- has_search_index
+- search_keyword
+"""
+import bisect
+import math
+import re
+import threading
+
+# Matching a title is more relevant than matching a contributor
+FIELD_WEIGHTS = {"TITLE": 3.0, "SUBTITLE": 2.0, "CONTRIBUTOR": 1.0}
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+
+class SearchIndex:
+    """
+    Inverted index from metadata token to BM25F weighted term frequency of datasets
+    """
+
+    def __init__(self):
+        self.__index = None
+        self.__lock = threading.Lock()
+
+    def _handle_field_length(self, documents):
+        """
+        Handler for calculating the average token length of every field
+        """
+        field_length = {}
+        for fields in documents.values():
+            for field, tokens in fields.items():
+                field_length[field] = field_length.get(field, 0) + len(tokens)
+        return {
+            field: length / len(documents) for field, length in field_length.items()
+        }
+
+    def update_search_index(self, data):
+        """
+        Handler for rebuilding the index
+        data -> list of (dataset submitter_id, metadata field, metadata value)
+        """
+        documents = {}
+        for dataset_id, field, value in data:
+            tokens = re.findall("[a-zA-Z0-9]+", value.lower())
+            documents.setdefault(dataset_id, {}).setdefault(field, []).extend(tokens)
+        average_length = self._handle_field_length(documents)
+        postings = {}
+        for dataset_id, fields in documents.items():
+            for field, tokens in fields.items():
+                # Document length norm is applied once here, not per search
+                norm = 1 - BM25_B + BM25_B * len(tokens) / average_length[field]
+                weight = FIELD_WEIGHTS.get(field, 1.0) / norm
+                for token in tokens:
+                    token_postings = postings.setdefault(token, {})
+                    token_postings[dataset_id] = (
+                        token_postings.get(dataset_id, 0) + weight
+                    )
+        tokens = sorted(postings)
+        index = {
+            "size": len(documents),
+            "postings": postings,
+            # Sorted tokens for prefix lookup, sorted reversed tokens for suffix lookup
+            "prefix": tokens,
+            "suffix": sorted(token[::-1] for token in tokens),
+        }
+        # Replace the whole index at once, searches in progress keep the old one
+        with self.__lock:
+            self.__index = index
+
+    def has_search_index(self):
+        """
+        Handler for checking whether index has been built
+        """
+        return self.__index is not None
+
+    def _handle_matched_token(self, tokens, keyword):
+        """
+        Handler for getting tokens starting with keyword from sorted tokens
+        """
+        matched_token = []
+        position = bisect.bisect_left(tokens, keyword)
+        while position < len(tokens) and tokens[position].startswith(keyword):
+            matched_token.append(tokens[position])
+            position += 1
+        return matched_token
+
+    def search_keyword(self, keyword):
+        """
+        Handler for scoring datasets matching keyword with BM25F
+        Keyword matches a token by its start or its end
+        """
+        index = self.__index
+        matched_token = set(self._handle_matched_token(index["prefix"], keyword))
+        for token in self._handle_matched_token(index["suffix"], keyword[::-1]):
+            matched_token.add(token[::-1])
+        frequency = {}
+        for token in matched_token:
+            for dataset_id, weight in index["postings"][token].items():
+                frequency[dataset_id] = frequency.get(dataset_id, 0) + weight
+        idf = math.log(
+            1 + (index["size"] - len(frequency) + 0.5) / (len(frequency) + 0.5)
+        )
+        return {
+            dataset_id: idf * value * (BM25_K1 + 1) / (BM25_K1 + value)
+            for dataset_id, value in frequency.items()
+        }
@@ -1,15 +1,26 @@
 """
 Functionality for implementing data searching
+- update_search_index
+- update_search_suggestion
 - generate_searched_dataset
+- generate_suggested_dataset
 - implement_search_filter_relation
 """
 import re
 
+from fastapi import HTTPException, status
 from irods.models import Collection, DataObjectMeta
 
-from app.config import iRODSConfig
+from app.cache import TTLCache
+from app.config import Gen3Config, iRODSConfig
+from app.data_schema import GraphQLQueryItem
+from app.function.search.search_index import SearchIndex
+from app.function.search.search_suggestion import SearchSuggestion
 
 SEARCHFIELD = ["TITLE", "SUBTITLE", "CONTRIBUTOR"]
+# Search result does not depend on user access scope, shared by all users and pages
+SEARCH_CACHE_SIZE = 512
+SEARCH_CACHE_TTL = 60 * 10
 
 
 class SearchLogic:
@@ -21,24 +32,81 @@ class SearchLogic:
     def __init__(self, es):
         self.__es = es
         self.__search = SEARCHFIELD
+        self.__search_index = SearchIndex()
+        self.__search_suggestion = SearchSuggestion()
+        self.__search_cache = TTLCache(SEARCH_CACHE_SIZE, SEARCH_CACHE_TTL)
+
+    def _handle_dataset_id(self, collection):
+        """
+        Handler for converting irods collection name to dataset submitter_id
+        """
+        return re.sub(f"{iRODSConfig.IRODS_ROOT_PATH}/", "", collection)
+
+    def update_search_index(self):
+        """
+        Handler for rebuilding the search index with irods metadata
+        """
+        search_metadata = self.__es.get("irods").process_search_metadata(
+            self.__search
+        )
+        self.__search_index.update_search_index(
+            [
+                (
+                    self._handle_dataset_id(_[Collection.name]),
+                    _[DataObjectMeta.name],
+                    _[DataObjectMeta.value],
+                )
+                for _ in search_metadata
+            ]
+        )
+        # Cached search results are based on the previous index
+        self.__search_cache.clear()
+
+    async def update_search_suggestion(self):
+        """
+        Handler for rebuilding the search suggestion with public dataset description
+        """
+        query_item = GraphQLQueryItem(
+            node="dataset_description_query", access=[Gen3Config.GEN3_PUBLIC_ACCESS]
+        )
+        query_result = await self.__es.get("gen3").process_graphql_query(query_item)
+        self.__search_suggestion.update_search_suggestion(query_result)
+
+    def _handle_indexed_data(self, keyword_list):
+        """
+        Handler for processing search result with the search index
+        Relevance is the sum of keyword BM25F scores
+        """
+        dataset_dict = {}
+        for keyword in keyword_list:
+            keyword_result = self.__search_index.search_keyword(keyword)
+            # Same as irods search, any unmatched keyword will cause search no result
+            if keyword_result == {}:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail="There is no matched content in the database",
+                )
+            for dataset, score in keyword_result.items():
+                dataset_dict[dataset] = dataset_dict.get(dataset, 0) + score
+        return dataset_dict
 
     def _handle_searched_data(self, keyword_list):
         """
         Handler for processing search result, store the number of keyword appear
         """
+        if self.__search_index.has_search_index():
+            return self._handle_indexed_data(keyword_list)
+        # Index is not available before irods metadata is loaded
         dataset_dict = {}
+        # All keywords are searched concurrently, each result is materialized once
+        search_result = self.__es.get("irods").process_keyword_searches(
+            self.__search, keyword_list
+        )
         for keyword in keyword_list:
-            search_result = self.__es.get("irods").process_keyword_search(
-                self.__search, keyword
-            )
-            for _ in search_result:
-                content_list = re.findall(
-                    rf"(\s{keyword}|{keyword}\s)", _[DataObjectMeta.value]
-                )
-                if content_list != []:
-                    dataset = re.sub(
-                        f"{iRODSConfig.IRODS_ROOT_PATH}/", "", _[Collection.name]
-                    )
+            pattern = re.compile(rf"(\s{keyword}|{keyword}\s)")
+            for _ in search_result[keyword]:
+                if pattern.search(_[DataObjectMeta.value]):
+                    dataset = self._handle_dataset_id(_[Collection.name])
                     if dataset not in dataset_dict:
                         dataset_dict[dataset] = 1
                     else:
@@ -52,12 +120,32 @@ class SearchLogic:
         """
         dataset_dict = {"submitter_id": []}
         keyword_list = re.findall("[a-zA-Z0-9]+", input_.lower())
-        searched_result = self._handle_searched_data(keyword_list)
-        dataset_dict["submitter_id"] = sorted(
-            searched_result, key=searched_result.get, reverse=True
-        )
+        # Keyword order does not affect the result
+        cache_key = tuple(sorted(keyword_list))
+        searched_dataset = self.__search_cache.get(cache_key)
+        if searched_dataset is None:
+            searched_result = self._handle_searched_data(keyword_list)
+            searched_dataset = sorted(
+                searched_result, key=searched_result.get, reverse=True
+            )
+            self.__search_cache.set(cache_key, searched_dataset)
+        # Cached list should not be changed by search filter relation
+        dataset_dict["submitter_id"] = list(searched_dataset)
         return dataset_dict
 
+    def generate_suggested_dataset(self, input_, limit):
+        """
+        Handler for generating the suggested dataset while typing
+        """
+        if not self.__search_suggestion.has_search_suggestion():
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Search suggestion is not ready",
+            )
+        return {
+            "suggestions": self.__search_suggestion.generate_suggestion(input_, limit)
+        }
+
     def implement_search_filter_relation(self, item):
         """
         Handler for processing relation between search and filter
@@ -65,10 +153,12 @@ class SearchLogic:
         # Search result has order, we need to update item.filter value based on search result
         # The relationship between search and filter will always be AND
         if item.filter != {}:
-            datasets = []
-            for dataset_id in item.search["submitter_id"]:
-                if dataset_id in item.filter["submitter_id"]:
-                    datasets.append(dataset_id)
+            filtered_dataset = set(item.filter["submitter_id"])
+            datasets = [
+                dataset_id
+                for dataset_id in item.search["submitter_id"]
+                if dataset_id in filtered_dataset
+            ]
             item.filter["submitter_id"] = datasets
             return datasets
         item.filter["submitter_id"] = item.search["submitter_id"]
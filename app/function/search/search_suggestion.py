@@ -0,0 +1,225 @@
+"""
+Functionality for suggesting datasets while typing
+- update_search_suggestion
+- has_search_suggestion
+- generate_suggestion
+"""
+import re
+import threading
+
+from app.cache import TTLCache
+
+SUGGESTION_FIELDS = {
+    "title": "title",
+    "keywords": "keyword",
+    "contributor_name": "contributor",
+}
+# Users typing the same word look up the same prefixes, matched trie nodes are kept
+MATCHED_CACHE_SIZE = 1024
+MATCHED_CACHE_TTL = 60 * 10
+
+
+class SuggestionNode:
+    """
+    Trie node, postings are only stored at the end of a term
+    """
+
+    __slots__ = ("children", "postings")
+
+    def __init__(self):
+        self.children = {}
+        self.postings = None
+
+
+class SearchSuggestion:
+    """
+    Trie of dataset description terms supporting typo tolerant prefix lookup
+    """
+
+    def __init__(self):
+        # Trie root and its matched node cache are replaced together
+        self.__trie = None
+        self.__lock = threading.Lock()
+
+    def _handle_dataset_id(self, submitter_id):
+        """
+        Handler for converting dataset description submitter_id to dataset submitter_id
+        """
+        return re.sub("-dataset_description$", "", submitter_id)
+
+    def _handle_term(self, root, term, posting):
+        """
+        Handler for adding term posting to trie
+        """
+        node = root
+        for char in term:
+            node = node.children.setdefault(char, SuggestionNode())
+        if node.postings is None:
+            node.postings = []
+        node.postings.append(posting)
+
+    def update_search_suggestion(self, data):
+        """
+        Handler for rebuilding the trie with dataset description data
+        """
+        root = SuggestionNode()
+        for _ in data:
+            dataset_id = self._handle_dataset_id(_["submitter_id"])
+            for field, field_name in SUGGESTION_FIELDS.items():
+                field_value = _.get(field)
+                if not field_value:
+                    continue
+                if not isinstance(field_value, list):
+                    field_value = [field_value]
+                for text in field_value:
+                    for match in re.finditer("[a-zA-Z0-9]+", text):
+                        posting = (dataset_id, field_name, text, match.start())
+                        self._handle_term(root, match.group(0).lower(), posting)
+        # Replace the whole trie at once, lookups in progress keep the old one
+        with self.__lock:
+            self.__trie = (root, TTLCache(MATCHED_CACHE_SIZE, MATCHED_CACHE_TTL))
+
+    def has_search_suggestion(self):
+        """
+        Handler for checking whether trie has been built
+        """
+        return self.__trie is not None
+
+    def _handle_max_distance(self, prefix):
+        """
+        Handler for getting allowed edit distance, short prefix must match exactly
+        """
+        if len(prefix) <= 2:
+            return 0
+        if len(prefix) <= 5:
+            return 1
+        return 2
+
+    def _handle_distance_row(self, prefix, row, char, max_distance):
+        """
+        Handler for calculating levenshtein row of prefix after appending char to term
+        Only cells within max_distance of the diagonal are calculated, cells outside
+        the band are always larger than max_distance and are kept at max_distance + 1
+        """
+        # Row 0 is the empty prefix, its distance is the term length
+        depth = row[0] + 1
+        limit = max_distance + 1
+        current_row = [depth] + [limit] * len(prefix)
+        start = max(1, depth - max_distance)
+        end = min(len(prefix), depth + max_distance)
+        for index in range(start, end + 1):
+            distance = row[index - 1] + (prefix[index - 1] != char)
+            if current_row[index - 1] + 1 < distance:
+                distance = current_row[index - 1] + 1
+            if row[index] + 1 < distance:
+                distance = row[index] + 1
+            current_row[index] = distance if distance < limit else limit
+        return current_row
+
+    def _handle_fuzzy_prefix(self, node, prefix, max_distance):
+        """
+        Handler for walking trie with levenshtein row of prefix
+        Trie node matching the whole prefix is returned with its edit distance
+        """
+        result = []
+        row = self._handle_distance_row(
+            prefix, range(len(prefix) + 1), prefix[0], max_distance
+        )
+        stack = [(node, prefix[0], row)]
+        while stack:
+            node, term, row = stack.pop()
+            distance = row[-1]
+            row_min = min(row)
+            if distance <= max_distance:
+                result.append((distance, term, node))
+                # Going deeper will not find a closer match
+                if row_min == distance:
+                    continue
+            if row_min > max_distance:
+                continue
+            children = node.children
+            if row_min == max_distance:
+                # Only a char matching the prefix on a cell at the limit keeps the
+                # distance, every other child exceeds max_distance
+                children = {
+                    char: children[char]
+                    for char in {
+                        prefix[index]
+                        for index in range(len(prefix))
+                        if row[index] == max_distance
+                    }
+                    if char in children
+                }
+            for char, child in children.items():
+                stack.append(
+                    (
+                        child,
+                        term + char,
+                        self._handle_distance_row(prefix, row, char, max_distance),
+                    )
+                )
+        return result
+
+    def _handle_matched_term(self, matched_node):
+        """
+        Handler for yielding terms below matched nodes, closest and shortest first
+        """
+        visited = set()
+        for distance in sorted({_[0] for _ in matched_node}):
+            queue = sorted(
+                [_ for _ in matched_node if _[0] == distance],
+                key=lambda _: (len(_[1]), _[1]),
+            )
+            # Breadth first, shorter terms will be suggested first
+            position = 0
+            while position < len(queue):
+                _, term, node = queue[position]
+                position += 1
+                if id(node) in visited:
+                    continue
+                visited.add(id(node))
+                if node.postings is not None:
+                    yield distance, term, node.postings
+                for char in sorted(node.children):
+                    queue.append((distance, term + char, node.children[char]))
+
+    def generate_suggestion(self, input_, limit):
+        """
+        Handler for generating datasets with highlight span matching the last typed word
+        """
+        trie = self.__trie
+        keyword_list = re.findall("[a-zA-Z0-9]+", input_.lower())
+        if trie is None or keyword_list == []:
+            return []
+        root, cache = trie
+        prefix = keyword_list[-1]
+        matched_node = cache.get(prefix)
+        if matched_node is None:
+            # First character must be typed correctly, keeps the lookup small
+            node = root.children.get(prefix[0])
+            if node is None:
+                return []
+            matched_node = self._handle_fuzzy_prefix(
+                node, prefix, self._handle_max_distance(prefix)
+            )
+            cache.set(prefix, matched_node)
+        suggestion = []
+        suggested = set()
+        for distance, term, postings in self._handle_matched_term(matched_node):
+            for dataset_id, field_name, text, start in postings:
+                key = (dataset_id, field_name, text)
+                if key in suggested:
+                    continue
+                suggested.add(key)
+                suggestion.append(
+                    {
+                        "datasetId": dataset_id,
+                        "field": field_name,
+                        "text": text,
+                        "highlight": [start, start + min(len(prefix), len(term))],
+                        "distance": distance,
+                    }
+                )
+                if len(suggestion) == limit:
+                    return suggestion
+        return suggestion
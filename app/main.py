@@ -12,20 +12,22 @@ Functional APIs provided by the server
 - /instance
 - /dicom/export/{identifier}
 """
+import asyncio
 import copy
 import io
 import logging
 import mimetypes
 import re
-import time
 
-from fastapi import Depends, FastAPI, HTTPException, status
+from fastapi import Depends, FastAPI, HTTPException, Query, Request, status
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse, Response, StreamingResponse
 from fastapi_utils.tasks import repeat_every
+from irods.exception import NetworkException
 from pyorthanc import find
 
 from app.config import Gen3Config, iRODSConfig
+from app.context import RequestContext
 from app.data_schema import (
     ActionParam,
     CollectionItem,
@@ -37,22 +39,30 @@ from app.data_schema import (
     access_revoke_responses,
     access_token_responses,
     collection_responses,
+    data_responses,
     filter_responses,
     instance_responses,
     one_off_access_responses,
     pagination_responses,
     query_responses,
     record_responses,
+    suggestion_responses,
 )
+from app.function.download.download_budget import DownloadBudget
+from app.function.download.download_range import DownloadRange
+from app.function.download.download_response import DownloadResponse
+from app.function.download.download_stream import DownloadStream
 from app.function.filter.filter_editor import FilterEditor
 from app.function.filter.filter_formatter import FilterFormatter
 from app.function.filter.filter_generator import FilterGenerator
 from app.function.filter.filter_logic import FilterLogic
+from app.function.pagination.pagination_cache import PaginationCache
 from app.function.pagination.pagination_formatter import PaginationFormatter
-from app.function.pagination.pagination_logic import PaginationLogic
+from app.function.pagination.pagination_logic import UNIVERSE_TTL, PaginationLogic
 from app.function.query.query_formatter import QueryFormatter
 from app.function.query.query_logic import QueryLogic
 from app.function.search.search_logic import SearchLogic
+from app.stream import generate_json_stream
 from middleware.auth import Authenticator
 from services.external_service import ExternalService
 
@@ -140,17 +150,25 @@ app.add_middleware(
     expose_headers=[
         "X-File-Name",
         "X-One-Off",
+        "Content-Range",
+        "Accept-Ranges",
+        "ETag",
+        "Last-Modified",
     ],
 )
 
 CONNECTION = None
 FILTER_GENERATED = False
 ES = ExternalService()
+DR = DownloadRange()
+DS = DownloadStream(DownloadBudget(iRODSConfig.IRODS_MAX_INFLIGHT_BYTES))
 FE = FilterEditor()
 FG = FilterGenerator(FE, ES)
 FF = FilterFormatter(FE)
+PC = PaginationCache()
 PF = PaginationFormatter(FE)
-PL = PaginationLogic(FE, FilterLogic(), SearchLogic(ES), ES)
+SL = SearchLogic(ES)
+PL = PaginationLogic(FE, FilterLogic(), SL, ES)
 QF = QueryFormatter(FE)
 QL = QueryLogic(ES)
 A = Authenticator(ES)
@@ -162,30 +180,92 @@ async def start_up():
     Create service connection.
     """
     global CONNECTION
+    await asyncio.to_thread(ES.update_service_status)
     CONNECTION = ES.check_service_status(True)
     logger.info(CONNECTION)
 
 
+@app.on_event("startup")
+@repeat_every(seconds=1)
+async def monitor_service_status():
+    """
+    Probe service connection off the request path, each service decides its own pace.
+    """
+    await asyncio.to_thread(ES.update_service_status)
+
+
+@app.on_event("shutdown")
+async def shut_down():
+    """
+    Close service connection.
+    """
+    await ES.get("gen3").close()
+    ES.get("irods").close()
+
+
 @app.on_event("startup")
 @repeat_every(seconds=60 * 60 * 24)
-def periodic_execution():
+async def periodic_execution():
     """
-    Update filter and cleanup users periodically.
+    Update filter, search index and suggestion, cleanup users periodically.
     """
     global FILTER_GENERATED
     FILTER_GENERATED = False
-    if CONNECTION["gen3"]:
+    # Status recorded by the background monitor, not the startup snapshot
+    connection = ES.check_service_status(True)
+    if connection["gen3"]:
         try:
-            FILTER_GENERATED = FG.generate_public_filter()
+            FILTER_GENERATED = await FG.generate_public_filter()
         except Exception as error:
             logger.error("Invalid filter metadata %s has been used.", error)
         if FILTER_GENERATED:
             logger.info("Default filter has been updated.")
+            # Cached pagination content is based on the previous filter
+            logger.info("Pagination cache %s.", PC.get_cache_stats())
+            PC.clear_pagination_cache()
+            PL.clear_pagination_universe()
     else:
         logger.warning("Failed to update default filter.")
 
+    if connection["irods"]:
+        try:
+            await asyncio.to_thread(SL.update_search_index)
+            logger.info("Search index has been updated.")
+            # Cached search results are based on the previous index
+            PC.clear_pagination_cache()
+        except Exception as error:
+            logger.error("Failed to update search index %s.", error)
+
+    if connection["gen3"]:
+        try:
+            await SL.update_search_suggestion()
+            logger.info("Search suggestion has been updated.")
+        except Exception as error:
+            logger.error("Failed to update search suggestion %s.", error)
+
+    if connection["irods"]:
+        evicted = ES.get("irods").evict_idle_session()
+        logger.info("%s idle iRODS sessions have been closed.", evicted)
+        logger.info("iRODS session pool %s.", ES.get("irods").get_metrics())
+
     if A.get_authorized_user_number() > 1:
         A.cleanup_authorized_user()
+    A.cleanup_revoked_user()
+
+
+@app.on_event("startup")
+@repeat_every(seconds=UNIVERSE_TTL, wait_first=True)
+async def periodic_filter_index():
+    """
+    Update public filter index as often as the pagination universe is refreshed.
+    """
+    # Index is first built together with the default filter
+    if FILTER_GENERATED and ES.check_service_status(True)["gen3"]:
+        try:
+            await FG.update_filter_index()
+            logger.info("Filter index has been updated.")
+        except Exception as error:
+            logger.error("Failed to update filter index %s.", error)
 
 
 @app.get("/", tags=["Root"])
@@ -330,7 +410,7 @@ async def get_gen3_record(
     )
 
 
-def _handle_private_filter(access_scope):
+async def _handle_private_filter(access_scope):
     """
     Handler for generating private access and private filter
     """
@@ -338,7 +418,7 @@ def _handle_private_filter(access_scope):
     if len(access_scope) > 1:
         private_access = copy.deepcopy(access_scope)
         private_access.remove(Gen3Config.GEN3_PUBLIC_ACCESS)
-        private_filter = FG.generate_private_filter(private_access)
+        private_filter = await FG.generate_private_filter(private_access)
     return private_filter
 
 
@@ -351,6 +431,7 @@ def _handle_private_filter(access_scope):
 async def get_gen3_graphql_query(
     item: GraphQLQueryItem,
     mode: ModeParam,
+    stream: bool = False,
     authority: dict = Depends(A.handle_get_authority),
     connection: dict = Depends(ES.check_service_status),
 ):
@@ -369,6 +450,9 @@ async def get_gen3_graphql_query(
     **search**
     - string content,
     - only available in dataset_description/manifest/case nodes
+
+    **stream(parameter)**
+    - boolean content, encode the response incrementally
     """
     if connection["gen3"] is None:
         raise HTTPException(
@@ -410,18 +494,26 @@ async def get_gen3_graphql_query(
             detail="Search does not provide in current node",
         )
 
-    QF.set_query_mode(mode)
-    QF.set_private_filter(_handle_private_filter(authority["access_scope"]))
+    context = RequestContext(
+        await _handle_private_filter(authority["access_scope"]), mode
+    )
     item.access = authority["access_scope"]
-    query_result = QL.get_query_data(item)
+    query_result = await QL.get_query_data(item)
 
     def handle_result():
         if len(query_result) == 1:
             return query_result[0]
         return query_result
 
+    if stream and mode == "data" and len(query_result) > 1:
+        # Datasets are encoded one at a time
+        return StreamingResponse(
+            generate_json_stream("data", query_result),
+            media_type="application/json",
+            headers={"X-One-Off": authority["one_off_token"]},
+        )
     return JSONResponse(
-        content=QF.process_data_output(handle_result()),
+        content=QF.process_data_output(handle_result(), context),
         headers={"X-One-Off": authority["one_off_token"]},
     )
 
@@ -435,6 +527,7 @@ async def get_gen3_graphql_query(
 async def get_gen3_graphql_pagination(
     item: GraphQLPaginationItem,
     search: str = "",
+    stream: bool = False,
     authority: dict = Depends(A.handle_get_authority),
     connection: dict = Depends(ES.check_service_status),
 ):
@@ -459,6 +552,9 @@ async def get_gen3_graphql_pagination(
 
     **search(parameter)**:
     - string content
+
+    **stream(parameter)**:
+    - boolean content, format and encode the response one dataset at a time
     """
     if connection["gen3"] is None:
         raise HTTPException(
@@ -471,27 +567,74 @@ async def get_gen3_graphql_pagination(
             detail="Please check the service (iRODS) status",
         )
 
-    PL.set_private_filter(_handle_private_filter(authority["access_scope"]))
-    item.access = authority["access_scope"]
-    is_public_access_filtered = PL.process_pagination_item(item, search)
-    data_count, match_pair = PL.get_pagination_count(item)
-    query_result = PL.get_pagination_data(item, match_pair, is_public_access_filtered)
-    # If both asc and desc are None, datasets ordered by self-written order function
-    if item.asc is None and item.desc is None:
-        query_result = sorted(
-            query_result,
-            key=lambda dict: item.filter["submitter_id"].index(dict["submitter_id"]),
+    cache_key = PC.generate_cache_key(item, search, authority["access_scope"])
+    content = PC.get_pagination_cache(cache_key)
+    if content is None:
+        context = RequestContext(
+            await _handle_private_filter(authority["access_scope"])
         )
-    return JSONResponse(
-        content={
+        item.access = authority["access_scope"]
+        is_public_access_filtered = await PL.process_pagination_item(
+            item, search, context
+        )
+        data_count, match_pair = await PL.get_pagination_count(item)
+        query_result = await PL.get_pagination_data(
+            item, match_pair, is_public_access_filtered
+        )
+        if stream:
+            # Whole page will not be kept, only one dataset is formatted at a time
+            return StreamingResponse(
+                generate_json_stream(
+                    "items",
+                    PF.generate_data_structure(query_result),
+                    {"numberPerPage": item.limit, "total": data_count},
+                ),
+                media_type="application/json",
+                headers={"X-One-Off": authority["one_off_token"]},
+            )
+        content = {
             "items": PF.reconstruct_data_structure(query_result),
             "numberPerPage": item.limit,
             "total": data_count,
-        },
+        }
+        PC.set_pagination_cache(cache_key, content)
+    if stream:
+        return StreamingResponse(
+            generate_json_stream(
+                "items",
+                content["items"],
+                {"numberPerPage": content["numberPerPage"], "total": content["total"]},
+            ),
+            media_type="application/json",
+            headers={"X-One-Off": authority["one_off_token"]},
+        )
+    return JSONResponse(
+        content=content,
         headers={"X-One-Off": authority["one_off_token"]},
     )
 
 
+@app.get(
+    "/graphql/suggestion",
+    tags=["Gen3"],
+    summary="Suggest datasets while typing",
+    responses=suggestion_responses,
+)
+async def get_gen3_graphql_suggestion(
+    search: str = "", limit: int = Query(10, ge=1, le=50)
+):
+    """
+    /graphql/suggestion/?search=<string>&limit=<integer>
+
+    Return public datasets whose title, keywords or contributors match the last typed word.
+    Typing errors are tolerated, longer words allow more edits.
+
+    - Default search = ""
+    - Default limit = 10, between 1 and 50
+    """
+    return SL.generate_suggested_dataset(search, limit)
+
+
 @app.get(
     "/filter",
     tags=["Gen3"],
@@ -519,11 +662,11 @@ async def get_gen3_filter(
     retry = 0
     while retry < 12 and not FILTER_GENERATED:
         retry += 1
-        time.sleep(retry)
-    FF.set_private_filter(_handle_private_filter(authority["access_scope"]))
+        await asyncio.sleep(retry)
+    context = RequestContext(await _handle_private_filter(authority["access_scope"]))
     if sidebar:
-        return FF.generate_sidebar_filter_format()
-    return FF.generate_filter_format()
+        return FF.generate_sidebar_filter_format(context)
+    return FF.generate_filter_format(context)
 
 
 ############################################
@@ -537,7 +680,7 @@ IRODS_REQUEST = {
 }
 
 
-def _handle_irods_access(endpoint, path, access_scope):
+async def _handle_irods_access(endpoint, path, access_scope):
     global PREVIOUS_REQUEST
     dataset = list(filter(None, path.split("/")))
     filter_ = {}
@@ -554,7 +697,7 @@ def _handle_irods_access(endpoint, path, access_scope):
         filter=filter_,
         access=access_scope,
     )
-    query_result = ES.get("gen3").process_graphql_query(query_item)
+    query_result = await ES.get("gen3").process_graphql_query(query_item)
     accessible = list(map(lambda d: d["submitter_id"], query_result))
     if not accessible:
         raise HTTPException(
@@ -567,6 +710,25 @@ def _handle_irods_access(endpoint, path, access_scope):
     return accessible
 
 
+async def _handle_irods_session(pool):
+    """
+    Check out an iRODS session without blocking other requests.
+    """
+    try:
+        return await asyncio.to_thread(pool.acquire)
+    except TimeoutError as error:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="iRODS service is busy, please try again later",
+        ) from error
+    except (RuntimeError, NetworkException) as error:
+        # Pool is closed during shutdown or a new session fails validation
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="iRODS service is unavailable, please try again later",
+        ) from error
+
+
 @app.post(
     "/collection",
     tags=["iRODS"],
@@ -594,7 +756,7 @@ async def get_irods_collection(
             detail="Invalid path format is used",
         )
 
-    accessible = _handle_irods_access(
+    accessible = await _handle_irods_access(
         "/collection", item.path, authority["access_scope"]
     )
 
@@ -611,20 +773,24 @@ async def get_irods_collection(
             )
         return collection
 
+    session = await _handle_irods_session(connection["irods"])
+    discard = False
     try:
-        coll = connection["irods"].collections.get(
-            f"{iRODSConfig.IRODS_ROOT_PATH}{item.path}"
-        )
+        coll = session.collections.get(f"{iRODSConfig.IRODS_ROOT_PATH}{item.path}")
         result = {
             "folders": handle_collection(coll.subcollections),
             "files": handle_collection(coll.data_objects),
         }
         return result
     except Exception as error:
+        # Broken session should not be reused
+        discard = isinstance(error, (NetworkException, OSError))
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Data not found in the provided path",
         ) from error
+    finally:
+        connection["irods"].release(session, discard)
 
 
 @app.get(
@@ -632,8 +798,10 @@ async def get_irods_collection(
     tags=["iRODS"],
     summary="Download irods file",
     response_description="Successfully return a file with data",
+    responses=data_responses,
 )
 async def get_irods_data_file(
+    request: Request,
     action: ActionParam,
     filepath: str,
     token: str = None,
@@ -646,9 +814,9 @@ async def get_irods_data_file(
 
     - **action**: Action should be either preview or download.
     - **filepath**: Required iRODS file path.
-    """
-    chunk_size = 1024 * 1024 * 1024
 
+    Range, If-Range, If-None-Match and If-Modified-Since headers are supported.
+    """
     if connection["gen3"] is None or connection["irods"] is None:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -661,21 +829,10 @@ async def get_irods_data_file(
         )
 
     access_scope = A.handle_get_one_off_authority(token)
-    _handle_irods_access(f"/data/{action}", filepath, access_scope)
+    await _handle_irods_access(f"/data/{action}", filepath, access_scope)
 
-    try:
-        file = connection["irods"].data_objects.get(
-            f"{iRODSConfig.IRODS_ROOT_PATH}/{filepath}"
-        )
-        filename = file.name
-    except Exception as error:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Data not found in the provided path",
-        ) from error
-
-    def handle_header():
-        header = None
+    def handle_header(filename):
+        header = {}
         if action == "download":
             header = {
                 "X-File-Name": filename,
@@ -683,19 +840,69 @@ async def get_irods_data_file(
             }
         return header
 
-    def handle_mimetype():
+    def handle_mimetype(filename):
         return mimetypes.guess_type(filename)[0]
 
-    def iterate_file():
-        with file.open("r") as file_like:
-            chunk = file_like.read(chunk_size)
-            while chunk:
-                yield chunk
-                chunk = file_like.read(chunk_size)
+    def handle_response(pool, session):
+        try:
+            file = session.data_objects.get(f"{iRODSConfig.IRODS_ROOT_PATH}/{filepath}")
+        except Exception as error:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Data not found in the provided path",
+            ) from error
+
+        file_header = DR.generate_file_header(file)
+        if DR.is_not_modified(request.headers, file_header):
+            return Response(
+                status_code=status.HTTP_304_NOT_MODIFIED, headers=file_header
+            )
 
-    return StreamingResponse(
-        iterate_file(), media_type=handle_mimetype(), headers=handle_header()
-    )
+        header = handle_header(file.name)
+        header.update(file_header)
+        ranges = DR.generate_range(
+            request.headers.get("range"),
+            request.headers.get("if-range"),
+            file.size,
+            file_header,
+        )
+        if ranges is None:
+            header["Content-Length"] = str(file.size)
+            return DownloadResponse(
+                DS.generate_stream(file, [(0, file.size - 1)] if file.size else []),
+                pool,
+                session,
+                media_type=handle_mimetype(file.name),
+                headers=header,
+            )
+
+        range_header, media_type, separators = DR.generate_range_header(
+            ranges, file.size, handle_mimetype(file.name)
+        )
+        header.update(range_header)
+        return DownloadResponse(
+            DS.generate_stream(file, ranges, separators),
+            pool,
+            session,
+            status_code=status.HTTP_206_PARTIAL_CONTENT,
+            media_type=media_type,
+            headers=header,
+        )
+
+    # Data object keeps using the session until the file has been sent
+    session = await _handle_irods_session(connection["irods"])
+    try:
+        response = handle_response(connection["irods"], session)
+    except BaseException as error:
+        # Broken session should not be reused
+        connection["irods"].release(
+            session, isinstance(error.__cause__, (NetworkException, OSError))
+        )
+        raise
+    if not isinstance(response, DownloadResponse):
+        # Not modified response does not read the file
+        connection["irods"].release(session)
+    return response
 
 
 ##############################
@@ -0,0 +1,21 @@
+"""
+Functionality for streaming json response
+- generate_json_stream
+"""
+import orjson
+
+
+def generate_json_stream(key, items, content=None):
+    """
+    Generator for json object bytes, items under key are encoded one at a time
+    content -> other members of the json object
+    """
+    yield b"{" + orjson.dumps(key) + b":["
+    for index, item in enumerate(items):
+        if index:
+            yield b","
+        yield orjson.dumps(item)
+    yield b"]"
+    for member, value in (content or {}).items():
+        yield b"," + orjson.dumps(member) + b":" + orjson.dumps(value)
+    yield b"}"
@@ -3,6 +3,7 @@ Functionality for backend services access control
 - AUTHORIZED_USERS
 - get_authorized_user_number
 - cleanup_authorized_user
+- cleanup_revoked_user
 - handle_revoke_authority
 - handle_get_one_off_authority
 - handle_get_authority
@@ -10,13 +11,14 @@ Functionality for backend services access control
 """
 import logging
 from datetime import datetime, timedelta, timezone
-from multiprocessing import Manager
 
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 
 from app.config import Config, Gen3Config
 from middleware.jwt import JWT
+from middleware.revocation import create_revocation_list
+from middleware.session import create_session_store
 from middleware.user import User
 
 logging.basicConfig()
@@ -24,10 +26,30 @@ logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
 
 security = HTTPBearer()
-manager = Manager()
 jwt = JWT()
 
-AUTHORIZED_USERS = manager.dict()
+# Shared by all workers, see SESSION_STORE_URL
+AUTHORIZED_USERS = create_session_store()
+# Only used when QUERY_STATELESS_AUTH is enabled
+REVOKED_USERS = create_revocation_list()
+
+
+class Authority(dict):
+    """
+    access_scope -> user access scope is required
+    one_off -> function for generating one off token is required
+    """
+
+    def __init__(self, access_scope, one_off):
+        super().__init__(access_scope=access_scope)
+        self.__one_off = one_off
+
+    def __missing__(self, key):
+        # One off token will only be generated when the response uses it
+        if key != "one_off_token":
+            raise KeyError(key)
+        self[key] = self.__one_off()
+        return self[key]
 
 
 class Authenticator:
@@ -53,15 +75,23 @@ class Authenticator:
         """
         return len(AUTHORIZED_USERS)
 
-    def _delete_expired_user(self, user):
+    def _delete_expired_user(self, identity):
         """
         Handler for finding and deleting expired users from AUTHORIZED_USERS
+        Valid user is returned, None is returned if user is missing or expired
         """
-        if user in AUTHORIZED_USERS and user != self.__public["identity"]:
+        user = AUTHORIZED_USERS.get(identity)
+        if user is not None and identity != self.__public["identity"]:
             current_time = datetime.now()
-            expire_time = AUTHORIZED_USERS[user].get_user_expire_time()
+            expire_time = user.get_user_expire_time()
             if current_time >= expire_time:
-                del AUTHORIZED_USERS[user]
+                try:
+                    del AUTHORIZED_USERS[identity]
+                except KeyError:
+                    # Already deleted by another worker
+                    pass
+                return None
+        return user
 
     def cleanup_authorized_user(self):
         """
@@ -72,6 +102,30 @@ class Authenticator:
                 self._delete_expired_user(user)
         logger.info("All expired users have been deleted.")
 
+    def cleanup_revoked_user(self):
+        """
+        Handler for deleting revoked users which tokens have expired
+        """
+        REVOKED_USERS.cleanup()
+        logger.info("All expired revoked users have been deleted.")
+
+    def _handle_stateless_user(self, payload):
+        """
+        Handler for generating user object from the signed token payload
+        """
+        identity = payload["identity"]
+        expire_time = payload.get("expire", "None")
+        if expire_time == "None":
+            expire_time = None
+        else:
+            expire_time = datetime.fromisoformat(expire_time)
+            if datetime.now() >= expire_time:
+                raise ValueError("Token has expired")
+        # Token generated before stateless mode does not have issued time
+        if REVOKED_USERS.is_revoked(identity, payload.get("issued", 0)):
+            raise ValueError("Token has been revoked")
+        return User(identity, payload["scope"], expire_time)
+
     def _handle_authenticate_token(self, token, auth_type=None):
         """
         Handler for verifying the authenticate token validity
@@ -80,12 +134,20 @@ class Authenticator:
             if token == self.__public["token"]:
                 return AUTHORIZED_USERS[self.__public["identity"]]
             # Token will always be decoded
-            decrypt_identity = jwt.decoding_token(token)["identity"]
+            payload = jwt.decoding_token(token)
+            if Config.QUERY_STATELESS_AUTH:
+                # Signature and expiry are enough, no shared session state is required
+                return self._handle_stateless_user(payload)
+            decrypt_identity = payload["identity"]
             if auth_type is None:
                 # Check and remove expired user
                 # Currently should only for self.handle_get_authority
-                self._delete_expired_user(decrypt_identity)
-            return AUTHORIZED_USERS[decrypt_identity]
+                user = self._delete_expired_user(decrypt_identity)
+            else:
+                user = AUTHORIZED_USERS.get(decrypt_identity)
+            if user is None:
+                raise KeyError(decrypt_identity)
+            return user
         except Exception as error:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
@@ -102,6 +164,11 @@ class Authenticator:
         verify_user = self._handle_authenticate_token(token.credentials, "revoke")
         if verify_user.get_user_identity() == self.__public["identity"]:
             return False
+        if Config.QUERY_STATELESS_AUTH:
+            REVOKED_USERS.add(
+                verify_user.get_user_identity(), verify_user.get_user_expire_time()
+            )
+            return True
         del AUTHORIZED_USERS[verify_user.get_user_identity()]
         return True
 
@@ -119,17 +186,18 @@ class Authenticator:
         Handler for returning user access scope if token is valid
         """
         verify_user = self._handle_authenticate_token(token.credentials)
-        one_off_token = jwt.encoding_token(
-            {
-                "identity": verify_user.get_user_identity(),
-                "exp": datetime.now(tz=timezone.utc) + timedelta(seconds=60),
-            }
-        )
-        authority = {
-            "access_scope": verify_user.get_user_access_scope(),
-            "one_off_token": one_off_token,
-        }
-        return authority
+
+        def handle_one_off_token():
+            return jwt.encoding_token(
+                {
+                    "identity": verify_user.get_user_identity(),
+                    "scope": verify_user.get_user_access_scope(),
+                    "issued": datetime.now(tz=timezone.utc).timestamp(),
+                    "exp": datetime.now(tz=timezone.utc) + timedelta(seconds=60),
+                }
+            )
+
+        return Authority(verify_user.get_user_access_scope(), handle_one_off_token)
 
     def _handle_user_authority(self, item, user_yaml):
         """
@@ -139,17 +207,19 @@ class Authenticator:
         expiration = item.expiration
         identity = f"{email}>{item.machine}>{expiration}"
         if email in user_yaml and expiration != "false":
-            # Avoid user object expired but not removed
-            # Provide auto renew ability when user request access
-            # Always return valid user object
-            self._delete_expired_user(identity)
-            if identity in AUTHORIZED_USERS:
-                return AUTHORIZED_USERS[identity]
+            if not Config.QUERY_STATELESS_AUTH:
+                # Avoid user object expired but not removed
+                # Provide auto renew ability when user request access
+                # Always return valid user object
+                user = self._delete_expired_user(identity)
+                if user is not None:
+                    return user
             policies = user_yaml[email]["policies"]
             access_scope = self.__es.get("gen3").process_program_project(policies)
             expire_time = datetime.fromtimestamp(int(expiration) / 1000)
             user = User(identity, access_scope, expire_time)
-            AUTHORIZED_USERS[identity] = user
+            if not Config.QUERY_STATELESS_AUTH:
+                AUTHORIZED_USERS[identity] = user
             return user
         return AUTHORIZED_USERS[self.__public["identity"]]
 
@@ -164,6 +234,7 @@ class Authenticator:
                 "identity": user.get_user_identity(),
                 "scope": user.get_user_access_scope(),
                 "expire": str(user.get_user_expire_time()),
+                "issued": datetime.now(tz=timezone.utc).timestamp(),
             }
         )
         return access_token
@@ -3,10 +3,19 @@ Functionality for encoding/decoding access token
 - encoding_token
 - decoding_token
 """
+import copy
+import time
+
 import jwt
 
+from app.cache import TTLCache
 from app.config import Config
 
+# Portal sends the same bearer token with every request
+# Verified tokens are kept to avoid repeating the HMAC check
+TOKEN_CACHE_SIZE = 1024
+TOKEN_CACHE_TTL = 60 * 5
+
 
 class JWT:
     """
@@ -16,6 +25,7 @@ class JWT:
     def __init__(self):
         self.__algorithm = "HS256"
         self.__secure = Config.QUERY_SECURE_KEY
+        self.__verified = TTLCache(TOKEN_CACHE_SIZE, TOKEN_CACHE_TTL)
 
     def encoding_token(self, payload):
         """
@@ -28,5 +38,13 @@ class JWT:
         """
         Handler for decoding token
         """
-        decoded = jwt.decode(token, self.__secure, self.__algorithm)
-        return decoded
+        decoded = self.__verified.get(token)
+        if decoded is None or ("exp" in decoded and time.time() >= decoded["exp"]):
+            # Invalid or expired token will raise an error here
+            decoded = jwt.decode(token, self.__secure, self.__algorithm)
+            ttl = TOKEN_CACHE_TTL
+            if "exp" in decoded:
+                ttl = min(ttl, decoded["exp"] - time.time())
+            self.__verified.set(token, decoded, ttl)
+        # Nested values such as scope list must not be shared with the cache
+        return copy.deepcopy(decoded)
@@ -0,0 +1,125 @@
+"""
+Functionality for revoking signed access tokens in stateless authorization
+- BloomFilter
+- RevocationList
+- create_revocation_list
+"""
+import hashlib
+import json
+import threading
+import time
+from datetime import datetime
+
+from middleware.session import create_session_backend
+
+# Revocations made by other workers will be applied after this number of seconds
+REFRESH_INTERVAL = 5
+
+
+class BloomFilter:
+    """
+    size -> number of bits
+    hashes -> number of hash positions for each value
+    """
+
+    def __init__(self, size=8192 * 8, hashes=4):
+        self.__size = size
+        self.__hashes = hashes
+        self.__bits = bytearray(size // 8)
+
+    def _handle_positions(self, value):
+        """
+        Handler for generating bit positions of value
+        """
+        digest = hashlib.blake2b(
+            value.encode("utf-8"), digest_size=8 * self.__hashes
+        ).digest()
+        for index in range(self.__hashes):
+            chunk = digest[index * 8 : (index + 1) * 8]
+            yield int.from_bytes(chunk, "little") % self.__size
+
+    def add(self, value):
+        """
+        Handler for adding value
+        """
+        for position in self._handle_positions(value):
+            self.__bits[position // 8] |= 1 << (position % 8)
+
+    def __contains__(self, value):
+        for position in self._handle_positions(value):
+            if not self.__bits[position // 8] & (1 << (position % 8)):
+                return False
+        return True
+
+
+class RevocationList:
+    """
+    Bloom filter and exact set kept in each worker, synchronized through backend
+    backend -> sqlite or redis backend object is required
+    """
+
+    def __init__(self, backend):
+        self.__backend = backend
+        self.__bloom = BloomFilter()
+        self.__revoked = {}
+        self.__refresh_time = 0
+        self.__lock = threading.Lock()
+
+    def _handle_refresh(self, force=False):
+        """
+        Handler for reloading revoked identities from backend
+        """
+        current_time = time.monotonic()
+        if not force and current_time - self.__refresh_time < REFRESH_INTERVAL:
+            return
+        with self.__lock:
+            revoked = {}
+            bloom = BloomFilter()
+            for identity, data in self.__backend.items():
+                revoked[identity] = json.loads(data)
+                bloom.add(identity)
+            self.__revoked = revoked
+            self.__bloom = bloom
+            self.__refresh_time = current_time
+
+    def add(self, identity, expire_time):
+        """
+        Handler for revoking all tokens issued to identity until now
+        """
+        record = {
+            "revoked": time.time(),
+            "expire": None if expire_time is None else expire_time.timestamp(),
+        }
+        with self.__lock:
+            self.__backend.set(identity, json.dumps(record))
+            self.__revoked[identity] = record
+            self.__bloom.add(identity)
+
+    def is_revoked(self, identity, issued):
+        """
+        Handler for checking whether a token issued at issued timestamp is revoked
+        """
+        self._handle_refresh()
+        # Most identities are never revoked, bloom filter answers without exact lookup
+        if identity not in self.__bloom:
+            return False
+        record = self.__revoked.get(identity)
+        return record is not None and issued <= record["revoked"]
+
+    def cleanup(self):
+        """
+        Handler for deleting revoked identities which tokens have expired
+        """
+        current_time = datetime.now().timestamp()
+        for identity, data in self.__backend.items():
+            expire = json.loads(data)["expire"]
+            if expire is not None and current_time >= expire:
+                self.__backend.delete(identity)
+        self._handle_refresh(True)
+
+
+def create_revocation_list():
+    """
+    Handler for creating revocation list shared by all workers
+    """
+    return RevocationList(create_session_backend("revocations"))
@@ -0,0 +1,321 @@
+"""
+Functionality for storing authorized user sessions
+- SQLiteBackend
+- RedisBackend
+- SessionStore
+- create_session_backend
+- create_session_store
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+import uuid
+from datetime import datetime
+
+from app.cache import TTLCache
+from app.config import Config
+from middleware.user import User
+
+# Deserialized users are answered by each worker without reaching the backend
+LOCAL_SIZE = 1024
+LOCAL_TTL = 30
+# Users deleted by other workers will be rejected after this number of seconds
+REVISION_INTERVAL = 5
+REVISION_KEY = "revision"
+
+
+class SQLiteBackend:
+    """
+    Shared by all workers on the same host
+    path -> sqlite database file path is required
+    table -> table name used to store the data
+    """
+
+    def __init__(self, path, table="users"):
+        self.__path = path
+        self.__table = table
+        self.__connection = None
+        self.__pid = None
+        self.__lock = threading.Lock()
+
+    def _handle_connection(self):
+        """
+        Handler for creating the connection in current process
+        """
+        # Connection should not be shared with forked gunicorn workers
+        if self.__connection is None or self.__pid != os.getpid():
+            self.__connection = sqlite3.connect(
+                self.__path, timeout=10, check_same_thread=False
+            )
+            self.__connection.execute("PRAGMA journal_mode=WAL")
+            self.__connection.execute(
+                f"CREATE TABLE IF NOT EXISTS {self.__table} "
+                + "(identity TEXT PRIMARY KEY, data TEXT)"
+            )
+            self.__connection.commit()
+            self.__pid = os.getpid()
+        return self.__connection
+
+    def get(self, identity):
+        """
+        Handler for getting serialized user
+        """
+        with self.__lock:
+            row = (
+                self._handle_connection()
+                .execute(
+                    f"SELECT data FROM {self.__table} WHERE identity = ?", (identity,)
+                )
+                .fetchone()
+            )
+        if row is None:
+            return None
+        return row[0]
+
+    def set(self, identity, data):
+        """
+        Handler for adding or replacing serialized user
+        """
+        with self.__lock:
+            connection = self._handle_connection()
+            connection.execute(
+                f"INSERT OR REPLACE INTO {self.__table} (identity, data) VALUES (?, ?)",
+                (identity, data),
+            )
+            connection.commit()
+
+    def delete(self, identity):
+        """
+        Handler for deleting user, return whether user existed
+        """
+        with self.__lock:
+            connection = self._handle_connection()
+            cursor = connection.execute(
+                f"DELETE FROM {self.__table} WHERE identity = ?", (identity,)
+            )
+            connection.commit()
+        return cursor.rowcount > 0
+
+    def keys(self):
+        """
+        Handler for getting all user identities
+        """
+        with self.__lock:
+            rows = self._handle_connection().execute(
+                f"SELECT identity FROM {self.__table}"
+            )
+            return [row[0] for row in rows]
+
+    def items(self):
+        """
+        Handler for getting all user identities with serialized user
+        """
+        with self.__lock:
+            rows = self._handle_connection().execute(
+                f"SELECT identity, data FROM {self.__table}"
+            )
+            return [(row[0], row[1]) for row in rows]
+
+
+class RedisBackend:
+    """
+    Shared by all workers on all hosts
+    client -> redis compatible client object is required
+    """
+
+    def __init__(self, client, prefix="12labours:users:"):
+        self.__client = client
+        self.__prefix = prefix
+
+    def _handle_value(self, value):
+        """
+        Handler for decoding redis response
+        """
+        if isinstance(value, bytes):
+            return value.decode("utf-8")
+        return value
+
+    def get(self, identity):
+        """
+        Handler for getting serialized user
+        """
+        return self._handle_value(self.__client.get(f"{self.__prefix}{identity}"))
+
+    def set(self, identity, data):
+        """
+        Handler for adding or replacing serialized user
+        """
+        self.__client.set(f"{self.__prefix}{identity}", data)
+
+    def delete(self, identity):
+        """
+        Handler for deleting user, return whether user existed
+        """
+        return self.__client.delete(f"{self.__prefix}{identity}") > 0
+
+    def keys(self):
+        """
+        Handler for getting all user identities
+        """
+        return [
+            self._handle_value(key)[len(self.__prefix) :]
+            for key in self.__client.scan_iter(match=f"{self.__prefix}*")
+        ]
+
+    def items(self):
+        """
+        Handler for getting all user identities with serialized user
+        """
+        result = []
+        for identity in self.keys():
+            data = self.get(identity)
+            if data is not None:
+                result.append((identity, data))
+        return result
+
+
+class SessionStore:
+    """
+    Dictionary like user store with an in-process LRU tier of deserialized users
+    backend -> sqlite or redis backend object is required
+    revision -> backend object storing the revision of deleted users is required
+    """
+
+    def __init__(self, backend, revision):
+        self.__backend = backend
+        self.__revision = revision
+        self.__local = TTLCache(LOCAL_SIZE, LOCAL_TTL)
+        self.__current_revision = None
+        self.__refresh_time = 0
+
+    def _handle_serialize(self, user):
+        """
+        Handler for converting user object to json string
+        """
+        expire_time = user.get_user_expire_time()
+        return json.dumps(
+            {
+                "identity": user.get_user_identity(),
+                "access_scope": user.get_user_access_scope(),
+                "expire_time": None if expire_time is None else expire_time.isoformat(),
+            }
+        )
+
+    def _handle_deserialize(self, data):
+        """
+        Handler for converting json string to user object
+        """
+        user = json.loads(data)
+        expire_time = user["expire_time"]
+        if expire_time is not None:
+            expire_time = datetime.fromisoformat(expire_time)
+        return User(user["identity"], user["access_scope"], expire_time)
+
+    def _handle_copy(self, user):
+        """
+        Handler for copying cached user, callers may change the access scope
+        """
+        return User(
+            user.get_user_identity(),
+            list(user.get_user_access_scope()),
+            user.get_user_expire_time(),
+        )
+
+    def _handle_refresh(self):
+        """
+        Handler for dropping the local tier once any worker has deleted a user
+        """
+        current_time = time.monotonic()
+        if current_time - self.__refresh_time < REVISION_INTERVAL:
+            return
+        revision = self.__revision.get(REVISION_KEY)
+        if revision != self.__current_revision:
+            self.__local.clear()
+            self.__current_revision = revision
+        self.__refresh_time = current_time
+
+    def _handle_user(self, identity):
+        """
+        Handler for getting user, backend is only reached when the local tier misses
+        """
+        self._handle_refresh()
+        user = self.__local.get(identity)
+        if user is None:
+            data = self.__backend.get(identity)
+            if data is None:
+                return None
+            user = self._handle_deserialize(data)
+            self.__local.set(identity, user)
+        return self._handle_copy(user)
+
+    def get(self, identity, default=None):
+        """
+        Handler for getting user with a single lookup
+        """
+        user = self._handle_user(identity)
+        if user is None:
+            return default
+        return user
+
+    def __getitem__(self, identity):
+        user = self._handle_user(identity)
+        if user is None:
+            raise KeyError(identity)
+        return user
+
+    def __setitem__(self, identity, user):
+        data = self._handle_serialize(user)
+        self.__backend.set(identity, data)
+        self.__local.set(identity, self._handle_copy(user))
+
+    def __delitem__(self, identity):
+        self.__local.delete(identity)
+        if not self.__backend.delete(identity):
+            raise KeyError(identity)
+        # Other workers drop their local tier on the next revision check
+        self.__current_revision = uuid.uuid4().hex
+        self.__revision.set(REVISION_KEY, self.__current_revision)
+
+    def __contains__(self, identity):
+        return self._handle_user(identity) is not None
+
+    def __iter__(self):
+        return iter(self.__backend.keys())
+
+    def __len__(self):
+        return len(self.__backend.keys())
+
+
+def create_session_backend(name):
+    """
+    Handler for creating session backend based on SESSION_STORE_URL
+    - redis://<host>:<port>/<db>
+    - sqlite:///<file path>
+    """
+    url = Config.SESSION_STORE_URL
+    if url and url.startswith(("redis://", "rediss://")):
+        # Optional dependency, only required when redis backend is used
+        import redis  # pylint: disable=import-outside-toplevel
+
+        return RedisBackend(redis.Redis.from_url(url), f"12labours:{name}:")
+    # Deployments on the same host are kept apart by their signing key
+    digest = hashlib.sha256((Config.QUERY_SECURE_KEY or "").encode("utf-8"))
+    path = os.path.join(
+        tempfile.gettempdir(), f"12labours_session_{digest.hexdigest()[:16]}.db"
+    )
+    if url and url.startswith("sqlite:///"):
+        path = url[len("sqlite:///") :]
+    return SQLiteBackend(path, name)
+
+
+def create_session_store():
+    """
+    Handler for creating authorized user session store
+    """
+    return SessionStore(
+        create_session_backend("users"), create_session_backend("users_revision")
+    )
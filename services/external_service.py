@@ -1,13 +1,25 @@
 """
 Functionality for using external service
 - get
+- update_service_status
 - check_service_status
 """
+import logging
+from concurrent.futures import ThreadPoolExecutor
 
+from app.config import Config
 from services.gen3.gen3_service import Gen3Service
 from services.gen3.sgqlc import SimpleGraphQLClient
 from services.irods.irods_service import iRODSService
 from services.orthanc.orthanc_service import OrthancService
+from services.service_breaker import HALF_OPEN, ServiceBreaker
+
+logging.basicConfig()
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+RECONNECT_BACKOFF_BASE = 1
+RECONNECT_BACKOFF_MAX = 60 * 5
 
 
 class ExternalService:
@@ -29,6 +41,12 @@ class ExternalService:
                 "status": False,
             },
         }
+        for service in self.__services.values():
+            service["breaker"] = ServiceBreaker(
+                Config.SERVICE_CHECK_INTERVAL,
+                RECONNECT_BACKOFF_BASE,
+                RECONNECT_BACKOFF_MAX,
+            )
 
     def get(self, service):
         """
@@ -36,18 +54,49 @@ class ExternalService:
         """
         return self.__services[service]["object"]
 
-    def check_service_status(self, startup=False):
+    def _handle_probe(self, name, service):
         """
-        Handler for checking external service status
+        Handler for probing one service, reconnect when its breaker is half-open
         """
-        connection = {}
-        for name, service in self.__services.items():
-            if not service["status"]:
+        try:
+            if service["breaker"].get_state() == HALF_OPEN:
                 service["object"].connection()
             else:
                 service["object"].status()
+            status = service["object"].get_status()
+        except Exception as error:
+            logger.error("Failed to check %s status %s.", name, error)
+            status = False
+        if status:
+            service["breaker"].record_success()
             service["connection"] = service["object"].get_connection()
-            service["status"] = service["object"].get_status()
+        else:
+            service["breaker"].record_failure()
+            service["connection"] = None
+        service["status"] = status
+
+    def update_service_status(self):
+        """
+        Handler for probing due services concurrently
+        Called by the background monitor instead of every request
+        """
+        due = [
+            (name, service)
+            for name, service in self.__services.items()
+            if service["breaker"].is_probe_due()
+        ]
+        if not due:
+            return
+        with ThreadPoolExecutor(max_workers=len(due)) as executor:
+            list(executor.map(lambda _: self._handle_probe(*_), due))
+
+    def check_service_status(self, startup=False):
+        """
+        Handler for checking external service status
+        Status is the one recorded by the last background probe
+        """
+        connection = {}
+        for name, service in self.__services.items():
             if startup:
                 connection[name] = service["status"]
             else:
@@ -1,19 +1,22 @@
 """
 Functionality for processing gen3 service
 - process_graphql_query
+- process_graphql_queries
 - process_program_project -> temp
+- close
 - get_status
 - status
 - get_connection
 - connection
 """
+import asyncio
 import logging
 import re
-import time
 
+import httpx
 from fastapi import HTTPException, status
-from gen3.auth import Gen3Auth, Gen3AuthError
-from gen3.submission import Gen3Submission
+from gen3.auth import Gen3Auth
+from gen3.submission import Gen3Submission, Gen3SubmissionQueryError
 
 from app.config import Gen3Config
 
@@ -21,6 +24,10 @@ logging.basicConfig()
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
 
+# Seconds waiting for gen3 connection and for each read/write of a graphql query
+CONNECT_TIMEOUT = 10
+REQUEST_TIMEOUT = 60
+
 
 class Gen3Service:
     """
@@ -30,25 +37,67 @@ class Gen3Service:
 
     def __init__(self, sgqlc):
         self.__sgqlc = sgqlc
+        self.__auth = None
+        self.__client = None
         self.__submission = None
+        self.__semaphore = None
         self.__status = False
-        self.__retry = 0
 
-    def process_graphql_query(self, item, key=None, queue=None):
+    async def _handle_graphql_request(self, query_code, variables):
+        """
+        Handler for posting graphql query code through the pooled http client
+        """
+        url = "/api/v0/submission/graphql"
+        payload = {"query": query_code, "variables": variables}
+        # Access token may be refreshed from fence, it must not block the event loop
+        token = await asyncio.to_thread(self.__auth.get_access_token)
+        headers = {"Authorization": f"bearer {token}"}
+        response = await self.__client.post(url, json=payload, headers=headers)
+        if response.status_code == status.HTTP_401_UNAUTHORIZED:
+            # Same behaviour as Gen3Auth, refresh the expired token and retry once
+            await asyncio.to_thread(self.__auth.refresh_access_token)
+            token = await asyncio.to_thread(self.__auth.get_access_token)
+            headers = {"Authorization": f"bearer {token}"}
+            response = await self.__client.post(url, json=payload, headers=headers)
+        data = response.json()
+        if "errors" in data:
+            raise Gen3SubmissionQueryError(data["errors"])
+        return data
+
+    def _handle_semaphore(self):
+        """
+        Handler for getting the semaphore shared by all graphql queries of the worker
+        """
+        if self.__semaphore is None:
+            # Created in the running event loop, python 3.9 binds it on creation
+            self.__semaphore = asyncio.Semaphore(Gen3Config.GEN3_MAX_CONCURRENCY)
+        return self.__semaphore
+
+    async def process_graphql_query(self, item):
         """
         Handler for fetching gen3 data with graphql query code
         """
         try:
-            query_code = self.__sgqlc.handle_graphql_query_code(item)
-            query_result = self.__submission.query(query_code)["data"][item.node]
-            if key is not None and queue is not None:
-                queue.put({key: query_result})
-            return query_result
+            query_code, variables = self.__sgqlc.handle_graphql_query_code(item)
+            async with self._handle_semaphore():
+                query_result = await self._handle_graphql_request(query_code, variables)
+            return query_result["data"][item.node]
         except Exception as error:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND, detail=str(error)
             ) from error
 
+    async def process_graphql_queries(self, items):
+        """
+        Handler for fetching multiple gen3 data concurrently
+        items -> list of (query item, result key) pairs
+        Every query waits for the worker wide GEN3_MAX_CONCURRENCY limit
+        """
+        query_result = await asyncio.gather(
+            *[self.process_graphql_query(query_item) for query_item, _ in items]
+        )
+        return {key: data for (_, key), data in zip(items, query_result)}
+
     def process_program_project(self, policies):
         """
         Handler for processing gen3 program/project name
@@ -76,6 +125,14 @@ class Gen3Service:
 
         return handle_name(project, "hyphen")
 
+    async def close(self):
+        """
+        Handler for closing the pooled http client
+        """
+        if self.__client is not None:
+            await self.__client.aclose()
+            self.__client = None
+
     def get_status(self):
         """
         Handler for getting gen3 submission status
@@ -89,19 +146,12 @@ class Gen3Service:
         try:
             self.__submission.get_programs()
             self.__status = True
-            self.__retry = 0
-        except Gen3AuthError as error:
+        except Exception as error:
+            # Reconnect is handled by the external service health monitor
             logger.warning("Gen3 disconnected.")
+            logger.error(error)
             self.__submission = None
             self.__status = False
-            if self.__retry == 12:
-                logger.error("Hit the max retry limit. Unable to reconnect.")
-                logger.error(error)
-            if self.__retry < 12:
-                self.__retry += 1
-                logger.warning("Reconnecting...%s...", self.__retry)
-                time.sleep(self.__retry)
-                self.connection()
 
     def get_connection(self):
         """
@@ -114,15 +164,24 @@ class Gen3Service:
         Handler for connecting gen3 submission service
         """
         try:
-            self.__submission = Gen3Submission(
-                Gen3Auth(
-                    endpoint=Gen3Config.GEN3_ENDPOINT_URL,
-                    refresh_token={
-                        "api_key": Gen3Config.GEN3_API_KEY,
-                        "key_id": Gen3Config.GEN3_KEY_ID,
-                    },
-                )
+            self.__auth = Gen3Auth(
+                endpoint=Gen3Config.GEN3_ENDPOINT_URL,
+                refresh_token={
+                    "api_key": Gen3Config.GEN3_API_KEY,
+                    "key_id": Gen3Config.GEN3_KEY_ID,
+                },
             )
+            self.__submission = Gen3Submission(self.__auth)
+            if self.__client is None:
+                # Keep-alive connections are shared by all graphql queries
+                self.__client = httpx.AsyncClient(
+                    base_url=Gen3Config.GEN3_ENDPOINT_URL,
+                    limits=httpx.Limits(
+                        max_connections=Gen3Config.GEN3_MAX_CONNECTIONS,
+                        max_keepalive_connections=Gen3Config.GEN3_MAX_CONNECTIONS,
+                    ),
+                    timeout=httpx.Timeout(REQUEST_TIMEOUT, connect=CONNECT_TIMEOUT),
+                )
             self.status()
         except Exception:
             logger.error("Failed to create the Gen3 submission.")
@@ -5,15 +5,47 @@ Functionality for generating query code and fetching data
 import re
 
 from sgqlc.operation import Operation
+from sgqlc.types import Variable
 
 from services.gen3.sgqlc_schema import Query
 
+# Supported nodes and their field name in the sgqlc query schema
+# FILTER
+# if the node name contains "_filter",
+# the query generator will be used for /filter/ and /graphql/pagination API
+# QUERY
+# if the node name contains "_query",
+# the query generator will only be used for /graphql/query API
+# PAGINATION
+# if the node name contains "_pagination",
+# the query generator will only be used for /graphql/pagination API
+NODES = {
+    "experiment_filter": "experimentFilter",
+    "dataset_description_filter": "datasetDescriptionFilter",
+    "manifest_filter": "manifestFilter",
+    "case_filter": "caseFilter",
+    "experiment_query": "experimentQuery",
+    "dataset_description_query": "datasetDescriptionQuery",
+    "manifest_query": "manifestQuery",
+    "case_query": "caseQuery",
+    "experiment_pagination": "experimentPagination",
+    "experiment_pagination_count": "experimentPaginationCount",
+    # SUPPORT FOR PAGINATION ORDER
+    "pagination_order_by_dataset_description": "paginationOrderByDatasetDescription",
+}
+
 
 class SimpleGraphQLClient:
     """
     Generate graphql query code functionality
     """
 
+    def __init__(self):
+        # Query code is compiled once per node, only variables are bound per request
+        self.__templates = {}
+        for node in NODES:
+            self.__templates[node] = self._handle_query_template(node)
+
     def _handle_suffix(self, node, snake_case):
         """
         Handler for removing node suffix
@@ -28,14 +60,12 @@ class SimpleGraphQLClient:
         elif "case" in node:
             node_type = "case"
         updated_query = re.sub(node, node_type, snake_case)
-        updated_node = re.sub(node, node_type, node)
-        return updated_query, updated_node
+        return updated_query, node_type
 
-    def _handle_classification(self, item, snake_case):
+    def _handle_classification(self, snake_case):
         """
         Handler for processing manifest classification
         """
-        access_scope = re.sub("'", '"', f"{item.access}")
         data = {
             # Choose the number of data to display, 0 here means display everything
             "manifests1": [
@@ -63,20 +93,12 @@ class SimpleGraphQLClient:
                 f"{value[0]}: manifests(first:0,"
                 + "offset:0,"
                 + f"{value[1]}: {value[2]},"
-                + f"project_id: {access_scope},"
+                + "project_id: $project_id,"
                 + 'order_by_asc:"submitter_id")',
                 snake_case,
             )
         return snake_case
 
-    def _handle_null_argument(self, snake_case):
-        """
-        Handler for removing null from snake case
-        """
-        if "null" in snake_case:
-            snake_case = re.sub("[,]? [_a-z]+: null", "", snake_case)
-        return snake_case
-
     def _handle_snake_case(self, query_code):
         """
         Handler for converting query code from camel case to snake case
@@ -88,150 +110,61 @@ class SimpleGraphQLClient:
         )
         return snake_case
 
-    def _handle_query_code_format(self, item, query_code):
+    def _handle_query_template(self, node):
         """
-        Handler for converting query code
+        Handler for compiling the parameterized query code of a node
         """
+        field = getattr(Query, NODES[node])
+        # Every field argument is declared as a graphql variable
+        query = Operation(
+            Query, variables={name: arg.type for name, arg in field.args.items()}
+        )
+        getattr(query, NODES[node])(**{name: Variable(name) for name in field.args})
         # Convert camel case to snake case
-        snake_case = self._handle_snake_case(query_code)
-        # Remove all null filter arguments, simplify the _handle_graphql_query_code function
-        snake_case = self._handle_null_argument(snake_case)
+        snake_case = self._handle_snake_case(query)
         # Either pagination or experiment node query
-        if "experiment" in item.node and "count" not in item.node:
-            snake_case = self._handle_classification(item, snake_case)
-        snake_case, item.node = self._handle_suffix(item.node, snake_case)
-        return "{" + snake_case + "}"
+        if "experiment" in node and "count" not in node:
+            snake_case = self._handle_classification(snake_case)
+        snake_case, node_type = self._handle_suffix(node, snake_case)
+        return {
+            "code": snake_case,
+            "node": node_type,
+            "arguments": list(field.args),
+        }
+
+    def _handle_query_variables(self, item, arguments):
+        """
+        Handler for binding query item values to query code variables
+        """
+        values = {
+            "first": 0,
+            "offset": 0,
+            "submitter_id": item.filter.get("submitter_id", None),
+            "additional_types": item.filter.get("additional_types", None),
+            "species": item.filter.get("species", None),
+            "sex": item.filter.get("sex", None),
+            "age_category": item.filter.get("age_category", None),
+            "quick_search": item.search,
+            "project_id": item.access,
+            "order_by_asc": item.asc,
+            "order_by_desc": item.desc,
+        }
+        if "pagination" in item.node and "count" not in item.node:
+            values["first"] = item.limit
+            values["offset"] = (item.page - 1) * item.limit
+        # Null variables are not sent, so the filter argument will not be applied
+        return {
+            argument: values[argument]
+            for argument in arguments
+            if values[argument] is not None
+        }
 
     # generated query will fetch all the fields that Gen3 metadata has
     def handle_graphql_query_code(self, item):
         """
-        Handler for creating graphql query code
+        Handler for creating graphql query code and variables
         """
-        query = Operation(Query)
-        # FILTER
-        # if the node name contains "_filter",
-        # the query generator will be used for /filter/ and /graphql/pagination API
-        if item.node == "experiment_filter":
-            graphql_query_code = self._handle_query_code_format(
-                item,
-                query.experimentFilter(
-                    first=0,
-                    offset=0,
-                    submitter_id=item.filter.get("submitter_id", None),
-                    project_id=item.access,
-                ),
-            )
-        elif item.node == "dataset_description_filter":
-            graphql_query_code = self._handle_query_code_format(
-                item,
-                query.datasetDescriptionFilter(
-                    first=0,
-                    offset=0,
-                    # study_organ_system=item.filter.get("study_organ_system", None),
-                    project_id=item.access,
-                ),
-            )
-        elif item.node == "manifest_filter":
-            graphql_query_code = self._handle_query_code_format(
-                item,
-                query.manifestFilter(
-                    first=0,
-                    offset=0,
-                    additional_types=item.filter.get("additional_types", None),
-                    project_id=item.access,
-                ),
-            )
-        elif item.node == "case_filter":
-            graphql_query_code = self._handle_query_code_format(
-                item,
-                query.caseFilter(
-                    first=0,
-                    offset=0,
-                    species=item.filter.get("species", None),
-                    sex=item.filter.get("sex", None),
-                    age_category=item.filter.get("age_category", None),
-                    project_id=item.access,
-                ),
-            )
-        # QUERY
-        # if the node name contains "_query",
-        # the query generator will only be used for /graphql/query API
-        elif item.node == "experiment_query":
-            graphql_query_code = self._handle_query_code_format(
-                item,
-                query.experimentQuery(
-                    first=0,
-                    offset=0,
-                    submitter_id=item.filter.get("submitter_id", None),
-                    project_id=item.access,
-                ),
-            )
-        elif item.node == "dataset_description_query":
-            graphql_query_code = self._handle_query_code_format(
-                item,
-                query.datasetDescriptionQuery(
-                    first=0,
-                    offset=0,
-                    quick_search=item.search,
-                    project_id=item.access,
-                ),
-            )
-        elif item.node == "manifest_query":
-            graphql_query_code = self._handle_query_code_format(
-                item,
-                query.manifestQuery(
-                    first=0,
-                    offset=0,
-                    quick_search=item.search,
-                    project_id=item.access,
-                ),
-            )
-        elif item.node == "case_query":
-            graphql_query_code = self._handle_query_code_format(
-                item,
-                query.caseQuery(
-                    first=0,
-                    offset=0,
-                    quick_search=item.search,
-                    project_id=item.access,
-                ),
-            )
-        # PAGINATION
-        # if the node name contains "_pagination",
-        # the query generator will only be used for /graphql/pagination API
-        elif item.node == "experiment_pagination":
-            graphql_query_code = self._handle_query_code_format(
-                item,
-                query.experimentPagination(
-                    first=item.limit,
-                    offset=(item.page - 1) * item.limit,
-                    submitter_id=item.filter.get("submitter_id", None),
-                    project_id=item.access,
-                    order_by_asc=item.asc,
-                    order_by_desc=item.desc,
-                ),
-            )
-        elif item.node == "experiment_pagination_count":
-            graphql_query_code = self._handle_query_code_format(
-                item,
-                query.experimentPaginationCount(
-                    first=0,
-                    offset=0,
-                    submitter_id=item.filter.get("submitter_id", None),
-                    project_id=item.access,
-                ),
-            )
-        # SUPPORT FOR PAGINATION ORDER
-        elif item.node == "pagination_order_by_dataset_description":
-            graphql_query_code = self._handle_query_code_format(
-                item,
-                query.paginationOrderByDatasetDescription(
-                    first=item.limit,
-                    offset=(item.page - 1) * item.limit,
-                    submitter_id=item.filter.get("submitter_id", None),
-                    project_id=item.access,
-                    order_by_asc=item.asc,
-                    order_by_desc=item.desc,
-                ),
-            )
-        return graphql_query_code
+        template = self.__templates[item.node]
+        variables = self._handle_query_variables(item, template["arguments"])
+        item.node = template["node"]
+        return template["code"], variables
@@ -209,6 +209,7 @@ class ExperimentPaginationCount(Node):
     Fields for experiment pagination count
     """
 
+    project_id = String
     submitter_id = String
 
 
@@ -0,0 +1,271 @@
+"""
+Functionality for sharing a bounded number of irods sessions
+- fill
+- acquire
+- release
+- session
+- evict_idle_session
+- get_metrics
+- close
+"""
+import contextlib
+import logging
+import threading
+import time
+from collections import deque
+
+from irods.exception import NetworkException
+
+logging.basicConfig()
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+# Session used within this time is trusted without a validation round trip
+VALIDATION_BYPASS_SECONDS = 0.5
+
+
+class iRODSSessionPool:
+    """
+    factory -> function creating a new irods session is required
+    validator -> function checking a session is still usable is required
+    min_size -> sessions kept open even when idle
+    max_size -> maximum sessions checked out at the same time
+    idle_timeout -> seconds an idle session above min_size is kept
+    checkout_timeout -> seconds waiting for a free session
+    """
+
+    def __init__(
+        self,
+        factory,
+        validator,
+        min_size,
+        max_size,
+        idle_timeout,
+        checkout_timeout,
+    ):
+        self.__factory = factory
+        self.__validator = validator
+        self.__min_size = min(min_size, max_size)
+        self.__max_size = max_size
+        self.__idle_timeout = idle_timeout
+        self.__checkout_timeout = checkout_timeout
+        self.__condition = threading.Condition()
+        # Most recently released session is on the right
+        self.__idle = deque()
+        self.__size = 0
+        self.__closed = False
+        self.__metrics = {
+            "created": 0,
+            "closed": 0,
+            "checkout": 0,
+            "timeout": 0,
+            "invalid": 0,
+            "waiting": 0,
+            "wait_seconds": 0.0,
+        }
+
+    def _handle_close(self, session):
+        """
+        Handler for closing session outside the pool lock
+        """
+        try:
+            session.cleanup()
+        except Exception as error:
+            logger.error("Failed to close the iRODS session %s.", error)
+
+    def _handle_create(self):
+        """
+        Handler for creating session for a reserved pool slot
+        """
+        try:
+            session = self.__factory()
+        except BaseException:
+            with self.__condition:
+                self.__size -= 1
+                self.__condition.notify()
+            raise
+        with self.__condition:
+            self.__metrics["created"] += 1
+        return session
+
+    def _handle_discard(self, session):
+        """
+        Handler for removing broken or evicted session from the pool
+        """
+        with self.__condition:
+            self.__size -= 1
+            self.__metrics["closed"] += 1
+            self.__condition.notify()
+        self._handle_close(session)
+
+    def _handle_expired(self, now):
+        """
+        Handler for taking idle sessions which exceed idle timeout out of the pool
+        Must be called with the pool lock
+        """
+        expired = []
+        while (
+            self.__idle
+            and self.__size - len(expired) > self.__min_size
+            and now - self.__idle[0][1] > self.__idle_timeout
+        ):
+            expired.append(self.__idle.popleft()[0])
+        self.__size -= len(expired)
+        self.__metrics["closed"] += len(expired)
+        return expired
+
+    def fill(self):
+        """
+        Handler for opening validated sessions until min_size is reached
+        """
+        while True:
+            with self.__condition:
+                if self.__closed or self.__size >= self.__min_size:
+                    return
+                self.__size += 1
+            session = self._handle_create()
+            try:
+                self.__validator(session)
+            except BaseException:
+                self._handle_discard(session)
+                raise
+            self.release(session)
+
+    def _handle_checkout(self, deadline):
+        """
+        Handler for taking an idle session or reserving a slot for a new one
+        Idle session is returned with its last used time, new slot returns None
+        """
+        with self.__condition:
+            waiting = False
+            start = time.monotonic()
+            try:
+                while True:
+                    if self.__closed:
+                        raise RuntimeError("iRODS session pool has been closed")
+                    if self.__idle:
+                        # Most recently used session is least likely to be dropped
+                        return self.__idle.pop()
+                    if self.__size < self.__max_size:
+                        self.__size += 1
+                        return None
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self.__metrics["timeout"] += 1
+                        raise TimeoutError("No iRODS session is available")
+                    if not waiting:
+                        waiting = True
+                        self.__metrics["waiting"] += 1
+                    self.__condition.wait(remaining)
+            finally:
+                if waiting:
+                    self.__metrics["waiting"] -= 1
+                self.__metrics["wait_seconds"] += time.monotonic() - start
+
+    def acquire(self, timeout=None):
+        """
+        Handler for checking out a validated session
+        TimeoutError is raised when every session is in use for longer than timeout
+        """
+        if timeout is None:
+            timeout = self.__checkout_timeout
+        deadline = time.monotonic() + timeout
+        while True:
+            checkout = self._handle_checkout(deadline)
+            if checkout is None:
+                session, last_used = self._handle_create(), None
+            else:
+                session, last_used = checkout
+                if time.monotonic() - last_used < VALIDATION_BYPASS_SECONDS:
+                    break
+            try:
+                self.__validator(session)
+                break
+            except Exception as error:
+                logger.warning("Invalid iRODS session has been discarded %s.", error)
+                with self.__condition:
+                    self.__metrics["invalid"] += 1
+                self._handle_discard(session)
+                # New session is not usable, irods service is not reachable
+                if last_used is None:
+                    raise
+        with self.__condition:
+            self.__metrics["checkout"] += 1
+        return session
+
+    def release(self, session, discard=False):
+        """
+        Handler for returning a checked out session
+        Broken session should be discarded instead of being reused
+        """
+        if discard:
+            self._handle_discard(session)
+            return
+        with self.__condition:
+            if self.__closed:
+                expired = [session]
+                self.__size -= 1
+                self.__metrics["closed"] += 1
+            else:
+                now = time.monotonic()
+                self.__idle.append((session, now))
+                expired = self._handle_expired(now)
+            self.__condition.notify()
+        for _ in expired:
+            self._handle_close(_)
+
+    @contextlib.contextmanager
+    def session(self, timeout=None):
+        """
+        Handler for using a session within with statement
+        Session is discarded when network error happens
+        """
+        session = self.acquire(timeout)
+        discard = False
+        try:
+            yield session
+        except (NetworkException, OSError):
+            discard = True
+            raise
+        finally:
+            self.release(session, discard)
+
+    def evict_idle_session(self):
+        """
+        Handler for closing idle sessions which exceed idle timeout
+        """
+        with self.__condition:
+            expired = self._handle_expired(time.monotonic())
+        for _ in expired:
+            self._handle_close(_)
+        return len(expired)
+
+    def get_metrics(self):
+        """
+        Handler for getting pool usage metrics
+        """
+        with self.__condition:
+            metrics = dict(self.__metrics)
+            metrics.update(
+                {
+                    "size": self.__size,
+                    "idle": len(self.__idle),
+                    "in_use": self.__size - len(self.__idle),
+                    "max_size": self.__max_size,
+                }
+            )
+        return metrics
+
+    def close(self):
+        """
+        Handler for closing idle sessions, checked out ones are closed when released
+        """
+        with self.__condition:
+            self.__closed = True
+            expired = [_[0] for _ in self.__idle]
+            self.__idle.clear()
+            self.__size -= len(expired)
+            self.__metrics["closed"] += len(expired)
+            self.__condition.notify_all()
+        for _ in expired:
+            self._handle_close(_)
@@ -1,14 +1,20 @@
 """
 Functionality for processing irods service
 - process_keyword_search
+- process_keyword_searches
+- process_search_metadata
 - process_gen3_user_yaml -> temp
+- get_metrics
+- evict_idle_session
 - get_status
 - status
 - get_connection
 - connection
+- close
 """
 import json
 import logging
+from concurrent.futures import ThreadPoolExecutor
 
 import yaml
 from fastapi import HTTPException, status
@@ -18,11 +24,15 @@ from irods.session import iRODSSession
 from yaml import SafeLoader
 
 from app.config import iRODSConfig
+from services.irods.irods_pool import iRODSSessionPool
 
 logging.basicConfig()
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
 
+# Maximum keywords searched at the same time, each uses a pooled irods connection
+MAX_SEARCH_WORKERS = 8
+
 
 class iRODSService:
     """
@@ -30,7 +40,7 @@ class iRODSService:
     """
 
     def __init__(self):
-        self.__session = None
+        self.__pool = None
         self.__status = False
 
     def process_keyword_search(self, searchfield, keyword):
@@ -38,17 +48,21 @@ class iRODSService:
         Handler for searching keywords in irods
         """
         try:
-            result = (
-                self.__session.query(Collection.name, DataObjectMeta.value)
-                .filter(In(DataObjectMeta.name, searchfield))
-                .filter(Like(DataObjectMeta.value, f"%{keyword}%"))
-            )
+            # Query is only executed once, the rows are reused by the caller
+            with self.__pool.session() as session:
+                query = (
+                    session.query(Collection.name, DataObjectMeta.value)
+                    .filter(In(DataObjectMeta.name, searchfield))
+                    .filter(Like(DataObjectMeta.value, f"%{keyword}%"))
+                )
+                # Iterating walks every batch, all() only returns the first one
+                result = list(query)
         except Exception as error:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(error)
             ) from error
         # Any keyword that does not match with the database content will cause search no result
-        if len(result.all()) == 0:
+        if len(result) == 0:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="There is no matched content in the database",
@@ -56,6 +70,38 @@ class iRODSService:
 
         return result
 
+    def process_keyword_searches(self, searchfield, keyword_list):
+        """
+        Handler for searching multiple keywords in irods concurrently
+        """
+        keywords = list(dict.fromkeys(keyword_list))
+        if not keywords:
+            return {}
+        with ThreadPoolExecutor(
+            max_workers=min(len(keywords), MAX_SEARCH_WORKERS)
+        ) as executor:
+            search_result = executor.map(
+                lambda keyword: self.process_keyword_search(searchfield, keyword),
+                keywords,
+            )
+            return dict(zip(keywords, search_result))
+
+    def process_search_metadata(self, searchfield):
+        """
+        Handler for getting all searchable metadata in irods
+        """
+        try:
+            with self.__pool.session() as session:
+                result = session.query(
+                    Collection.name, DataObjectMeta.name, DataObjectMeta.value
+                ).filter(In(DataObjectMeta.name, searchfield))
+                # Iterating walks every batch, all() only returns the first one
+                return list(result)
+        except Exception as error:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(error)
+            ) from error
+
     def process_gen3_user_yaml(self):
         """
         Handler for getting gen3 use yaml file
@@ -63,12 +109,13 @@ class iRODSService:
         """
         try:
             yaml_string = ""
-            user_obj = self.__session.data_objects.get(
-                f"{iRODSConfig.IRODS_ROOT_PATH}/user.yaml"
-            )
-            with user_obj.open("r") as file:
-                for line in file:
-                    yaml_string += str(line, encoding="utf-8")
+            with self.__pool.session() as session:
+                user_obj = session.data_objects.get(
+                    f"{iRODSConfig.IRODS_ROOT_PATH}/user.yaml"
+                )
+                with user_obj.open("r") as file:
+                    for line in file:
+                        yaml_string += str(line, encoding="utf-8")
         except Exception as error:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -78,6 +125,22 @@ class iRODSService:
         user_yaml = yaml.load(yaml_string, Loader=SafeLoader)
         return json.loads(json.dumps(user_yaml))["users"]
 
+    def get_metrics(self):
+        """
+        Handler for getting irods session pool metrics
+        """
+        if self.__pool is None:
+            return {}
+        return self.__pool.get_metrics()
+
+    def evict_idle_session(self):
+        """
+        Handler for closing idle sessions which exceed idle timeout
+        """
+        if self.__pool is None:
+            return 0
+        return self.__pool.evict_idle_session()
+
     def get_status(self):
         """
         Handler for getting irods session status
@@ -89,35 +152,84 @@ class iRODSService:
         Handler for checking irods session status
         """
         try:
-            self.__session.collections.get(iRODSConfig.IRODS_ROOT_PATH)
+            try:
+                # Recently used session is not validated again
+                with self.__pool.session(timeout=0):
+                    pass
+            except TimeoutError:
+                # Every pooled session is in use, server is checked with a new session
+                self._handle_probe()
             self.__status = True
         except Exception as error:
             logging.warning("iRODS disconnected.")
             logger.error(error)
-            self.__session = None
+            self.close()
             self.__status = False
 
     def get_connection(self):
         """
-        Handler for getting irods session service
+        Handler for getting irods session pool
         """
-        return self.__session
+        return self.__pool
+
+    def _handle_session(self):
+        """
+        Handler for creating irods session
+        """
+        # It requires "host", "port", "user", "password" and "zone" environment variables.
+        session = iRODSSession(
+            host=iRODSConfig.IRODS_HOST,
+            port=iRODSConfig.IRODS_PORT,
+            user=iRODSConfig.IRODS_USER,
+            password=iRODSConfig.IRODS_PASSWORD,
+            zone=iRODSConfig.IRODS_ZONE,
+        )
+        session.connection_timeout = iRODSConfig.IRODS_CONNECTION_TIMEOUT
+        return session
+
+    def _handle_validation(self, session):
+        """
+        Handler for checking irods session is still usable
+        """
+        session.collections.get(iRODSConfig.IRODS_ROOT_PATH)
+
+    def _handle_probe(self):
+        """
+        Handler for checking irods server with a session outside the pool
+        """
+        session = self._handle_session()
+        try:
+            self._handle_validation(session)
+        finally:
+            session.cleanup()
 
     def connection(self):
         """
-        Handler for connecting irods session service
+        Handler for connecting irods session pool
         """
+        # Sessions of the previous pool are closed before new ones are opened
+        self.close()
         try:
             # This function is used to connect to the iRODS server
-            # It requires "host", "port", "user", "password" and "zone" environment variables.
-            self.__session = iRODSSession(
-                host=iRODSConfig.IRODS_HOST,
-                port=iRODSConfig.IRODS_PORT,
-                user=iRODSConfig.IRODS_USER,
-                password=iRODSConfig.IRODS_PASSWORD,
-                zone=iRODSConfig.IRODS_ZONE,
+            self.__pool = iRODSSessionPool(
+                self._handle_session,
+                self._handle_validation,
+                iRODSConfig.IRODS_POOL_MIN_SIZE,
+                iRODSConfig.IRODS_POOL_MAX_SIZE,
+                iRODSConfig.IRODS_POOL_IDLE_TIMEOUT,
+                iRODSConfig.IRODS_POOL_CHECKOUT_TIMEOUT,
             )
-            # self.__session.connection_timeout =
+            self.__pool.fill()
             self.status()
         except Exception:
             logger.error("Failed to create the iRODS session.")
+            # Sessions opened before fill failed should not be left open
+            self.close()
+
+    def close(self):
+        """
+        Handler for closing irods session pool
+        """
+        if self.__pool is not None:
+            self.__pool.close()
+            self.__pool = None
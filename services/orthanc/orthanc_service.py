@@ -36,7 +36,8 @@ class OrthancService:
         Handler for checking orthanc client status
         """
         try:
-            self.__orthanc.get_patients()
+            # System information is small, patient list grows with the data
+            self.__orthanc.get_system()
             self.__status = True
         except Exception as error:
             logger.warning("Orthanc disconnected.")
@@ -0,0 +1,68 @@
+"""
+Functionality for tracking external service health with circuit breaker state
+- is_probe_due
+- record_success
+- record_failure
+- get_state
+"""
+import time
+
+# Healthy service, requests are allowed and probed on interval
+CLOSED = "closed"
+# Failed service, requests fail fast until reconnect backoff has passed
+OPEN = "open"
+# Backoff has passed, next probe will reconnect the service
+HALF_OPEN = "half-open"
+
+
+class ServiceBreaker:
+    """
+    interval -> seconds between probes of healthy service is required
+    backoff_base -> seconds before the first reconnect is required
+    backoff_max -> maximum seconds between reconnects is required
+    """
+
+    def __init__(self, interval, backoff_base, backoff_max, clock=time.monotonic):
+        self.__interval = interval
+        self.__backoff_base = backoff_base
+        self.__backoff_max = backoff_max
+        self.__clock = clock
+        # Service has not been connected yet, first probe will connect it
+        self.__state = OPEN
+        self.__failure = 0
+        self.__next_probe = 0
+
+    def is_probe_due(self):
+        """
+        Handler for checking whether service should be probed now
+        Open breaker becomes half-open once its backoff has passed
+        """
+        if self.__clock() < self.__next_probe:
+            return False
+        if self.__state == OPEN:
+            self.__state = HALF_OPEN
+        return True
+
+    def record_success(self):
+        """
+        Handler for closing breaker after a successful probe
+        """
+        self.__state = CLOSED
+        self.__failure = 0
+        self.__next_probe = self.__clock() + self.__interval
+
+    def record_failure(self):
+        """
+        Handler for opening breaker after a failed probe
+        Reconnect delay doubles with every failure in a row
+        """
+        self.__state = OPEN
+        self.__failure += 1
+        backoff = self.__backoff_base * 2 ** (self.__failure - 1)
+        self.__next_probe = self.__clock() + min(backoff, self.__backoff_max)
+
+    def get_state(self):
+        """
+        Handler for getting breaker state
+        """
+        return self.__state
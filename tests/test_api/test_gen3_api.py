@@ -1,3 +1,4 @@
+import orjson
 import pytest
 from fastapi.testclient import TestClient
 
@@ -224,6 +225,33 @@ def test_get_gen3_graphql_pagination(client, token):
     assert result["detail"] == f"{wrong_order['order']} order option not provided"
 
 
+def test_get_gen3_graphql_pagination_stream(client, token):
+    filter_pass_case = {
+        "filter": {
+            "dataset_description_filter>study_organ_system": ["Stomach", "Vagus nerve"],
+            "case_filter>species": ["Rat"],
+        }
+    }
+    # Page after the last dataset has no items
+    empty_pass_case = {"page": 1000}
+    for pass_case in [filter_pass_case, empty_pass_case]:
+        # Streamed before and after the page is cached
+        results = []
+        for stream in ["true", "false", "true"]:
+            response = client.post(
+                f"/graphql/pagination?stream={stream}",
+                json=pass_case,
+                headers={"Authorization": f"Bearer {token['access_token']}"},
+            )
+            assert response.status_code == 200
+            chunks = list(response.iter_content(chunk_size=None))
+            results.append(orjson.loads(b"".join(chunks)))
+        assert results[0] == results[1] == results[2]
+        if pass_case is empty_pass_case:
+            assert results[0]["items"] == []
+            assert results[0]["total"] > 0
+
+
 def test_get_gen3_filter(client, token):
     response = client.get(
         "/filter?sidebar=true",
@@ -0,0 +1,114 @@
+import io
+import os
+import random
+import string
+import time
+
+import pytest
+
+from app.data_schema import GraphQLPaginationItem, GraphQLQueryItem
+from app.function.search.search_suggestion import SearchSuggestion
+from services.gen3.sgqlc import NODES, SimpleGraphQLClient
+
+# Timing assertions depend on the machine, only run them when asked
+benchmark = pytest.mark.skipif(
+    os.environ.get("RUN_BENCHMARK", "").lower() != "true",
+    reason="set RUN_BENCHMARK=true to run benchmarks",
+)
+
+
+@pytest.fixture
+def sgqlc_class():
+    return SimpleGraphQLClient()
+
+
+@pytest.fixture
+def dummy_query_items():
+    items = {}
+    for node in NODES:
+        if "pagination" in node:
+            items[node] = GraphQLPaginationItem(
+                node=node,
+                filter={"submitter_id": [f"dummy dataset {i}" for i in range(50)]},
+                access=["dummy public", "dummy private"],
+                asc="created_datetime",
+            )
+        else:
+            items[node] = GraphQLQueryItem(
+                node=node,
+                filter={
+                    "submitter_id": ["dummy dataset"],
+                    "species": ["dummy species"],
+                },
+                search="dummy search",
+                access=["dummy public", "dummy private"],
+            )
+    return items
+
+
+@pytest.fixture
+def ss_class():
+    generator = random.Random(12)
+    words = [
+        "".join(generator.choices(string.ascii_lowercase, k=generator.randint(4, 10)))
+        for _ in range(5000)
+    ]
+    data = [
+        {
+            "submitter_id": f"dataset-{i}-version-1-dataset_description",
+            "title": " ".join(generator.sample(words, 8)),
+            "keywords": generator.sample(words, 4),
+            "contributor_name": generator.sample(words, 2),
+        }
+        for i in range(2000)
+    ]
+    ss = SearchSuggestion()
+    ss.update_search_suggestion(data)
+    return ss
+
+
+class StandInFile(io.RawIOBase):
+    """
+    Stand-in irods file, every connection has its own latency and bandwidth
+    """
+
+    def __init__(self, content, latency, bandwidth):
+        self.__content = content
+        self.__latency = latency
+        self.__bandwidth = bandwidth
+        self.__position = 0
+
+    def seekable(self):
+        return True
+
+    def seek(self, offset, whence=0):
+        self.__position = offset
+        return offset
+
+    def read(self, size=-1):
+        chunk = self.__content[self.__position : self.__position + size]
+        self.__position += len(chunk)
+        time.sleep(self.__latency + len(chunk) / self.__bandwidth)
+        return chunk
+
+
+class StandInDataObject:
+    """
+    Stand-in irods data object, open creates a new connection
+    """
+
+    def __init__(self, size, latency, bandwidth):
+        self.name = "dummy_filename.nrrd"
+        self.size = size
+        self.content = random.Random(12).randbytes(size)
+        self.__latency = latency
+        self.__bandwidth = bandwidth
+
+    def open(self, mode):
+        return StandInFile(self.content, self.__latency, self.__bandwidth)
+
+
+@pytest.fixture
+def standin_data_object():
+    # 32 MiB object, 2 ms request latency and 256 MiB/s for each connection
+    return StandInDataObject(32 * 1024 * 1024, 0.002, 256 * 1024 * 1024)
@@ -0,0 +1,33 @@
+import time
+
+import pytest
+
+from app.config import iRODSConfig
+from app.function.download.download_budget import DownloadBudget
+from app.function.download.download_stream import DownloadStream
+from tests.test_benchmark.fixture import benchmark, standin_data_object
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@benchmark
+@pytest.mark.anyio
+async def test_generate_stream_throughput(monkeypatch, standin_data_object):
+    monkeypatch.setattr(iRODSConfig, "IRODS_MAX_CHUNK_SIZE", 1024 * 1024)
+    monkeypatch.setattr(iRODSConfig, "IRODS_PARALLEL_SIZE", 0)
+    ranges = [(0, standin_data_object.size - 1)]
+    throughput = {}
+    for streams in [1, 2, 4, 8]:
+        monkeypatch.setattr(iRODSConfig, "IRODS_PARALLEL_STREAMS", streams)
+        ds = DownloadStream(DownloadBudget(64 * 1024 * 1024))
+        start = time.perf_counter()
+        data = [_ async for _ in ds.generate_stream(standin_data_object, ranges)]
+        cost = time.perf_counter() - start
+        assert b"".join(data) == standin_data_object.content
+        throughput[streams] = standin_data_object.size / cost / 1024 / 1024
+        print(f"\n{streams} stream(s): {throughput[streams]:.0f} MiB/s")
+    assert throughput[2] > throughput[1] * 1.3
+    assert throughput[4] > throughput[1] * 2
@@ -0,0 +1,59 @@
+import time
+
+import pytest
+
+from app.function.filter.filter_index import FilterIndex
+from tests.test_benchmark.fixture import benchmark
+
+
+def _generate_nested_list(size):
+    datasets = [f"dataset-{i}-version-1" for i in range(size)]
+    # Three filter categories with different selectivity
+    return [datasets[::2], datasets[::3], datasets[size // 4 :]]
+
+
+def _implement_set_relation(relation, nested_list):
+    # Baseline set implementation used before the filter index
+    if relation == "and":
+        return sorted(set(nested_list[0]).intersection(*nested_list))
+    return sorted(set().union(*nested_list))
+
+
+def _measure(function, number=5):
+    cost = []
+    for _ in range(number):
+        start = time.perf_counter()
+        result = function()
+        cost.append(time.perf_counter() - start)
+    return result, min(cost)
+
+
+@benchmark
+@pytest.mark.parametrize("size", [10000, 100000])
+@pytest.mark.parametrize("relation", ["and", "or"])
+def test_implement_filter_relation_cost(size, relation):
+    nested_list = _generate_nested_list(size)
+    fi = FilterIndex()
+    # Facet bitmaps are built once when the filter is generated
+    for index, datasets in enumerate(nested_list):
+        fi.update_filter_index(
+            f"node_{index}", [{"submitter_id": _, "field": "dummy"} for _ in datasets]
+        )
+
+    def implement_index_relation():
+        bitmaps = [
+            fi.search_filtered_bitmap(f"node_{index}", "field", ["dummy"])
+            for index in range(len(nested_list))
+        ]
+        return fi.implement_filter_relation(relation, bitmaps)
+
+    expected, baseline = _measure(
+        lambda: _implement_set_relation(relation, nested_list)
+    )
+    result, cost = _measure(implement_index_relation)
+    print(
+        f"\n{relation} {size} datasets: {cost * 1e3:.1f} ms "
+        + f"(set baseline {baseline * 1e3:.1f} ms)"
+    )
+    assert result == expected
+    assert cost < baseline
@@ -0,0 +1,34 @@
+import copy
+import time
+
+import pytest
+
+from tests.test_function.test_pagination.fixture import (
+    dummy_filter_cache,
+    dummy_pagination_data,
+    pf_class,
+)
+
+MANIFEST_CATEGORIES = [
+    "plots",
+    "scaffoldViews",
+    "scaffolds",
+    "thumbnails",
+    "mris",
+    "dicomImages",
+]
+
+
+@pytest.mark.parametrize("scale", [100, 1000])
+def test_reconstruct_data_structure_cost(pf_class, dummy_pagination_data, scale):
+    expected = pf_class.reconstruct_data_structure(dummy_pagination_data)[0]
+    dataset = copy.deepcopy(dummy_pagination_data[0])
+    for category in MANIFEST_CATEGORIES:
+        dataset[category] = dataset[category] * scale
+    file_number = sum(len(dataset[category]) for category in MANIFEST_CATEGORIES)
+    start = time.perf_counter()
+    result = pf_class.reconstruct_data_structure([dataset])[0]
+    cost = time.perf_counter() - start
+    print(f"\n{file_number} files: {cost * 1e3:.1f} ms")
+    for category in MANIFEST_CATEGORIES:
+        assert result[category] == expected[category] * scale
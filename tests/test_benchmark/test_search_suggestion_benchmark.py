@@ -0,0 +1,25 @@
+import time
+
+import pytest
+
+from tests.test_benchmark.fixture import benchmark, ss_class
+
+
+@benchmark
+@pytest.mark.parametrize("input_", ["he", "hea", "heart", "scafold"])
+def test_generate_suggestion_cost(ss_class, input_):
+    # First lookup of a prefix walks the trie
+    start = time.perf_counter()
+    ss_class.generate_suggestion(input_, 10)
+    first_cost = time.perf_counter() - start
+    number = 100
+    start = time.perf_counter()
+    for _ in range(number):
+        ss_class.generate_suggestion(input_, 10)
+    cost = (time.perf_counter() - start) / number
+    print(
+        f"\n{input_}: {cost * 1e3:.3f} ms/lookup "
+        + f"(first lookup {first_cost * 1e3:.3f} ms)"
+    )
+    assert first_cost < 0.01
+    assert cost < 0.001
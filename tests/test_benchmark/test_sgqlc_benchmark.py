@@ -0,0 +1,31 @@
+import time
+
+from services.gen3.sgqlc import NODES, SimpleGraphQLClient
+from tests.test_benchmark.fixture import benchmark, dummy_query_items, sgqlc_class
+
+ROUNDS = 1000
+
+
+@benchmark
+def test_query_template_compile_cost():
+    start = time.perf_counter()
+    SimpleGraphQLClient()
+    cost = (time.perf_counter() - start) / len(NODES)
+    print(f"\ncompile: {cost * 1e6:.1f} us/node")
+
+
+@benchmark
+def test_query_code_generation_cost(sgqlc_class, dummy_query_items):
+    print()
+    for node, item in dummy_query_items.items():
+        start = time.perf_counter()
+        for _ in range(ROUNDS):
+            # Generating query code will update item.node to the gen3 node name
+            item.node = node
+            query_code, variables = sgqlc_class.handle_graphql_query_code(item)
+        cost = (time.perf_counter() - start) / ROUNDS
+        print(f"{node}: {cost * 1e6:.1f} us/query")
+        assert "$project_id" in query_code
+        assert variables["project_id"] == ["dummy public", "dummy private"]
+        # Query code generation should stay off the request hot path
+        assert cost < 1e-3
@@ -0,0 +1,63 @@
+import io
+from datetime import datetime
+from unittest.mock import MagicMock
+
+import pytest
+
+from app.config import iRODSConfig
+from app.function.download.download_budget import DownloadBudget
+from app.function.download.download_range import DownloadRange
+from app.function.download.download_stream import DownloadStream
+
+
+@pytest.fixture
+def dr_class():
+    return DownloadRange()
+
+
+@pytest.fixture
+def dummy_file_content():
+    return b"0123456789abcdefghijklmnopqrstuvwxyz"
+
+
+@pytest.fixture
+def dummy_file(dummy_file_content):
+    file = MagicMock()
+    file.name = "dummy_filename.nrrd"
+    file.size = len(dummy_file_content)
+    file.checksum = "sha2:dummychecksum="
+    file.modify_time = datetime(2023, 10, 23, 1, 2, 3)
+    file.open.side_effect = lambda mode: io.BytesIO(dummy_file_content)
+    return file
+
+
+@pytest.fixture
+def dummy_file_header(dr_class, dummy_file):
+    return dr_class.generate_file_header(dummy_file)
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture
+def db_class():
+    return DownloadBudget(16)
+
+
+@pytest.fixture
+def ds_class(monkeypatch):
+    monkeypatch.setattr(iRODSConfig, "IRODS_MIN_CHUNK_SIZE", 4)
+    monkeypatch.setattr(iRODSConfig, "IRODS_MAX_CHUNK_SIZE", 16)
+    return DownloadStream(DownloadBudget(16))
+
+
+@pytest.fixture
+def ds_parallel_class(monkeypatch):
+    monkeypatch.setattr(iRODSConfig, "IRODS_MIN_CHUNK_SIZE", 4)
+    monkeypatch.setattr(iRODSConfig, "IRODS_MAX_CHUNK_SIZE", 4)
+    monkeypatch.setattr(iRODSConfig, "IRODS_PARALLEL_STREAMS", 3)
+    monkeypatch.setattr(iRODSConfig, "IRODS_PARALLEL_SIZE", 0)
+    # Each download may hold a quarter of the budget, 3 streams x 2 blocks x 4 bytes
+    return DownloadStream(DownloadBudget(96))
@@ -0,0 +1,46 @@
+import asyncio
+
+import pytest
+
+from tests.test_function.test_download.fixture import anyio_backend, db_class
+
+
+@pytest.mark.anyio
+async def test_acquire(db_class):
+    assert await db_class.acquire(10) == 10
+    assert db_class.available() == 6
+    # Request larger than capacity is reduced to capacity
+    db_class.release(10)
+    assert await db_class.acquire(32) == 16
+    assert db_class.available() == 0
+    db_class.release(16)
+
+
+@pytest.mark.anyio
+async def test_acquire_wait(db_class):
+    await db_class.acquire(10)
+    first = asyncio.create_task(db_class.acquire(10))
+    second = asyncio.create_task(db_class.acquire(4))
+    await asyncio.sleep(0)
+    # Waiting downloads are granted in arrival order
+    assert first.done() == False
+    assert second.done() == False
+
+    db_class.release(10)
+    await asyncio.sleep(0)
+    assert first.done() == True
+    assert second.done() == True
+    assert db_class.available() == 2
+
+
+@pytest.mark.anyio
+async def test_acquire_cancel(db_class):
+    await db_class.acquire(10)
+    first = asyncio.create_task(db_class.acquire(10))
+    second = asyncio.create_task(db_class.acquire(4))
+    await asyncio.sleep(0)
+    first.cancel()
+    # Cancelled download does not block the following ones
+    assert await second == 4
+    assert first.cancelled() == True
+    assert db_class.available() == 2
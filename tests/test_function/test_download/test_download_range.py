@@ -0,0 +1,140 @@
+import pytest
+from fastapi import HTTPException
+
+from tests.test_function.test_download.fixture import (
+    dr_class,
+    dummy_file,
+    dummy_file_content,
+    dummy_file_header,
+)
+
+
+def test_generate_file_header(dr_class, dummy_file):
+    file_header = dr_class.generate_file_header(dummy_file)
+    assert file_header == {
+        "Accept-Ranges": "bytes",
+        "ETag": '"sha2:dummychecksum="',
+        "Last-Modified": "Mon, 23 Oct 2023 01:02:03 GMT",
+    }
+
+    # Weak etag is used when irods checksum has not been calculated
+    dummy_file.checksum = None
+    file_header = dr_class.generate_file_header(dummy_file)
+    assert file_header["ETag"].startswith('W/"24-')
+
+
+def test_is_not_modified(dr_class, dummy_file_header):
+    assert dr_class.is_not_modified({}, dummy_file_header) == False
+    assert (
+        dr_class.is_not_modified(
+            {"if-none-match": '"other", W/"sha2:dummychecksum="'}, dummy_file_header
+        )
+        == True
+    )
+    assert (
+        dr_class.is_not_modified({"if-none-match": '"other"'}, dummy_file_header)
+        == False
+    )
+    assert (
+        dr_class.is_not_modified(
+            {"if-modified-since": "Mon, 23 Oct 2023 01:02:03 GMT"}, dummy_file_header
+        )
+        == True
+    )
+    assert (
+        dr_class.is_not_modified(
+            {"if-modified-since": "Mon, 23 Oct 2023 01:02:02 GMT"}, dummy_file_header
+        )
+        == False
+    )
+    # If-None-Match takes precedence over If-Modified-Since
+    assert (
+        dr_class.is_not_modified(
+            {
+                "if-none-match": '"other"',
+                "if-modified-since": "Mon, 23 Oct 2023 01:02:03 GMT",
+            },
+            dummy_file_header,
+        )
+        == False
+    )
+
+
+def test_generate_range(dr_class, dummy_file_header):
+    size = 36
+    assert dr_class.generate_range(None, None, size, dummy_file_header) is None
+    assert dr_class.generate_range("bytes=0-9", None, size, dummy_file_header) == [
+        (0, 9)
+    ]
+    assert dr_class.generate_range("bytes=30-", None, size, dummy_file_header) == [
+        (30, 35)
+    ]
+    assert dr_class.generate_range("bytes=-6", None, size, dummy_file_header) == [
+        (30, 35)
+    ]
+    assert dr_class.generate_range("bytes=30-99", None, size, dummy_file_header) == [
+        (30, 35)
+    ]
+    # Overlapping and adjacent ranges are merged
+    assert dr_class.generate_range(
+        "bytes=20-25, 0-4, 3-9, 10-12", None, size, dummy_file_header
+    ) == [(0, 12), (20, 25)]
+    # Invalid or unknown range is ignored
+    assert dr_class.generate_range("bytes=9-0", None, size, dummy_file_header) is None
+    assert dr_class.generate_range("bytes=a-b", None, size, dummy_file_header) is None
+    assert dr_class.generate_range("lines=0-9", None, size, dummy_file_header) is None
+    # Too many ranges will return the whole file
+    many_ranges = "bytes=" + ",".join(f"{_ * 2}-{_ * 2}" for _ in range(17))
+    assert dr_class.generate_range(many_ranges, None, size, dummy_file_header) is None
+
+    with pytest.raises(HTTPException) as error:
+        dr_class.generate_range("bytes=36-40", None, size, dummy_file_header)
+    assert error.value.status_code == 416
+    assert error.value.headers == {"Content-Range": "bytes */36"}
+
+
+def test_generate_range_if_range(dr_class, dummy_file_header):
+    size = 36
+    assert dr_class.generate_range(
+        "bytes=0-9", '"sha2:dummychecksum="', size, dummy_file_header
+    ) == [(0, 9)]
+    assert dr_class.generate_range(
+        "bytes=0-9", "Mon, 23 Oct 2023 01:02:03 GMT", size, dummy_file_header
+    ) == [(0, 9)]
+    # File has been changed, the whole file will be returned
+    assert (
+        dr_class.generate_range("bytes=0-9", '"other"', size, dummy_file_header)
+        is None
+    )
+    assert (
+        dr_class.generate_range(
+            "bytes=0-9", "Mon, 23 Oct 2023 00:00:00 GMT", size, dummy_file_header
+        )
+        is None
+    )
+
+
+def test_generate_range_header_single(dr_class, dummy_file):
+    header, media_type, separators = dr_class.generate_range_header(
+        [(5, 14)], dummy_file.size, "text/plain"
+    )
+    assert header == {"Content-Range": "bytes 5-14/36", "Content-Length": "10"}
+    assert media_type == "text/plain"
+    assert separators is None
+
+
+def test_generate_range_header_multiple(dr_class, dummy_file):
+    ranges = [(0, 3), (30, 35)]
+    header, media_type, separators = dr_class.generate_range_header(
+        ranges, dummy_file.size, None
+    )
+    assert media_type.startswith("multipart/byteranges; boundary=")
+    boundary = media_type.split("=")[1]
+    assert len(separators) == 3
+    assert separators[1] == (
+        f"\r\n--{boundary}\r\n"
+        "Content-Type: application/octet-stream\r\n"
+        "Content-Range: bytes 30-35/36\r\n\r\n"
+    ).encode()
+    assert separators[2] == f"\r\n--{boundary}--\r\n".encode()
+    assert int(header["Content-Length"]) == sum(len(_) for _ in separators) + 10
@@ -0,0 +1,91 @@
+import asyncio
+from unittest.mock import MagicMock
+
+import pytest
+from irods.exception import NetworkException
+
+from app.function.download.download_response import DownloadResponse
+from tests.test_function.test_download.fixture import anyio_backend
+
+
+async def _handle_receive():
+    await asyncio.Event().wait()
+
+
+async def _handle_disconnect():
+    await asyncio.sleep(0.005)
+    return {"type": "http.disconnect"}
+
+
+def _handle_content(state, error=None):
+    async def content():
+        try:
+            yield b"dummy"
+            if error is not None:
+                raise error
+            await asyncio.sleep(0.01)
+            yield b"content"
+        finally:
+            state["closed"] = True
+
+    return content()
+
+
+@pytest.mark.anyio
+async def test_download_response():
+    pool, session, state, sent = MagicMock(), MagicMock(), {}, []
+
+    async def send(message):
+        sent.append(message)
+
+    response = DownloadResponse(_handle_content(state), pool, session)
+    await response({"type": "http"}, _handle_receive, send)
+    assert b"".join(_.get("body", b"") for _ in sent) == b"dummycontent"
+    assert state["closed"]
+    pool.release.assert_called_once_with(session, False)
+
+
+@pytest.mark.anyio
+async def test_download_response_network_error():
+    pool, session, state = MagicMock(), MagicMock(), {}
+
+    async def send(message):
+        pass
+
+    response = DownloadResponse(
+        _handle_content(state, NetworkException("dummy")), pool, session
+    )
+    # Task group may wrap the error depending on anyio version
+    with pytest.raises(Exception):
+        await response({"type": "http"}, _handle_receive, send)
+    # Broken session is discarded even though background task is skipped
+    assert state["closed"]
+    pool.release.assert_called_once_with(session, True)
+
+
+@pytest.mark.anyio
+async def test_download_response_send_error():
+    pool, session, state = MagicMock(), MagicMock(), {}
+
+    async def send(message):
+        if message["type"] == "http.response.body":
+            raise RuntimeError("dummy")
+
+    response = DownloadResponse(_handle_content(state), pool, session)
+    with pytest.raises(Exception):
+        await response({"type": "http"}, _handle_receive, send)
+    assert state["closed"]
+    pool.release.assert_called_once_with(session, False)
+
+
+@pytest.mark.anyio
+async def test_download_response_disconnect():
+    pool, session, state = MagicMock(), MagicMock(), {}
+
+    async def send(message):
+        await asyncio.sleep(0)
+
+    response = DownloadResponse(_handle_content(state), pool, session)
+    await response({"type": "http"}, _handle_disconnect, send)
+    assert state["closed"]
+    pool.release.assert_called_once_with(session, False)
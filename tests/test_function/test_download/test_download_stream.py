@@ -0,0 +1,161 @@
+import asyncio
+import io
+
+import pytest
+
+from app.config import iRODSConfig
+from app.function.download.download_budget import DownloadBudget
+from app.function.download.download_stream import DownloadStream
+
+from tests.test_function.test_download.fixture import (
+    anyio_backend,
+    dr_class,
+    ds_class,
+    ds_parallel_class,
+    dummy_file,
+    dummy_file_content,
+)
+
+
+async def _handle_collect(stream):
+    return [_ async for _ in stream]
+
+
+def test_generate_chunk_size(ds_class):
+    # Fast client doubles chunk size
+    assert ds_class.generate_chunk_size(4, 4, 0.001) == 8
+    assert ds_class.generate_chunk_size(16, 16, 0.001) == 16
+    # Slow client halves chunk size
+    assert ds_class.generate_chunk_size(16, 16, 60) == 8
+    assert ds_class.generate_chunk_size(4, 4, 60) == 4
+    # Chunk size follows client throughput within the limits
+    assert ds_class.generate_chunk_size(8, 8, 0.4) == 10
+
+
+@pytest.mark.anyio
+async def test_generate_stream(ds_class, dummy_file, dummy_file_content):
+    data = [_ async for _ in ds_class.generate_stream(dummy_file, [(0, 35)])]
+    assert b"".join(data) == dummy_file_content
+    # Chunk size grows with a fast client
+    assert [len(_) for _ in data] == [4, 8, 16, 8]
+
+
+@pytest.mark.anyio
+async def test_generate_stream_range(ds_class, dummy_file):
+    data = [_ async for _ in ds_class.generate_stream(dummy_file, [(5, 14)])]
+    # Only the requested bytes are read
+    assert b"".join(data) == b"56789abcde"
+
+
+@pytest.mark.anyio
+async def test_generate_stream_multiple(ds_class, dr_class, dummy_file):
+    ranges = [(0, 3), (30, 35)]
+    header, media_type, separators = dr_class.generate_range_header(
+        ranges, dummy_file.size, None
+    )
+    boundary = media_type.split("=")[1]
+    body = b"".join(
+        [_ async for _ in ds_class.generate_stream(dummy_file, ranges, separators)]
+    )
+    assert int(header["Content-Length"]) == len(body)
+    assert body == (
+        f"--{boundary}\r\n"
+        "Content-Type: application/octet-stream\r\n"
+        "Content-Range: bytes 0-3/36\r\n\r\n"
+        "0123\r\n"
+        f"--{boundary}\r\n"
+        "Content-Type: application/octet-stream\r\n"
+        "Content-Range: bytes 30-35/36\r\n\r\n"
+        "uvwxyz\r\n"
+        f"--{boundary}--\r\n"
+    ).encode()
+
+
+@pytest.mark.anyio
+async def test_generate_stream_budget(ds_class, dummy_file):
+    stream = ds_class.generate_stream(dummy_file, [(0, 35)])
+    first = ds_class.generate_stream(dummy_file, [(0, 35)])
+    assert await first.__anext__() == b"0123"
+    await stream.__anext__()
+    # Bytes of sending chunks are held until the chunks have been sent
+    assert ds_class._DownloadStream__budget.available() == 8
+    await first.aclose()
+    await stream.aclose()
+    # Interrupted downloads return their bytes
+    assert ds_class._DownloadStream__budget.available() == 16
+
+
+@pytest.mark.anyio
+async def test_generate_stream_parallel(
+    ds_parallel_class, dummy_file, dummy_file_content
+):
+    data = [_ async for _ in ds_parallel_class.generate_stream(dummy_file, [(0, 35)])]
+    # Blocks read by different connections are sent in order
+    assert b"".join(data) == dummy_file_content
+    assert dummy_file.open.call_count == 3
+
+    data = [_ async for _ in ds_parallel_class.generate_stream(dummy_file, [(5, 14)])]
+    assert data == [b"5678", b"9abc", b"de"]
+    assert ds_parallel_class._DownloadStream__budget.available() == 96
+
+
+@pytest.mark.anyio
+async def test_generate_stream_parallel_multiple(
+    ds_parallel_class, dr_class, dummy_file
+):
+    ranges = [(0, 3), (30, 35)]
+    header, media_type, separators = dr_class.generate_range_header(
+        ranges, dummy_file.size, None
+    )
+    body = b"".join(
+        [
+            _
+            async for _ in ds_parallel_class.generate_stream(
+                dummy_file, ranges, separators
+            )
+        ]
+    )
+    assert int(header["Content-Length"]) == len(body)
+    assert body == separators[0] + b"0123" + separators[1] + b"uvwxyz" + separators[2]
+
+
+@pytest.mark.anyio
+async def test_generate_stream_parallel_interrupted(ds_parallel_class, dummy_file):
+    stream = ds_parallel_class.generate_stream(dummy_file, [(0, 35)])
+    assert await stream.__anext__() == b"0123"
+    await stream.aclose()
+    # Blocks read ahead and cancelled reads return their bytes
+    await asyncio.sleep(0)
+    assert ds_parallel_class._DownloadStream__budget.available() == 96
+
+
+@pytest.mark.anyio
+async def test_generate_stream_parallel_error(ds_parallel_class, dummy_file):
+    dummy_file.open.side_effect = OSError("dummy error")
+    with pytest.raises(OSError):
+        [_ async for _ in ds_parallel_class.generate_stream(dummy_file, [(0, 35)])]
+    assert ds_parallel_class._DownloadStream__budget.available() == 96
+
+
+@pytest.mark.anyio
+async def test_generate_stream_parallel_stalled(monkeypatch, dummy_file):
+    monkeypatch.setattr(iRODSConfig, "IRODS_MAX_CHUNK_SIZE", 16)
+    monkeypatch.setattr(iRODSConfig, "IRODS_PARALLEL_STREAMS", 3)
+    monkeypatch.setattr(iRODSConfig, "IRODS_PARALLEL_SIZE", 0)
+    budget = DownloadBudget(96)
+    ds = DownloadStream(budget)
+    content = bytes(range(256)) * 2
+    dummy_file.size = len(content)
+    dummy_file.open.side_effect = lambda mode: io.BytesIO(content)
+    stalled = ds.generate_stream(dummy_file, [(0, len(content) - 1)])
+    assert await stalled.__anext__() == content[:4]
+    # Stalled client fills its reorder window, but not the whole budget
+    await asyncio.sleep(0.05)
+    assert budget.available() >= budget.capacity() * 3 // 4
+    data = await asyncio.wait_for(
+        _handle_collect(ds.generate_stream(dummy_file, [(0, 9)])), 1
+    )
+    assert b"".join(data) == content[:10]
+    await stalled.aclose()
+    await asyncio.sleep(0)
+    assert budget.available() == 96
@@ -1,12 +1,19 @@
 import pytest
 
 from app.data_schema import GraphQLPaginationItem
+from app.function.filter.filter_bitmap import FilterBitmap
 from app.function.filter.filter_editor import FilterEditor
 from app.function.filter.filter_formatter import FilterFormatter
 from app.function.filter.filter_generator import FilterGenerator
+from app.function.filter.filter_index import FilterIndex
 from app.function.filter.filter_logic import FilterLogic
 
 
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
 @pytest.fixture
 def fe_class():
     return FilterEditor()
@@ -31,6 +38,16 @@ def fg_class(fg_fe_class):
     return FilterGenerator(fg_fe_class, DummyESClass)
 
 
+@pytest.fixture
+def fb_class():
+    return FilterBitmap()
+
+
+@pytest.fixture
+def fi_class():
+    return FilterIndex()
+
+
 @pytest.fixture
 def fl_class():
     return FilterLogic()
@@ -301,6 +318,61 @@ def dummy_filter_data():
     }
 
 
+@pytest.fixture
+def dummy_index_data():
+    return {
+        "case_filter": [
+            {
+                "age_category": "dummy age category",
+                "experiments": [{"id": "dummy id", "submitter_id": "dummy dataset 1"}],
+                "id": "dummy id",
+                "sex": "Female",
+                "species": "dummy species",
+            },
+            {
+                "age_category": "dummy age category",
+                "experiments": [{"id": "dummy id", "submitter_id": "dummy dataset 2"}],
+                "id": "dummy id",
+                "sex": "Male",
+                "species": "dummy species",
+            },
+            {
+                "age_category": "NA",
+                "experiments": [],
+                "id": "dummy id",
+                "sex": "Male",
+                "species": "dummy species",
+            },
+        ],
+        "dataset_description_filter": [
+            {
+                "experiments": [{"id": "dummy id", "submitter_id": "dummy dataset 2"}],
+                "id": "dummy id",
+                "keywords": ["dummy keywords"],
+                "study_organ_system": ["dummy organ", "extra dummy organ"],
+            },
+            {
+                "experiments": [{"id": "dummy id", "submitter_id": "dummy dataset 3"}],
+                "id": "dummy id",
+                "keywords": [],
+                "study_organ_system": ["extra dummy organ"],
+            },
+        ],
+        "experiment_filter": [
+            {
+                "id": "dummy id",
+                "project_id": "dummy project",
+                "submitter_id": "dummy dataset 1",
+            },
+            {
+                "id": "dummy id",
+                "project_id": "dummy project",
+                "submitter_id": "dummy dataset 3",
+            },
+        ],
+    }
+
+
 @pytest.fixture
 def dummy_pagination_item():
     return GraphQLPaginationItem(node="experiment_pagination_count")
@@ -0,0 +1,36 @@
+import pytest
+
+from tests.test_function.test_filter.fixture import fb_class
+
+
+def test_generate_bitmap(fb_class):
+    bitmap = fb_class.generate_bitmap(["dummy dataset 2", "dummy dataset 1"])
+    assert bitmap == 0b11
+    assert fb_class.generate_bitmap(["dummy dataset 3", "dummy dataset 1"]) == 0b110
+    assert fb_class.generate_bitmap([]) == 0
+    assert fb_class.generate_dataset(bitmap) == ["dummy dataset 1", "dummy dataset 2"]
+    assert fb_class.generate_dataset(0) == []
+
+
+def test_implement_relation(fb_class):
+    organ = fb_class.generate_bitmap(["dummy dataset 1", "dummy dataset 2"])
+    species = fb_class.generate_bitmap(["dummy dataset 2", "dummy dataset 3"])
+    sex = fb_class.generate_bitmap(["dummy dataset 4"])
+    and_relation = fb_class.implement_relation("and", [organ, species])
+    assert fb_class.generate_dataset(and_relation) == ["dummy dataset 2"]
+    or_relation = fb_class.implement_relation("or", [organ, species])
+    assert fb_class.generate_dataset(or_relation) == [
+        "dummy dataset 1",
+        "dummy dataset 2",
+        "dummy dataset 3",
+    ]
+    # (organ AND species) OR sex
+    nested_relation = fb_class.implement_relation(
+        "or", [{"relation": "and", "groups": [organ, species]}, sex]
+    )
+    assert fb_class.generate_dataset(nested_relation) == [
+        "dummy dataset 2",
+        "dummy dataset 4",
+    ]
+    with pytest.raises(ValueError):
+        fb_class.implement_relation("xor", [organ, species])
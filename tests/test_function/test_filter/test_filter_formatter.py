@@ -1,3 +1,4 @@
+from app.context import RequestContext
 from tests.test_function.test_filter.fixture import (
     dummy_filter_cache,
     dummy_filter_cache_private,
@@ -6,8 +7,7 @@ from tests.test_function.test_filter.fixture import (
 
 
 def test_generate_sidebar_filter_format(ff_class):
-    ff_class.set_private_filter({})
-    sidebar_format = ff_class.generate_sidebar_filter_format()
+    sidebar_format = ff_class.generate_sidebar_filter_format(RequestContext({}))
     assert sidebar_format == [
         {
             "key": "case_filter>age_category",
@@ -43,8 +43,9 @@ def test_generate_sidebar_filter_format(ff_class):
 
 
 def test_generate_sidebar_filter_format_private(ff_class, dummy_filter_cache_private):
-    ff_class.set_private_filter(dummy_filter_cache_private)
-    sidebar_format = ff_class.generate_sidebar_filter_format()
+    sidebar_format = ff_class.generate_sidebar_filter_format(
+        RequestContext(dummy_filter_cache_private)
+    )
     assert sidebar_format == [
         {
             "key": "case_filter>age_category",
@@ -84,8 +85,7 @@ def test_generate_sidebar_filter_format_private(ff_class, dummy_filter_cache_pri
 
 
 def test_generate_filter_format(ff_class):
-    ff_class.set_private_filter({})
-    format_ = ff_class.generate_filter_format()
+    format_ = ff_class.generate_filter_format(RequestContext({}))
     assert format_ == {
         "size": 3,
         "titles": [
@@ -107,8 +107,9 @@ def test_generate_filter_format(ff_class):
 
 
 def test_generate_filter_format_private(ff_class, dummy_filter_cache_private):
-    ff_class.set_private_filter(dummy_filter_cache_private)
-    format_ = ff_class.generate_filter_format()
+    format_ = ff_class.generate_filter_format(
+        RequestContext(dummy_filter_cache_private)
+    )
     assert format_ == {
         "size": 3,
         "titles": [
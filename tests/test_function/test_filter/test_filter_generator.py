@@ -1,7 +1,11 @@
-from unittest.mock import MagicMock
+import copy
+from unittest.mock import AsyncMock
+
+import pytest
 
 from tests.test_function.test_filter.fixture import (
     DummyESClass,
+    anyio_backend,
     dummy_data_cache,
     dummy_data_cache_failure,
     dummy_data_cache_private,
@@ -13,28 +17,52 @@ from tests.test_function.test_filter.fixture import (
 )
 
 
-def test_generate_public_filter(
+@pytest.mark.anyio
+async def test_generate_public_filter(
     fg_fe_class, fg_class, dummy_data_cache, dummy_filter_cache
 ):
-    fg_class._handle_cache = MagicMock(return_value=dummy_data_cache)
-    generate = fg_class.generate_public_filter()
+    fg_class._handle_cache = AsyncMock(return_value=dummy_data_cache)
+    generate = await fg_class.generate_public_filter()
     public_filter = fg_fe_class.cache_loader()
     assert generate is True
     assert public_filter == dummy_filter_cache
+    filter_index = fg_fe_class.index_loader()
+    assert filter_index.search_filtered_dataset(
+        "case_filter", "age_category", ["dummy age category"]
+    ) == ["dummy submitter"]
 
 
-def test_generate_public_filter_failure(fg_class, dummy_data_cache_failure):
-    fg_class._handle_cache = MagicMock(return_value=dummy_data_cache_failure)
-    generate = fg_class.generate_public_filter()
+@pytest.mark.anyio
+async def test_generate_public_filter_failure(fg_class, dummy_data_cache_failure):
+    fg_class._handle_cache = AsyncMock(return_value=dummy_data_cache_failure)
+    generate = await fg_class.generate_public_filter()
     assert generate is False
 
 
-def test_generate_private_filter(
+@pytest.mark.anyio
+async def test_update_filter_index(fg_fe_class, fg_class, dummy_data_cache):
+    fg_class._handle_cache = AsyncMock(return_value=dummy_data_cache)
+    await fg_class.generate_public_filter()
+    public_filter = fg_fe_class.cache_loader()
+    # Dataset published after the daily filter update
+    updated_data_cache = copy.deepcopy(dummy_data_cache)
+    updated_data_cache["case_filter"][0]["experiments"][0]["submitter_id"] = "new"
+    fg_class._handle_cache = AsyncMock(return_value=updated_data_cache)
+    await fg_class.update_filter_index()
+    assert fg_fe_class.cache_loader() == public_filter
+    filter_index = fg_fe_class.index_loader()
+    assert filter_index.search_filtered_dataset(
+        "case_filter", "age_category", ["dummy age category"]
+    ) == ["new"]
+
+
+@pytest.mark.anyio
+async def test_generate_private_filter(
     fg_class, dummy_data_cache, dummy_data_cache_private, dummy_filter_cache_private
 ):
     # Generate private filter requires public filter
-    fg_class._handle_cache = MagicMock(return_value=dummy_data_cache)
-    fg_class.generate_public_filter()
-    fg_class._handle_cache = MagicMock(return_value=dummy_data_cache_private)
-    private_filter = fg_class.generate_private_filter(["dummy access"])
+    fg_class._handle_cache = AsyncMock(return_value=dummy_data_cache)
+    await fg_class.generate_public_filter()
+    fg_class._handle_cache = AsyncMock(return_value=dummy_data_cache_private)
+    private_filter = await fg_class.generate_private_filter(["dummy access"])
     assert private_filter == dummy_filter_cache_private
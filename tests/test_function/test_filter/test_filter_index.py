@@ -0,0 +1,74 @@
+from tests.test_function.test_filter.fixture import dummy_index_data, fi_class
+
+
+def test_update_filter_index(fi_class, dummy_index_data):
+    assert fi_class.has_filter_index("case_filter") is False
+    for node, data in dummy_index_data.items():
+        fi_class.update_filter_index(node, data)
+    assert fi_class.has_filter_index("case_filter") is True
+    assert fi_class.has_filter_index("manifest_filter") is False
+
+
+def test_search_filtered_dataset(fi_class, dummy_index_data):
+    for node, data in dummy_index_data.items():
+        fi_class.update_filter_index(node, data)
+    assert fi_class.search_filtered_dataset("case_filter", "sex", ["F", "Female"]) == [
+        "dummy dataset 1",
+    ]
+    assert fi_class.search_filtered_dataset(
+        "case_filter", "species", ["dummy species"]
+    ) == [
+        "dummy dataset 1",
+        "dummy dataset 2",
+    ]
+    # Array type field
+    assert fi_class.search_filtered_dataset(
+        "dataset_description_filter", "study_organ_system", ["extra dummy organ"]
+    ) == [
+        "dummy dataset 2",
+        "dummy dataset 3",
+    ]
+    assert fi_class.search_filtered_dataset(
+        "experiment_filter", "project_id", ["dummy project", "dummy private project"]
+    ) == [
+        "dummy dataset 1",
+        "dummy dataset 3",
+    ]
+    assert fi_class.search_filtered_dataset("case_filter", "sex", ["Unknown"]) == []
+
+
+def test_update_filter_index_incremental(fi_class, dummy_index_data):
+    for node, data in dummy_index_data.items():
+        fi_class.update_filter_index(node, data)
+    fi_class.update_filter_index("case_filter", dummy_index_data["case_filter"][:1])
+    assert fi_class.search_filtered_dataset(
+        "case_filter", "species", ["dummy species"]
+    ) == [
+        "dummy dataset 1",
+    ]
+    # Other nodes are not affected
+    assert fi_class.search_filtered_dataset(
+        "experiment_filter", "project_id", ["dummy project"]
+    ) == [
+        "dummy dataset 1",
+        "dummy dataset 3",
+    ]
+
+
+def test_implement_filter_relation(fi_class, dummy_index_data):
+    for node, data in dummy_index_data.items():
+        fi_class.update_filter_index(node, data)
+    bitmaps = [
+        fi_class.search_filtered_bitmap("case_filter", "species", ["dummy species"]),
+        fi_class.search_filtered_bitmap(
+            "dataset_description_filter", "study_organ_system", ["extra dummy organ"]
+        ),
+    ]
+    assert fi_class.implement_filter_relation("and", bitmaps) == [
+        "dummy dataset 2",
+    ]
+    assert fi_class.implement_filter_relation("or", bitmaps) == [
+        "dummy dataset 1",
+        "dummy dataset 2",
+        "dummy dataset 3",
+    ]
@@ -49,3 +49,21 @@ def test_implement_filter_relation_or(
         "dummy dataset 3",
         "dummy dataset 4",
     ]
+
+
+def test_implement_filter_relation_nested(fl_class, dummy_pagination_item):
+    dummy_pagination_item.filter = {
+        "submitter_id": [
+            ["dummy dataset 1", "dummy dataset 2"],
+            {
+                "relation": "or",
+                "submitter_id": [["dummy dataset 2"], ["dummy dataset 1"]],
+            },
+        ]
+    }
+    dummy_pagination_item.relation = "and"
+    nested_relation = fl_class.implement_filter_relation(dummy_pagination_item)
+    assert nested_relation == [
+        "dummy dataset 1",
+        "dummy dataset 2",
+    ]
@@ -1,8 +1,20 @@
+from unittest.mock import AsyncMock, MagicMock
+
+from app.config import Gen3Config
+from app.data_schema import GraphQLPaginationItem
+from app.function.pagination.pagination_cache import PaginationCache
 from app.function.pagination.pagination_formatter import PaginationFormatter
+from app.function.pagination.pagination_logic import PaginationLogic
 from app.function.filter.filter_editor import FilterEditor
+from app.function.filter.filter_logic import FilterLogic
 import pytest
 
 
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
 @pytest.fixture
 def pf_class(dummy_filter_cache):
     fe = FilterEditor()
@@ -10,6 +22,42 @@ def pf_class(dummy_filter_cache):
     return PaginationFormatter(fe)
 
 
+@pytest.fixture
+def pc_class():
+    return PaginationCache()
+
+
+@pytest.fixture
+def dummy_gen3_service():
+    gen3 = MagicMock()
+    gen3.process_graphql_query = AsyncMock(
+        return_value=[
+            {"project_id": "dummy public", "submitter_id": "dummy 1"},
+            {"project_id": "dummy public", "submitter_id": "dummy 2"},
+            {"project_id": "dummy private", "submitter_id": "dummy 2"},
+            {"project_id": "dummy private", "submitter_id": "dummy 3"},
+        ]
+    )
+    return gen3
+
+
+@pytest.fixture
+def pl_class(monkeypatch, dummy_gen3_service):
+    monkeypatch.setattr(Gen3Config, "GEN3_PUBLIC_ACCESS", "dummy public")
+    es = MagicMock()
+    es.get.return_value = dummy_gen3_service
+    return PaginationLogic(FilterEditor(), FilterLogic(), MagicMock(), es)
+
+
+@pytest.fixture
+def dummy_pagination_item():
+    return GraphQLPaginationItem(
+        filter={
+            "case_filter>species": ["Dummy species", "Extra dummy species"],
+        }
+    )
+
+
 @pytest.fixture
 def dummy_filter_cache():
     return {
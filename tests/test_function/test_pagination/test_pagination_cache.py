@@ -0,0 +1,40 @@
+from tests.test_function.test_pagination.fixture import (
+    dummy_pagination_item,
+    pc_class,
+)
+
+
+def test_generate_cache_key(pc_class, dummy_pagination_item):
+    key = pc_class.generate_cache_key(
+        dummy_pagination_item, "Dummy input", ["dummy public", "dummy private"]
+    )
+    dummy_pagination_item.filter = {
+        "case_filter>species": ["Extra dummy species", "Dummy species"],
+    }
+    dummy_pagination_item.order = "Published(asc)"
+    same_key = pc_class.generate_cache_key(
+        dummy_pagination_item, "dummy  INPUT", ["dummy private", "dummy public"]
+    )
+    assert key == same_key
+
+
+def test_generate_cache_key_access_scope(pc_class, dummy_pagination_item):
+    public_key = pc_class.generate_cache_key(
+        dummy_pagination_item, "", ["dummy public"]
+    )
+    private_key = pc_class.generate_cache_key(
+        dummy_pagination_item, "", ["dummy public", "dummy private"]
+    )
+    assert public_key != private_key
+
+
+def test_pagination_cache(pc_class, dummy_pagination_item):
+    key = pc_class.generate_cache_key(dummy_pagination_item, "", ["dummy public"])
+    assert pc_class.get_pagination_cache(key) is None
+    content = {"items": [], "numberPerPage": 50, "total": 0}
+    pc_class.set_pagination_cache(key, content)
+    assert pc_class.get_pagination_cache(key) == content
+    assert pc_class.get_cache_stats() == {"hits": 1, "misses": 1, "size": 1}
+    pc_class.clear_pagination_cache()
+    assert pc_class.get_pagination_cache(key) is None
+    assert pc_class.get_cache_stats() == {"hits": 1, "misses": 2, "size": 0}
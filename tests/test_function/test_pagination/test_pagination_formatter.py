@@ -1,3 +1,9 @@
+import copy
+import json
+
+from app.function.filter.filter_editor import FilterEditor
+from app.function.pagination.pagination_formatter import PaginationFormatter
+from app.stream import generate_json_stream
 from tests.test_function.test_pagination.fixture import (
     dummy_filter_cache,
     dummy_pagination_data,
@@ -399,3 +405,50 @@ def test_reconstruct_data_structure(pf_class, dummy_pagination_data):
         },
     ]
     assert result["detailsReady"] == True
+
+
+def test_reconstruct_data_structure_filter_update(
+    dummy_filter_cache, dummy_pagination_data
+):
+    fe = FilterEditor()
+    fe.update_filter_cache(dummy_filter_cache)
+    pf = PaginationFormatter(fe)
+    result = pf.reconstruct_data_structure(dummy_pagination_data)[0]
+    assert result["species"] == ["Dummy species", "extra dummy species"]
+    # Species name map is rebuilt after filter cache has been updated
+    updated_filter_cache = copy.deepcopy(dummy_filter_cache)
+    updated_filter_cache["MAPPED_SPECIES"]["facets"][
+        "Extra dummy species"
+    ] = "extra dummy species"
+    fe.update_filter_cache(updated_filter_cache)
+    result = pf.reconstruct_data_structure(dummy_pagination_data)[0]
+    assert result["species"] == ["Dummy species", "Extra dummy species"]
+
+
+def test_generate_data_structure(pf_class, dummy_pagination_data):
+    content = {
+        "items": pf_class.reconstruct_data_structure(dummy_pagination_data),
+        "numberPerPage": 50,
+        "total": 1,
+    }
+    stream = generate_json_stream(
+        "items",
+        pf_class.generate_data_structure(dummy_pagination_data),
+        {"numberPerPage": 50, "total": 1},
+    )
+    assert json.loads(b"".join(stream)) == content
+    # Raw datasets are released after being reconstructed
+    assert dummy_pagination_data == []
+
+
+def test_generate_data_structure_empty(pf_class):
+    stream = generate_json_stream(
+        "items",
+        pf_class.generate_data_structure([]),
+        {"numberPerPage": 50, "total": 0},
+    )
+    assert json.loads(b"".join(stream)) == {
+        "items": [],
+        "numberPerPage": 50,
+        "total": 0,
+    }
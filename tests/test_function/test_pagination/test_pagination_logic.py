@@ -0,0 +1,117 @@
+import threading
+from unittest.mock import MagicMock
+
+import pytest
+
+from app.config import Gen3Config
+from app.context import RequestContext
+from app.data_schema import GraphQLPaginationItem
+from app.function.filter.filter_editor import FilterEditor
+from app.function.filter.filter_logic import FilterLogic
+from app.function.pagination.pagination_logic import PaginationLogic
+from tests.test_function.test_pagination.fixture import (
+    anyio_backend,
+    dummy_gen3_service,
+    pl_class,
+)
+
+
+@pytest.mark.anyio
+async def test_get_pagination_count(pl_class, dummy_gen3_service):
+    access = ["dummy public", "dummy private"]
+    item = GraphQLPaginationItem(access=access)
+    data_count, match_pair = await pl_class.get_pagination_count(item)
+    assert data_count == 3
+    assert match_pair == ["dummy 2"]
+
+    item = GraphQLPaginationItem(
+        filter={"submitter_id": ["dummy 2", "dummy 3", "dummy 4"]},
+        access=list(reversed(access)),
+    )
+    data_count, match_pair = await pl_class.get_pagination_count(item)
+    assert data_count == 2
+    assert match_pair == ["dummy 2"]
+    # Dataset universe of the same access scope is only queried once
+    assert dummy_gen3_service.process_graphql_query.await_count == 1
+
+    pl_class.clear_pagination_universe()
+    await pl_class.get_pagination_count(item)
+    assert dummy_gen3_service.process_graphql_query.await_count == 2
+
+
+@pytest.mark.anyio
+async def test_get_pagination_data(pl_class, dummy_gen3_service):
+    dummy_gen3_service.process_graphql_query.side_effect = [
+        [
+            {"submitter_id": "dummy 1", "version": "public"},
+            {"submitter_id": "dummy 2", "version": "public"},
+            {"submitter_id": "dummy 3", "version": "public"},
+        ],
+        [
+            {"submitter_id": "dummy 1", "version": "private"},
+            {"submitter_id": "dummy 3", "version": "private"},
+        ],
+    ]
+    access = ["dummy public", "dummy private"]
+    item = GraphQLPaginationItem(
+        filter={"submitter_id": ["dummy 1", "dummy 2", "dummy 3"]},
+        access=access,
+        asc="created_datetime",
+    )
+    query_result = await pl_class.get_pagination_data(
+        item, ["dummy 1", "dummy 3", "dummy 4"], False
+    )
+    # User access scope is not changed by the query
+    assert access == ["dummy public", "dummy private"]
+    assert [_["version"] for _ in query_result] == ["private", "public", "private"]
+    # All private versions are fetched in one batched query
+    assert dummy_gen3_service.process_graphql_query.await_count == 2
+    batch_item = dummy_gen3_service.process_graphql_query.await_args.args[0]
+    assert batch_item.filter == {"submitter_id": ["dummy 1", "dummy 3"]}
+    assert batch_item.access == ["dummy private"]
+
+
+@pytest.mark.anyio
+async def test_get_pagination_data_rank(pl_class, dummy_gen3_service):
+    dummy_gen3_service.process_graphql_query.side_effect = [
+        # Dataset universe of the access scope
+        dummy_gen3_service.process_graphql_query.return_value,
+        [
+            {"submitter_id": "dummy 1"},
+            {"submitter_id": "dummy 3"},
+        ],
+    ]
+    item = GraphQLPaginationItem(
+        page=1,
+        limit=2,
+        filter={"submitter_id": ["dummy 3", "dummy 4", "dummy 1", "dummy 2"]},
+        access=["dummy public", "dummy private"],
+        order="relevance",
+    )
+    query_result = await pl_class.get_pagination_data(item, [], False)
+    # Unavailable dataset is skipped, only the requested page is fetched
+    page_item = dummy_gen3_service.process_graphql_query.await_args.args[0]
+    assert page_item.filter == {"submitter_id": ["dummy 3", "dummy 1"]}
+    assert page_item.page == 1
+    assert [_["submitter_id"] for _ in query_result] == ["dummy 3", "dummy 1"]
+
+
+@pytest.mark.anyio
+async def test_process_pagination_item_search(monkeypatch, dummy_gen3_service):
+    monkeypatch.setattr(Gen3Config, "GEN3_PUBLIC_ACCESS", "dummy public")
+    es = MagicMock()
+    es.get.return_value = dummy_gen3_service
+    sl = MagicMock()
+    thread = {}
+
+    def generate_searched_dataset(input_):
+        thread["search"] = threading.get_ident()
+        return {"submitter_id": []}
+
+    sl.generate_searched_dataset.side_effect = generate_searched_dataset
+    pl = PaginationLogic(FilterEditor(), FilterLogic(), sl, es)
+    item = GraphQLPaginationItem()
+    await pl.process_pagination_item(item, "dummy heart", RequestContext({}))
+    assert item.search == {"submitter_id": []}
+    # Blocking irods lookup does not run on the event loop thread
+    assert thread["search"] != threading.get_ident()
@@ -1,3 +1,4 @@
+from app.context import RequestContext
 from tests.test_function.test_query.fixture import (
     dummy_filter_cache,
     dummy_filter_cache_private,
@@ -8,17 +9,17 @@ from tests.test_function.test_query.fixture import (
 
 def test_process_data_output_mode_data(qf_class, dummy_query_data):
     mode = "data"
-    qf_class.set_query_mode(mode)
-    qf_class.set_private_filter({})
-    output = qf_class.process_data_output(dummy_query_data)
+    output = qf_class.process_data_output(
+        dummy_query_data, RequestContext({}, mode)
+    )
     assert output[mode] == dummy_query_data
 
 
 def test_process_data_output_mode_detail(qf_class, dummy_query_data):
     mode = "detail"
-    qf_class.set_query_mode(mode)
-    qf_class.set_private_filter({})
-    output = qf_class.process_data_output(dummy_query_data)
+    output = qf_class.process_data_output(
+        dummy_query_data, RequestContext({}, mode)
+    )
     assert output["detail"]["mris"] == [
         {
             "additional_metadata": None,
@@ -93,9 +94,9 @@ def test_process_data_output_mode_detail_private(
     qf_class, dummy_filter_cache_private, dummy_query_data
 ):
     mode = "detail"
-    qf_class.set_query_mode(mode)
-    qf_class.set_private_filter(dummy_filter_cache_private)
-    output = qf_class.process_data_output(dummy_query_data)
+    output = qf_class.process_data_output(
+        dummy_query_data, RequestContext(dummy_filter_cache_private, mode)
+    )
     assert output["facet"] == {
         "Data type": [
             "Scaffold",
@@ -120,9 +121,9 @@ def test_process_data_output_mode_detail_private(
 
 def test_process_data_output_mode_facet(qf_class, dummy_query_data):
     mode = "facet"
-    qf_class.set_query_mode(mode)
-    qf_class.set_private_filter({})
-    output = qf_class.process_data_output(dummy_query_data)
+    output = qf_class.process_data_output(
+        dummy_query_data, RequestContext({}, mode)
+    )
     assert output[mode] == [
         {
             "facet": "Scaffold",
@@ -166,9 +167,9 @@ def test_process_data_output_mode_facet_private(
     qf_class, dummy_filter_cache_private, dummy_query_data
 ):
     mode = "facet"
-    qf_class.set_query_mode(mode)
-    qf_class.set_private_filter(dummy_filter_cache_private)
-    output = qf_class.process_data_output(dummy_query_data)
+    output = qf_class.process_data_output(
+        dummy_query_data, RequestContext(dummy_filter_cache_private, mode)
+    )
     assert output[mode] == [
         {
             "facet": "Scaffold",
@@ -215,9 +216,9 @@ def test_process_data_output_mode_facet_private(
 
 def test_process_data_output_mode_mri(qf_class, dummy_query_data):
     mode = "mri"
-    qf_class.set_query_mode(mode)
-    qf_class.set_private_filter({})
-    output = qf_class.process_data_output(dummy_query_data)
+    output = qf_class.process_data_output(
+        dummy_query_data, RequestContext({}, mode)
+    )
     assert output[mode] == {
         "dummy_filename": [
             "primary/sub-dummy/sam-dummy/dummy_filename_c0.nrrd",
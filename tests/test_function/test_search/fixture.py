@@ -1,7 +1,9 @@
 import pytest
 
 from app.data_schema import GraphQLPaginationItem
+from app.function.search.search_index import SearchIndex
 from app.function.search.search_logic import SearchLogic
+from app.function.search.search_suggestion import SearchSuggestion
 
 
 @pytest.fixture
@@ -13,6 +15,24 @@ class DummyESClass:
     pass
 
 
+@pytest.fixture
+def si_class(dummy_search_metadata):
+    si = SearchIndex()
+    si.update_search_index(dummy_search_metadata)
+    return si
+
+
+@pytest.fixture
+def dummy_search_metadata():
+    return [
+        ("dummy dataset 1", "TITLE", "Heart scaffold of a rat"),
+        ("dummy dataset 1", "CONTRIBUTOR", "Dummy Contributor"),
+        ("dummy dataset 2", "TITLE", "Scaffolding the colon"),
+        ("dummy dataset 2", "CONTRIBUTOR", "Heart Contributor"),
+        ("dummy dataset 3", "SUBTITLE", "Colon of a mouse"),
+    ]
+
+
 @pytest.fixture
 def dummy_search_data():
     return {
@@ -27,3 +47,28 @@ def dummy_search_data():
 @pytest.fixture
 def dummy_pagination_item():
     return GraphQLPaginationItem(node="experiment_pagination_count")
+
+
+@pytest.fixture
+def ss_class(dummy_dataset_description):
+    ss = SearchSuggestion()
+    ss.update_search_suggestion(dummy_dataset_description)
+    return ss
+
+
+@pytest.fixture
+def dummy_dataset_description():
+    return [
+        {
+            "submitter_id": "dummy dataset 1-dataset_description",
+            "title": "Heart scaffold of a rat",
+            "keywords": ["cardiac", "scaffold"],
+            "contributor_name": ["Dummy, Contributor"],
+        },
+        {
+            "submitter_id": "dummy dataset 2-dataset_description",
+            "title": "Human heart",
+            "keywords": None,
+            "contributor_name": ["Hearst, Extra"],
+        },
+    ]
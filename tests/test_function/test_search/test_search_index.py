@@ -0,0 +1,54 @@
+from unittest.mock import MagicMock
+
+import pytest
+from fastapi import HTTPException
+from irods.models import Collection, DataObjectMeta
+
+from app.config import iRODSConfig
+from app.function.search.search_logic import SearchLogic
+from tests.test_function.test_search.fixture import (
+    dummy_search_metadata,
+    si_class,
+)
+
+
+def test_search_keyword(si_class):
+    assert si_class.has_search_index()
+    heart = si_class.search_keyword("heart")
+    assert sorted(heart) == ["dummy dataset 1", "dummy dataset 2"]
+    # Title match is more relevant than contributor match
+    assert heart["dummy dataset 1"] > heart["dummy dataset 2"]
+    # Keyword matches the start or the end of a token
+    assert sorted(si_class.search_keyword("scaffold")) == [
+        "dummy dataset 1",
+        "dummy dataset 2",
+    ]
+    assert list(si_class.search_keyword("ouse")) == ["dummy dataset 3"]
+    assert si_class.search_keyword("ffol") == {}
+
+
+def test_search_keyword_rarity(si_class):
+    # Rare keyword is more relevant than common keyword
+    contributor = si_class.search_keyword("contributor")
+    dummy = si_class.search_keyword("dummy")
+    assert dummy["dummy dataset 1"] > contributor["dummy dataset 1"]
+
+
+def test_generate_indexed_dataset(dummy_search_metadata):
+    es = MagicMock()
+    es.get.return_value.process_search_metadata.return_value = [
+        {
+            Collection.name: f"{iRODSConfig.IRODS_ROOT_PATH}/{dataset}",
+            DataObjectMeta.name: field,
+            DataObjectMeta.value: value,
+        }
+        for dataset, field, value in dummy_search_metadata
+    ]
+    sl_class = SearchLogic(es)
+    sl_class.update_search_index()
+    datasets = sl_class.generate_searched_dataset("Heart, colon")
+    assert datasets == {
+        "submitter_id": ["dummy dataset 2", "dummy dataset 1", "dummy dataset 3"]
+    }
+    with pytest.raises(HTTPException):
+        sl_class.generate_searched_dataset("heart kidney")
@@ -1,5 +1,9 @@
 from unittest.mock import MagicMock
 
+from irods.models import Collection, DataObjectMeta
+
+from app.config import iRODSConfig
+from app.function.search.search_logic import SearchLogic
 from tests.test_function.test_search.fixture import (
     DummyESClass,
     dummy_pagination_item,
@@ -70,3 +74,38 @@ def test_implement_search_filter_relation_no_filter(
     dummy_pagination_item.filter = {"submitter_id": []}
     relation = sl_class.implement_search_filter_relation(dummy_pagination_item)
     assert relation == []
+
+
+def test_generate_searched_dataset_without_index():
+    es = MagicMock()
+    es.get.return_value.process_keyword_searches.return_value = {
+        "heart": [
+            {
+                Collection.name: f"{iRODSConfig.IRODS_ROOT_PATH}/dummy dataset 1",
+                DataObjectMeta.value: "Rat heart scaffold",
+            },
+            {
+                Collection.name: f"{iRODSConfig.IRODS_ROOT_PATH}/dummy dataset 2",
+                DataObjectMeta.value: "Sweetheart",
+            },
+        ],
+        "rat": [
+            {
+                Collection.name: f"{iRODSConfig.IRODS_ROOT_PATH}/dummy dataset 1",
+                DataObjectMeta.value: "Heart of a rat ",
+            },
+        ],
+    }
+    datasets = SearchLogic(es).generate_searched_dataset("heart rat")
+    assert datasets == {"submitter_id": ["dummy dataset 1"]}
+    # All keywords are sent in one concurrent search
+    es.get.return_value.process_keyword_searches.assert_called_once()
+
+
+def test_generate_searched_dataset_cache(sl_class, dummy_search_data):
+    sl_class._handle_searched_data = MagicMock(return_value=dummy_search_data)
+    datasets = sl_class.generate_searched_dataset("dummy string input")
+    datasets["submitter_id"].clear()
+    cached_datasets = sl_class.generate_searched_dataset("Input, DUMMY string")
+    assert cached_datasets["submitter_id"][0] == "dummy dataset 3"
+    sl_class._handle_searched_data.assert_called_once()
@@ -0,0 +1,61 @@
+import pytest
+from fastapi import HTTPException
+
+from tests.test_function.test_search.fixture import (
+    dummy_dataset_description,
+    sl_class,
+    ss_class,
+)
+
+
+def test_generate_suggestion(ss_class):
+    assert ss_class.has_search_suggestion()
+    suggestion = ss_class.generate_suggestion("rat hea", 10)
+    assert suggestion == [
+        {
+            "datasetId": "dummy dataset 1",
+            "field": "title",
+            "text": "Heart scaffold of a rat",
+            "highlight": [0, 3],
+            "distance": 0,
+        },
+        {
+            "datasetId": "dummy dataset 2",
+            "field": "title",
+            "text": "Human heart",
+            "highlight": [6, 9],
+            "distance": 0,
+        },
+        {
+            "datasetId": "dummy dataset 2",
+            "field": "contributor",
+            "text": "Hearst, Extra",
+            "highlight": [0, 3],
+            "distance": 0,
+        },
+    ]
+    assert len(ss_class.generate_suggestion("hea", 2)) == 2
+
+
+def test_generate_suggestion_typo(ss_class):
+    # Typing error is tolerated
+    suggestion = ss_class.generate_suggestion("scafold", 10)
+    assert [(_["datasetId"], _["field"], _["distance"]) for _ in suggestion] == [
+        ("dummy dataset 1", "title", 1),
+        ("dummy dataset 1", "keyword", 1),
+    ]
+    # Very short word must match exactly
+    assert ss_class.generate_suggestion("hx", 10) == []
+    assert ss_class.generate_suggestion("", 10) == []
+
+
+def test_generate_suggestion_update(ss_class, dummy_dataset_description):
+    assert len(ss_class.generate_suggestion("scafold", 10)) == 2
+    # Matched terms of the previous trie are not reused after rebuilding
+    ss_class.update_search_suggestion(dummy_dataset_description[1:])
+    assert ss_class.generate_suggestion("scafold", 10) == []
+
+
+def test_generate_suggested_dataset_not_ready(sl_class):
+    with pytest.raises(HTTPException):
+        sl_class.generate_suggested_dataset("hea", 10)
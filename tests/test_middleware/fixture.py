@@ -0,0 +1,79 @@
+import fnmatch
+from datetime import datetime
+
+import pytest
+
+from app.config import Config
+from middleware.jwt import JWT
+from middleware.revocation import RevocationList
+from middleware.session import RedisBackend, SessionStore, SQLiteBackend
+from middleware.user import User
+
+
+@pytest.fixture
+def sqlite_store(tmp_path):
+    path = str(tmp_path / "session.db")
+    return SessionStore(SQLiteBackend(path), SQLiteBackend(path, "users_revision"))
+
+
+@pytest.fixture
+def jwt_class(monkeypatch):
+    monkeypatch.setattr(Config, "QUERY_SECURE_KEY", "dummy secure key")
+    return JWT()
+
+
+@pytest.fixture
+def revocation_path(tmp_path):
+    return str(tmp_path / "session.db")
+
+
+@pytest.fixture
+def revocation_list(revocation_path):
+    return RevocationList(SQLiteBackend(revocation_path, "revocations"))
+
+
+@pytest.fixture
+def redis_client():
+    return DummyRedisClient()
+
+
+@pytest.fixture
+def redis_store(redis_client):
+    return SessionStore(
+        RedisBackend(redis_client), RedisBackend(redis_client, "12labours:revision:")
+    )
+
+
+@pytest.fixture
+def dummy_user():
+    return User(
+        "dummy_email@gmail.com>dummy_machine_id>1700000000000",
+        ["dummy public", "dummy private"],
+        datetime(2023, 11, 15, 9, 13, 20),
+    )
+
+
+class DummyRedisClient:
+    """
+    Local stand-in for a redis client, values are stored as bytes
+    """
+
+    def __init__(self):
+        self.data = {}
+        self.calls = 0
+
+    def get(self, key):
+        self.calls += 1
+        return self.data.get(key)
+
+    def set(self, key, value):
+        self.calls += 1
+        self.data[key] = value.encode("utf-8")
+
+    def delete(self, key):
+        self.calls += 1
+        return 1 if self.data.pop(key, None) is not None else 0
+
+    def scan_iter(self, match):
+        self.calls += 1
+        return [key.encode("utf-8") for key in self.data if fnmatch.fnmatch(key, match)]
@@ -0,0 +1,13 @@
+from unittest.mock import MagicMock
+
+from middleware.auth import Authority
+
+
+def test_authority_one_off_token():
+    one_off = MagicMock(return_value="dummy one off token")
+    authority = Authority(["dummy public"], one_off)
+    assert authority["access_scope"] == ["dummy public"]
+    one_off.assert_not_called()
+    assert authority["one_off_token"] == "dummy one off token"
+    assert authority["one_off_token"] == "dummy one off token"
+    one_off.assert_called_once()
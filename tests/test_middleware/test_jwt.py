@@ -0,0 +1,42 @@
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+
+import jwt as pyjwt
+import pytest
+
+from tests.test_middleware.fixture import jwt_class
+
+
+def test_decoding_token_cache(jwt_class):
+    jwt = jwt_class
+    token = jwt.encoding_token({"identity": "dummy identity"})
+    with patch("middleware.jwt.jwt.decode", wraps=pyjwt.decode) as decode:
+        for _ in range(5):
+            assert jwt.decoding_token(token)["identity"] == "dummy identity"
+    assert decode.call_count == 1
+
+
+def test_decoding_token_expired(jwt_class):
+    jwt = jwt_class
+    token = jwt.encoding_token(
+        {
+            "identity": "dummy identity",
+            "exp": datetime.now(tz=timezone.utc) + timedelta(seconds=1),
+        }
+    )
+    assert jwt.decoding_token(token)["identity"] == "dummy identity"
+    expired_time = datetime.now().timestamp() + 2
+    with patch("middleware.jwt.time.time", return_value=expired_time), patch(
+        "middleware.jwt.jwt.decode", side_effect=pyjwt.ExpiredSignatureError
+    ) as decode:
+        # Cached claims will not be used once the token has expired
+        with pytest.raises(pyjwt.ExpiredSignatureError):
+            jwt.decoding_token(token)
+    assert decode.call_count == 1
+
+
+def test_decoding_token_scope(jwt_class):
+    jwt = jwt_class
+    token = jwt.encoding_token({"identity": "dummy identity", "scope": ["dummy"]})
+    jwt.decoding_token(token)["scope"].remove("dummy")
+    assert jwt.decoding_token(token)["scope"] == ["dummy"]
@@ -0,0 +1,42 @@
+import time
+from datetime import datetime, timedelta
+
+from middleware import revocation
+from middleware.revocation import BloomFilter, RevocationList
+from middleware.session import SQLiteBackend
+from tests.test_middleware.fixture import revocation_list, revocation_path
+
+
+def test_bloom_filter():
+    bloom = BloomFilter()
+    bloom.add("dummy identity")
+    assert "dummy identity" in bloom
+    assert "extra dummy identity" not in bloom
+
+
+def test_revocation_list(revocation_list):
+    issued = time.time()
+    assert revocation_list.is_revoked("dummy identity", issued) is False
+    revocation_list.add("dummy identity", datetime.now() + timedelta(days=1))
+    assert revocation_list.is_revoked("dummy identity", issued) is True
+    # Token issued after revocation is still valid
+    assert revocation_list.is_revoked("dummy identity", time.time() + 1) is False
+    assert revocation_list.is_revoked("extra dummy identity", issued) is False
+
+
+def test_revocation_list_shared(monkeypatch, revocation_list, revocation_path):
+    monkeypatch.setattr(revocation, "REFRESH_INTERVAL", 0)
+    worker = RevocationList(SQLiteBackend(revocation_path, "revocations"))
+    issued = time.time()
+    assert worker.is_revoked("dummy identity", issued) is False
+    revocation_list.add("dummy identity", None)
+    assert worker.is_revoked("dummy identity", issued) is True
+
+
+def test_revocation_list_cleanup(revocation_list):
+    issued = time.time()
+    revocation_list.add("dummy identity", datetime.now() - timedelta(seconds=1))
+    revocation_list.add("extra dummy identity", datetime.now() + timedelta(days=1))
+    revocation_list.cleanup()
+    assert revocation_list.is_revoked("dummy identity", issued) is False
+    assert revocation_list.is_revoked("extra dummy identity", issued) is True
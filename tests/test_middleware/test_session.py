@@ -0,0 +1,105 @@
+import pytest
+
+from app.config import Config
+from middleware import session
+from middleware.session import (
+    RedisBackend,
+    SessionStore,
+    SQLiteBackend,
+    create_session_backend,
+)
+from tests.test_middleware.fixture import (
+    dummy_user,
+    redis_client,
+    redis_store,
+    sqlite_store,
+)
+
+
+def _assert_same_user(user, dummy_user):
+    assert user.get_user_identity() == dummy_user.get_user_identity()
+    assert user.get_user_access_scope() == dummy_user.get_user_access_scope()
+    assert user.get_user_expire_time() == dummy_user.get_user_expire_time()
+
+
+def _create_redis_store(redis_client):
+    return SessionStore(
+        RedisBackend(redis_client), RedisBackend(redis_client, "12labours:revision:")
+    )
+
+
+@pytest.mark.parametrize("store", ["sqlite_store", "redis_store"])
+def test_session_store(store, dummy_user, request):
+    store = request.getfixturevalue(store)
+    identity = dummy_user.get_user_identity()
+    assert identity not in store
+    assert store.get(identity) is None
+    store[identity] = dummy_user
+    assert identity in store
+    assert len(store) == 1
+    assert list(store) == [identity]
+    _assert_same_user(store[identity], dummy_user)
+    _assert_same_user(store.get(identity), dummy_user)
+    del store[identity]
+    assert identity not in store
+    with pytest.raises(KeyError):
+        store[identity]
+    with pytest.raises(KeyError):
+        del store[identity]
+
+
+def test_session_store_shared_backend(tmp_path, dummy_user):
+    # Two workers using the same sqlite file
+    path = str(tmp_path / "session.db")
+    worker1 = SessionStore(SQLiteBackend(path), SQLiteBackend(path, "users_revision"))
+    worker2 = SessionStore(SQLiteBackend(path), SQLiteBackend(path, "users_revision"))
+    identity = dummy_user.get_user_identity()
+    worker1[identity] = dummy_user
+    _assert_same_user(worker2[identity], dummy_user)
+
+
+def test_session_store_local_tier(monkeypatch, redis_client, dummy_user):
+    identity = dummy_user.get_user_identity()
+    worker1 = _create_redis_store(redis_client)
+    worker2 = _create_redis_store(redis_client)
+    worker1[identity] = dummy_user
+    _assert_same_user(worker2.get(identity), dummy_user)
+    # Local hits do not reach the backend until the revision is checked again
+    calls = redis_client.calls
+    for _ in range(10):
+        assert identity in worker2
+        _assert_same_user(worker2.get(identity), dummy_user)
+    assert redis_client.calls == calls
+    # Changing the returned scope does not change the cached user
+    worker2[identity].get_user_access_scope().clear()
+    _assert_same_user(worker2[identity], dummy_user)
+    # User revoked by one worker is rejected by itself at once
+    del worker1[identity]
+    assert worker1.get(identity) is None
+    # And by the others on the next revision check
+    monkeypatch.setattr(session, "REVISION_INTERVAL", 0)
+    assert identity not in worker2
+    with pytest.raises(KeyError):
+        worker2[identity]
+
+
+def test_session_store_revision_check(monkeypatch, redis_client, dummy_user):
+    monkeypatch.setattr(session, "REVISION_INTERVAL", 0)
+    identity = dummy_user.get_user_identity()
+    store = _create_redis_store(redis_client)
+    store[identity] = dummy_user
+    # Unchanged revision costs a single backend call per lookup
+    calls = redis_client.calls
+    _assert_same_user(store.get(identity), dummy_user)
+    assert redis_client.calls == calls + 1
+
+
+def test_create_session_backend_path(monkeypatch, tmp_path):
+    monkeypatch.setattr(Config, "SESSION_STORE_URL", None)
+    monkeypatch.setattr(session.tempfile, "gettempdir", lambda: str(tmp_path))
+    monkeypatch.setattr(Config, "QUERY_SECURE_KEY", "dummy secure key 1")
+    create_session_backend("users").set("dummy", "dummy")
+    monkeypatch.setattr(Config, "QUERY_SECURE_KEY", "dummy secure key 2")
+    # Another deployment on the same host does not share the sessions
+    assert create_session_backend("users").get("dummy") is None
+    assert len(list(tmp_path.glob("12labours_session_*.db"))) == 2
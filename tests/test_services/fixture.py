@@ -0,0 +1,100 @@
+import pytest
+
+from app.config import iRODSConfig
+from services.irods.irods_pool import iRODSSessionPool
+from services.irods.irods_service import iRODSService
+from services.service_breaker import ServiceBreaker
+
+
+class DummyQuery:
+    # GenQuery result is fetched in batches of at most 500 rows
+    def __init__(self, batches):
+        self.batches = batches
+
+    def filter(self, *criteria):
+        return self
+
+    def all(self):
+        # Continuation is closed after the first batch
+        return list(self.batches[0]) if self.batches else []
+
+    def __iter__(self):
+        for batch in self.batches:
+            yield from batch
+
+
+class DummySession:
+    def __init__(self, number, batches=None):
+        self.number = number
+        self.valid = True
+        self.closed = False
+        self.batches = batches or []
+
+    def query(self, *columns):
+        return DummyQuery(self.batches)
+
+    def cleanup(self):
+        self.closed = True
+
+
+class DummySessionFactory:
+    def __init__(self):
+        self.sessions = []
+        self.reachable = True
+        self.batches = []
+
+    def __call__(self):
+        session = DummySession(len(self.sessions), self.batches)
+        self.sessions.append(session)
+        return session
+
+    def validate(self, session):
+        if not self.reachable or not session.valid:
+            raise ConnectionError("dummy session is not valid")
+
+
+@pytest.fixture
+def dummy_session_factory():
+    return DummySessionFactory()
+
+
+@pytest.fixture
+def pool_class(dummy_session_factory):
+    pool = iRODSSessionPool(
+        dummy_session_factory,
+        dummy_session_factory.validate,
+        min_size=1,
+        max_size=2,
+        idle_timeout=60,
+        checkout_timeout=0.1,
+    )
+    pool.fill()
+    return pool
+
+
+class DummyClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def dummy_clock():
+    return DummyClock()
+
+
+@pytest.fixture
+def sb_class(dummy_clock):
+    return ServiceBreaker(30, 1, 8, clock=dummy_clock)
+
+
+@pytest.fixture
+def irods_class(monkeypatch, dummy_session_factory):
+    monkeypatch.setattr(iRODSConfig, "IRODS_POOL_MIN_SIZE", 2)
+    monkeypatch.setattr(iRODSConfig, "IRODS_POOL_MAX_SIZE", 2)
+    service = iRODSService()
+    monkeypatch.setattr(service, "_handle_session", dummy_session_factory)
+    monkeypatch.setattr(service, "_handle_validation", dummy_session_factory.validate)
+    return service
@@ -0,0 +1,104 @@
+import threading
+import time
+
+import pytest
+from irods.exception import NetworkException
+
+from services.irods import irods_pool
+from tests.test_services.fixture import dummy_session_factory, pool_class
+
+
+def test_fill(pool_class, dummy_session_factory):
+    metrics = pool_class.get_metrics()
+    assert metrics["size"] == 1
+    assert metrics["idle"] == 1
+    assert len(dummy_session_factory.sessions) == 1
+
+
+def test_acquire(pool_class, dummy_session_factory):
+    first = pool_class.acquire()
+    # Idle session is reused before a new one is created
+    assert first is dummy_session_factory.sessions[0]
+    second = pool_class.acquire()
+    assert second is dummy_session_factory.sessions[1]
+    assert pool_class.get_metrics()["in_use"] == 2
+
+    # Pool is exhausted, checkout fails after timeout
+    with pytest.raises(TimeoutError):
+        pool_class.acquire()
+    assert pool_class.get_metrics()["timeout"] == 1
+
+    pool_class.release(first)
+    pool_class.release(second)
+    # Most recently released session is reused first
+    assert pool_class.acquire() is second
+
+
+def test_acquire_wait(pool_class):
+    first = pool_class.acquire()
+    second = pool_class.acquire()
+    timer = threading.Timer(0.02, pool_class.release, [first])
+    timer.start()
+    assert pool_class.acquire(timeout=1) is first
+    timer.join()
+    pool_class.release(second)
+
+
+def test_acquire_validation(monkeypatch, pool_class, dummy_session_factory):
+    monkeypatch.setattr(irods_pool, "VALIDATION_BYPASS_SECONDS", 0)
+    broken = dummy_session_factory.sessions[0]
+    broken.valid = False
+    # Invalid idle session is replaced by a new one
+    session = pool_class.acquire()
+    assert session is not broken
+    assert broken.closed == True
+    assert pool_class.get_metrics()["invalid"] == 1
+    pool_class.release(session)
+
+    # Idle and new sessions can not be validated when irods is not reachable
+    dummy_session_factory.reachable = False
+    with pytest.raises(ConnectionError):
+        pool_class.acquire()
+    assert pool_class.get_metrics()["size"] == 0
+
+
+def test_session_discard(pool_class, dummy_session_factory):
+    with pytest.raises(NetworkException):
+        with pool_class.session() as session:
+            raise NetworkException("dummy network error")
+    assert session.closed == True
+    assert pool_class.get_metrics()["size"] == 0
+
+    with pytest.raises(ValueError):
+        with pool_class.session() as session:
+            raise ValueError("dummy error")
+    # Session is kept when error is not caused by connection
+    assert session.closed == False
+    assert pool_class.get_metrics()["idle"] == 1
+
+
+def test_evict_idle_session(pool_class, dummy_session_factory):
+    first = pool_class.acquire()
+    second = pool_class.acquire()
+    pool_class.release(first)
+    pool_class.release(second)
+    assert pool_class.evict_idle_session() == 0
+
+    pool_class._iRODSSessionPool__idle_timeout = 0
+    time.sleep(0.01)
+    # Sessions above min_size are closed, least recently used first
+    assert pool_class.evict_idle_session() == 1
+    assert first.closed == True
+    assert second.closed == False
+    assert pool_class.get_metrics()["size"] == 1
+
+
+def test_close(pool_class, dummy_session_factory):
+    session = pool_class.acquire()
+    pool_class.acquire()
+    pool_class.close()
+    pool_class.release(session)
+    assert session.closed == True
+    with pytest.raises(RuntimeError):
+        pool_class.acquire()
+    assert pool_class.get_metrics()["size"] == 1
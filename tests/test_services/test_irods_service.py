@@ -0,0 +1,66 @@
+from tests.test_services.fixture import dummy_session_factory, irods_class
+
+
+def test_connection(irods_class, dummy_session_factory):
+    irods_class.connection()
+    assert irods_class.get_status()
+    first = dummy_session_factory.sessions[:2]
+    # Reconnecting closes sessions of the previous pool
+    irods_class.connection()
+    assert irods_class.get_status()
+    assert all(_.closed for _ in first)
+    assert irods_class.get_metrics()["size"] == 2
+
+
+def test_connection_fill_error(irods_class, dummy_session_factory):
+    def validate(session):
+        if session.number == 1:
+            raise ConnectionError("dummy session is not valid")
+
+    irods_class._handle_validation = validate
+    irods_class.connection()
+    # Session opened before fill failed is closed as well
+    assert all(_.closed for _ in dummy_session_factory.sessions)
+    assert irods_class.get_connection() is None
+
+
+def test_status_busy_pool(irods_class, dummy_session_factory):
+    irods_class.connection()
+    pool = irods_class.get_connection()
+    sessions = [pool.acquire(), pool.acquire()]
+    irods_class.status()
+    assert irods_class.get_status()
+    # Exhausted pool is not healthy when the server cannot be reached
+    dummy_session_factory.reachable = False
+    irods_class.status()
+    assert not irods_class.get_status()
+    for session in sessions:
+        pool.release(session)
+
+
+def test_evict_idle_session(irods_class):
+    assert irods_class.evict_idle_session() == 0
+    irods_class.connection()
+    assert irods_class.evict_idle_session() == 0
+
+
+def test_process_search_metadata(irods_class, dummy_session_factory):
+    dummy_session_factory.batches = [
+        [(f"dummy collection {i}", "TITLE", f"dummy title {i}") for i in range(500)],
+        [("dummy collection 500", "TITLE", "dummy title 500")],
+    ]
+    irods_class.connection()
+    result = irods_class.process_search_metadata(["TITLE"])
+    # Rows after the first batch are returned as well
+    assert len(result) == 501
+    assert result[-1] == ("dummy collection 500", "TITLE", "dummy title 500")
+
+
+def test_process_keyword_search(irods_class, dummy_session_factory):
+    dummy_session_factory.batches = [
+        [(f"dummy collection {i}", "dummy heart") for i in range(500)],
+        [("dummy collection 500", "dummy heart")],
+    ]
+    irods_class.connection()
+    result = irods_class.process_keyword_search(["TITLE"], "heart")
+    assert len(result) == 501
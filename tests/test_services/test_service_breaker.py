@@ -0,0 +1,39 @@
+from services.service_breaker import CLOSED, HALF_OPEN, OPEN
+from tests.test_services.fixture import dummy_clock, sb_class
+
+
+def test_is_probe_due(sb_class, dummy_clock):
+    # Service is connected by the first probe
+    assert sb_class.get_state() == OPEN
+    assert sb_class.is_probe_due() == True
+    assert sb_class.get_state() == HALF_OPEN
+
+    sb_class.record_success()
+    assert sb_class.get_state() == CLOSED
+    # Healthy service is only probed on interval
+    dummy_clock.now += 29
+    assert sb_class.is_probe_due() == False
+    dummy_clock.now += 1
+    assert sb_class.is_probe_due() == True
+    assert sb_class.get_state() == CLOSED
+
+
+def test_record_failure(sb_class, dummy_clock):
+    backoff = []
+    for _ in range(6):
+        sb_class.is_probe_due()
+        sb_class.record_failure()
+        assert sb_class.get_state() == OPEN
+        start = dummy_clock.now
+        while not sb_class.is_probe_due():
+            dummy_clock.now += 1
+        backoff.append(dummy_clock.now - start)
+        assert sb_class.get_state() == HALF_OPEN
+    # Reconnect delay doubles until the maximum
+    assert backoff == [1, 2, 4, 8, 8, 8]
+
+    sb_class.record_success()
+    sb_class.record_failure()
+    # Successful reconnect resets the delay
+    dummy_clock.now += 1
+    assert sb_class.is_probe_due() == True